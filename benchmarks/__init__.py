@@ -0,0 +1,6 @@
+"""
+PySantec benchmarks.
+
+Run a benchmark from the repository root, e.g.
+python -m benchmarks.bench_logging
+"""
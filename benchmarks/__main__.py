@@ -0,0 +1,56 @@
+"""
+Benchmark suite command line.
+
+    python -m benchmarks run [--output results.json] [--filter TEXT] [--quick]
+    python -m benchmarks compare baseline.json results.json [--threshold 0.1]
+"""
+
+import argparse
+import sys
+
+from . import suite
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmark suite.")
+    run_parser.add_argument("--output", help="Write the results to a JSON file.")
+    run_parser.add_argument("--filter", help="Only run matching benchmarks.")
+    run_parser.add_argument(
+        "--quick", action="store_true", help="Time fewer calls, e.g. for CI."
+    )
+
+    compare_parser = commands.add_parser(
+        "compare", help="Compare results with a baseline."
+    )
+    compare_parser.add_argument("baseline", help="The baseline JSON file.")
+    compare_parser.add_argument("current", help="The current JSON file.")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown flagged as a regression (default: 0.1).",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = suite.run(args.filter, scale=0.1 if args.quick else 1.0)
+        if args.output:
+            suite.save(results, args.output)
+        return 0
+
+    regressions = suite.compare(
+        suite.load(args.baseline), suite.load(args.current), args.threshold
+    )
+    if regressions:
+        print(f"\n{len(regressions)} regressions above {args.threshold:.0%}.")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
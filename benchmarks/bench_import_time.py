@@ -0,0 +1,92 @@
+"""
+Import time benchmark.
+
+Imports pysantec in fresh interpreters with ``python -X importtime``
+and reports the median cumulative import time of the package modules.
+
+Usage
+    python -m benchmarks.bench_import_time [--runs N] [--top N] [--json PATH]
+
+Without the Santec DLLs (e.g. on Linux), the fake DLL objects of
+``benchmarks.fakes`` are installed before the import.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Package whose modules are reported
+PACKAGE = "pysantec"
+
+# Import statements with the real and the fake DLLs
+REAL_IMPORT = "import pysantec"
+FAKE_IMPORT = "from benchmarks import fakes; fakes.install()"
+
+
+def measure_import(statement: str) -> dict[str, int]:
+    """
+    Run an import statement in a fresh interpreter.
+
+    :param statement: The Python statement to run.
+
+    :return: The cumulative import time in microseconds of each package module.
+    """
+    repository_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=repository_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        module = fields[2].strip()
+        if module == PACKAGE or module.startswith(PACKAGE + "."):
+            times[module] = int(fields[1])
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--json", help="Write the results to a JSON file.")
+    parser.add_argument(
+        "--fake",
+        action=argparse.BooleanOptionalAction,
+        default=sys.platform != "win32",
+        help="Use the fake DLL objects.",
+    )
+    args = parser.parse_args()
+
+    statement = FAKE_IMPORT if args.fake else REAL_IMPORT
+    runs = [measure_import(statement) for _ in range(args.runs)]
+    modules = {
+        module: statistics.median(run.get(module, 0) for run in runs)
+        for module in runs[0]
+    }
+
+    print(f"Median cumulative import time over {args.runs} runs:")
+    slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)
+    for module, microseconds in slowest[: args.top]:
+        print(f"{module:<60}{microseconds / 1000:>8.2f} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {"runs": args.runs, "fake": args.fake, "modules_us": modules},
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
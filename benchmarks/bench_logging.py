@@ -0,0 +1,91 @@
+"""
+Logging overhead benchmark.
+
+Measures the per-call overhead of instrument getters and setters
+on fake instruments with logging disabled, at INFO and at DEBUG.
+
+Usage
+    python -m benchmarks.bench_logging [--calls N]
+"""
+
+import argparse
+import logging
+import os
+import timeit
+
+from . import fakes
+
+pysantec = fakes.install()
+
+# Logging levels to benchmark
+LEVELS = {
+    "disabled": logging.CRITICAL + 1,
+    "INFO": logging.INFO,
+    "DEBUG": logging.DEBUG,
+}
+
+
+def _instrument_calls(tsl, mpm):
+    """Return the instrument calls to benchmark."""
+    return {
+        "mpm.get_logging_status": mpm.get_logging_status,
+        "mpm.get_range_value": mpm.get_range_value,
+        "mpm.set_wavelength": lambda: mpm.set_wavelength(1550.0),
+        "tsl.get_wavelength": tsl.get_wavelength,
+        "tsl.set_wavelength": lambda: tsl.set_wavelength(1550.0),
+    }
+
+
+def measure_logging_overhead(tsl, mpm, calls: int) -> dict[str, dict[str, float]]:
+    """
+    Measure the per-call time of the instrument calls at each logging level.
+
+    :return: The seconds per call by call name and logging level.
+    """
+    root_logger = logging.getLogger()
+    handlers = root_logger.handlers[:]
+    level = root_logger.level
+    for handler in handlers:
+        root_logger.removeHandler(handler)
+
+    results = {}
+    # Write records to the null device, so only the logging cost is measured
+    with open(os.devnull, "w") as devnull:
+        handler = logging.StreamHandler(devnull)
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+        )
+        root_logger.addHandler(handler)
+        try:
+            for call_name, call in _instrument_calls(tsl, mpm).items():
+                results[call_name] = {}
+                for level_name, level_value in LEVELS.items():
+                    root_logger.setLevel(level_value)
+                    seconds = min(timeit.repeat(call, number=calls, repeat=3))
+                    results[call_name][level_name] = seconds / calls
+        finally:
+            root_logger.removeHandler(handler)
+            for previous_handler in handlers:
+                root_logger.addHandler(previous_handler)
+            root_logger.setLevel(level)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    im = pysantec.InstrumentManager()
+    tsl = im.connect_tsl("GPIB0::1::INSTR")
+    mpm = im.connect_mpm("GPIB0::2::INSTR")
+    results = measure_logging_overhead(tsl, mpm, args.calls)
+
+    print(f"{'call':<26}" + "".join(f"{name:>12}" for name in LEVELS))
+    for call_name, levels in results.items():
+        row = "".join(f"{seconds * 1e6:>9.2f} us" for seconds in levels.values())
+        print(f"{call_name:<26}{row}")
+
+
+if __name__ == "__main__":
+    main()
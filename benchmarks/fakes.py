@@ -0,0 +1,359 @@
+"""
+Fake Santec DLL objects for benchmarks.
+
+Installs stand-ins for ``clr``, ``System`` and the ``Santec`` .NET
+namespaces so that pysantec can be imported and exercised without
+instruments or the Santec DLLs.
+"""
+
+import contextlib
+import itertools
+import os
+import sys
+import time
+import types
+
+import numpy as np
+
+_enum_values = itertools.count(100)
+
+
+class _EnumMeta(type):
+    """Allocates a unique integer for every enum member name."""
+
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = next(_enum_values)
+        setattr(cls, name, value)
+        return value
+
+
+class _FakeEnum(metaclass=_EnumMeta):
+    pass
+
+
+def _enum(name):
+    return _EnumMeta(name, (_FakeEnum,), {})
+
+
+class _ElementType:
+    def __init__(self, name):
+        self.Name = name
+
+
+class _NetType:
+    IsArray = True
+
+    def __init__(self, array):
+        self._array = array
+
+    def GetElementType(self):
+        return _ElementType(
+            {np.float64: "Double", np.float32: "Single", np.int32: "Int32"}[
+                self._array.dtype.type
+            ]
+        )
+
+
+class FakeNetArray:
+    """A minimal stand-in for a .NET array backed by a NumPy array."""
+
+    def __init__(self, array):
+        self._array = np.ascontiguousarray(array, dtype=np.float64)
+        self.Rank = self._array.ndim
+
+    def GetType(self):
+        return _NetType(self._array)
+
+    def GetLength(self, dimension):
+        return self._array.shape[dimension]
+
+    def __len__(self):
+        return self._array.size
+
+    def __getitem__(self, index):
+        return float(self._array[index])
+
+    def __iter__(self):
+        return iter(self._array.ravel().tolist())
+
+
+class _Pointer:
+    def __init__(self, address):
+        self._address = address
+
+    def ToInt64(self):
+        return self._address
+
+
+class GCHandle:
+    """Emulates pinning by exposing the NumPy buffer address."""
+
+    def __init__(self, array):
+        self._array = array
+
+    @classmethod
+    def Alloc(cls, net_array, handle_type):
+        return cls(net_array._array)
+
+    def AddrOfPinnedObject(self):
+        return _Pointer(self._array.ctypes.data)
+
+    def Free(self):
+        self._array = None
+
+
+class _Information:
+    ProductName = "FAKE"
+    SerialNumber = "00000000"
+    FWversion = "0.0"
+
+
+class FakeInstrument:
+    """Generic fake DLL instrument with stateful setters and getters."""
+
+    def __init__(self):
+        self._state = {}
+        self.Information = _Information()
+        self.calls = 0
+
+    def Connect(self, *args):
+        return 0
+
+    def DisConnect(self):
+        return 0
+
+    def Echo(self, command, response):
+        self.calls += 1
+        if command == "*IDN?":
+            return 0, f"SANTEC,{self.__class__.__name__},0,0"
+        if command == "*OPC?":
+            return 0, "1"
+        return 0, self._state.get(command, "0")
+
+    def Write(self, command):
+        self.calls += 1
+        return 0
+
+    def Read(self, response):
+        self.calls += 1
+        return 0, ""
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def function(*args):
+            self.calls += 1
+            if name.startswith("Get_"):
+                key = "Set_" + name[4:]
+                value = self._state.get(key, args[-1] if args else None)
+                return 0, value
+            if name.startswith("Set_"):
+                self._state[name] = args[-1] if args else None
+            return 0
+
+        return function
+
+
+class FakeTSL(FakeInstrument):
+    LD_Status = _enum("LD_Status")
+    Shutter_Status = _enum("Shutter_Status")
+    Sweep_Mode = _enum("Sweep_Mode")
+    Sweep_Status = _enum("Sweep_Status")
+    Trigger_Output_Mode = _enum("Trigger_Output_Mode")
+    Trigger_Input_Mode = _enum("Trigger_Input_Mode")
+    Sweep_Start_Mode = _enum("Sweep_Start_Mode")
+    Power_Unit = _enum("Power_Unit")
+    Wavelength_Unit = _enum("Wavelength_Unit")
+    Power_Mode = _enum("Power_Mode")
+    TriggerOut_Source = _enum("TriggerOut_Source")
+    Coh_Status = _enum("Coh_Status")
+
+    def __init__(self):
+        super().__init__()
+        self._sweep_status = FakeTSL.Sweep_Status.Standby
+        self.data_points = 1001
+
+    def Get_LD_Status(self, value):
+        return 0, FakeTSL.LD_Status.LD_ON
+
+    def Get_Sweep_Status(self, value):
+        return 0, self._sweep_status
+
+    def Sweep_Start(self):
+        self._sweep_status = FakeTSL.Sweep_Status.WaitingforTrigger
+        return 0
+
+    def Sweep_Stop(self):
+        self._sweep_status = FakeTSL.Sweep_Status.Standby
+        return 0
+
+    def Set_Software_Trigger(self):
+        self._sweep_status = FakeTSL.Sweep_Status.Running
+        return 0
+
+    def Set_Sweep_Parameter_for_STS(self, start, stop, speed, step, actual):
+        self.data_points = int(round((stop - start) / step)) + 1
+        return 0, step
+
+    def Echo(self, command, response):
+        if command == ":READ:POIN?":
+            return 0, str(self.data_points)
+        return super().Echo(command, response)
+
+    def Get_Logging_Data(self, count, data):
+        return 0, len(data), FakeNetArray(np.linspace(1500, 1600, len(data)))
+
+    def Get_Logging_Data_Power_for_STS(self, speed, step, count, data):
+        return 0, len(data), FakeNetArray(np.ones(len(data)))
+
+
+class FakeMPM(FakeInstrument):
+    READ_Range_Mode = _enum("READ_Range_Mode")
+    Power_Unit = _enum("Power_Unit")
+    Measurement_Mode = _enum("Measurement_Mode")
+    Trigger_Input_Mode = _enum("Trigger_Input_Mode")
+
+    channels_per_module = 4
+    logging_polls = 1
+
+    def __init__(self):
+        super().__init__()
+        self.data_points = 1001
+        self._polls = 0
+        self._logging = False
+        self.power_dbm = None
+
+    def Set_Logging_Data_Point(self, points):
+        self.data_points = points
+        return 0
+
+    def Get_Logging_Data_Point(self, value):
+        return 0, self.data_points
+
+    def Logging_Start(self):
+        self._logging = True
+        self._polls = 0
+        return 0
+
+    def Logging_Stop(self):
+        self._logging = False
+        return 0
+
+    def Get_Logging_Status(self, status, count):
+        if self._logging and self._polls < self.logging_polls:
+            self._polls += 1
+            return 0, 0, self._polls
+        self._logging = False
+        return 0, 1, self.data_points
+
+    def _channel_data(self, module, channel):
+        if self.power_dbm is not None:
+            return np.asarray(self.power_dbm(module, channel, self.data_points))
+        base = -10.0 - module - 0.1 * channel
+        return base + 0.01 * np.sin(np.arange(self.data_points))
+
+    def Get_Each_Channel_Logdata(self, module, channel, data):
+        return 0, FakeNetArray(self._channel_data(module, channel))
+
+    def Get_Each_Module_Loggdata(self, module, data):
+        rows = [
+            self._channel_data(module, channel)
+            for channel in range(1, self.channels_per_module + 1)
+        ]
+        return 0, FakeNetArray(np.vstack(rows))
+
+
+class FakeSPU(FakeInstrument):
+    def __init__(self):
+        super().__init__()
+        self.DeviceName = ""
+        self.IsSampling = False
+        self.IsConnected = True
+        self.Logging_Errorcode = 0
+        self.data_points = 1001
+
+    def Connect(self, device):
+        return 0, self.DeviceName
+
+    def Get_Device_ID(self, devices):
+        return 0, ["Dev1"]
+
+    def Set_Sampling_Parameter(self, start, stop, speed, step):
+        self.data_points = int(round((stop - start) / step)) + 1
+        return 0
+
+    def Get_Sampling_Data(self, trigger, monitor):
+        trigger = FakeNetArray(np.linspace(0.0, 1.0, self.data_points))
+        monitor = FakeNetArray(np.full(self.data_points, 2.0))
+        return 0, trigger, monitor
+
+    Get_Sampling_Rawdata = Get_Sampling_Data
+
+
+class FakeMainCommunication:
+    def Get_USB_Resouce(self):
+        return []
+
+    def Get_GPIB_Resources(self):
+        return ["GPIB0::1::INSTR", "GPIB0::2::INSTR"]
+
+    def Get_Serial_Port(self):
+        return []
+
+
+@contextlib.contextmanager
+def no_sleep_or_print():
+    """Skip the polling sleeps and silence the SME status prints."""
+    sleep = time.sleep
+    time.sleep = lambda seconds: None
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        time.sleep = sleep
+
+
+def install():
+    """Install the fake modules and import pysantec."""
+    clr = types.ModuleType("clr")
+    clr.AddReference = lambda path: None
+
+    system = types.ModuleType("System")
+    runtime = types.ModuleType("System.Runtime")
+    interop = types.ModuleType("System.Runtime.InteropServices")
+    interop.GCHandle = GCHandle
+    interop.GCHandleType = _enum("GCHandleType")
+
+    santec = types.ModuleType("Santec")
+    santec.TSL = FakeTSL
+    santec.MPM = FakeMPM
+    santec.SPU = FakeSPU
+    santec.CommunicationTerminator = _enum("CommunicationTerminator")
+
+    communication = types.ModuleType("Santec.Communication")
+    communication.GPIBConnectType = _enum("GPIBConnectType")
+    communication.CommunicationMethod = _enum("CommunicationMethod")
+    communication.MainCommunication = FakeMainCommunication
+    santec.Communication = communication
+
+    dll_manager = types.ModuleType("pysantec.drivers.dll_manager")
+    dll_manager.load_dlls = lambda: True
+
+    sys.modules.update(
+        {
+            "clr": clr,
+            "System": system,
+            "System.Runtime": runtime,
+            "System.Runtime.InteropServices": interop,
+            "Santec": santec,
+            "Santec.Communication": communication,
+            "pysantec.drivers.dll_manager": dll_manager,
+        }
+    )
+
+    import pysantec
+
+    return pysantec
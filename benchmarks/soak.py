@@ -0,0 +1,232 @@
+"""
+Soak test with memory leak detection.
+
+Runs thousands of SME cycles (configure, scan, fetch) against the fake
+DLL objects of ``benchmarks.fakes`` and samples the traced Python memory
+(``tracemalloc``) and the process RSS. Reports the memory growth slope
+after a warmup and the allocation sites that grew the most, and fails
+when the traced memory grows beyond the budget.
+
+The RSS includes the pages of the flight recorder ring buffer, which
+grows until the buffer is filled once. Use ``--no-flight-recorder`` to
+exclude it from an RSS budget check.
+
+Usage
+    python -m benchmarks.soak [--cycles N] [--budget-kb N] [--rss-budget-mb N]
+                              [--no-flight-recorder]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from . import fakes
+
+pysantec = fakes.install()
+
+# Scan of the soak cycles: 1001 points
+START_WAVELENGTH = 1500.0
+STOP_WAVELENGTH = 1600.0
+STEP_WAVELENGTH = 0.1
+SPEED = 50.0
+
+# Module and channel pairs fetched each cycle
+CHANNELS = [(0, 1), (0, 2), (0, 3), (0, 4)]
+
+
+def rss_bytes() -> int | None:
+    """Return the resident set size of the process, or None if unknown."""
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class SoakStation:
+    """Fake TSL, MPM and SPU station running SME cycles."""
+
+    def __init__(self):
+        im = pysantec.InstrumentManager()
+        self.tsl = im.connect_tsl("GPIB0::1::INSTR")
+        self.mpm = im.connect_mpm("GPIB0::2::INSTR")
+        self.daq = im.connect_daq("Dev1")
+        self.sme = pysantec.SME(self.tsl, self.mpm)
+        self._out = None
+
+    def cycle(self):
+        """Run one configure, scan and fetch cycle."""
+        step = self.sme.configure_tsl(
+            START_WAVELENGTH, STOP_WAVELENGTH, STEP_WAVELENGTH, 0.0, SPEED
+        )
+        self.sme.configure_mpm(
+            START_WAVELENGTH, STOP_WAVELENGTH, STEP_WAVELENGTH, SPEED, step
+        )
+        self.daq.set_sampling_parameters(START_WAVELENGTH, STOP_WAVELENGTH, SPEED, step)
+        self.sme.perform_scan()
+
+        # Fetch paths allocating .NET arrays and their conversions
+        self.tsl.get_wavelength_logging_data()
+        self._out = self.sme.fetch_channel_data(CHANNELS, out=self._out)
+        self.mpm.get_module_logging_data(0)
+        self.mpm.get_module_logging_data_array(0)
+        self.daq.get_sampling_data()
+
+
+def _sample(cycle: int) -> tuple[int, int, int | None]:
+    """Collect garbage and return the cycle, traced memory and RSS."""
+    gc.collect()
+    return cycle, tracemalloc.get_traced_memory()[0], rss_bytes()
+
+
+def _is_harness_frame(filename: str) -> bool:
+    """Return True for allocations of the soak test machinery itself."""
+    return filename.endswith(("tracemalloc.py", "linecache.py", "soak.py"))
+
+
+def soak(
+    cycles: int = 5000,
+    warmup: int = 200,
+    sample_every: int = 50,
+    top: int = 10,
+) -> dict:
+    """
+    Run SME cycles and measure the memory growth.
+
+    :param cycles: The number of measured cycles after the warmup.
+    :param warmup: The number of cycles run before the baseline is taken.
+    :param sample_every: The number of cycles between memory samples.
+    :param top: The number of allocation sites reported.
+
+    :return: The memory samples, growth, slopes and top allocation sites.
+    """
+    station = SoakStation()
+    tracemalloc.start()
+    try:
+        with fakes.no_sleep_or_print():
+            for _ in range(warmup):
+                station.cycle()
+
+            samples = [_sample(0)]
+            baseline = tracemalloc.take_snapshot()
+            start_time = time.perf_counter()
+            for index in range(1, cycles + 1):
+                station.cycle()
+                if index % sample_every == 0 or index == cycles:
+                    samples.append(_sample(index))
+            elapsed = time.perf_counter() - start_time
+            final = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    sample_array = np.array(
+        [(c, traced, rss or 0) for c, traced, rss in samples], dtype=float
+    )
+    traced_slope = np.polyfit(sample_array[:, 0], sample_array[:, 1], 1)[0]
+    rss_slope = np.polyfit(sample_array[:, 0], sample_array[:, 2], 1)[0]
+
+    sites = [
+        stat
+        for stat in final.compare_to(baseline, "lineno")
+        if not _is_harness_frame(stat.traceback[0].filename)
+    ]
+    sites.sort(key=lambda stat: stat.size_diff, reverse=True)
+
+    return {
+        "cycles": cycles,
+        "seconds_per_cycle": elapsed / cycles,
+        "samples": samples,
+        "traced_growth": samples[-1][1] - samples[0][1],
+        "traced_slope": traced_slope,
+        "rss_growth": (
+            samples[-1][2] - samples[0][2] if samples[0][2] is not None else None
+        ),
+        "rss_slope": rss_slope if samples[0][2] is not None else None,
+        "top_sites": [
+            (str(stat.traceback[0]), stat.size_diff, stat.count_diff)
+            for stat in sites[:top]
+        ],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cycles", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--sample-every", type=int, default=50)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument(
+        "--budget-kb",
+        type=float,
+        default=256.0,
+        help="Allowed traced memory growth after the warmup (default: 256 kB).",
+    )
+    parser.add_argument(
+        "--rss-budget-mb",
+        type=float,
+        help="Allowed RSS growth after the warmup (default: not checked).",
+    )
+    parser.add_argument(
+        "--no-flight-recorder",
+        action="store_true",
+        help="Disable the flight recorder, e.g. for an RSS budget check.",
+    )
+    args = parser.parse_args()
+
+    if args.no_flight_recorder:
+        pysantec.configure_flight_recorder(enabled=False)
+    report = soak(args.cycles, args.warmup, args.sample_every, args.top)
+
+    print(
+        f"{report['cycles']} cycles, "
+        f"{report['seconds_per_cycle'] * 1e3:.2f} ms per cycle\n"
+    )
+    print(f"{'cycle':>8}{'traced (kB)':>14}{'RSS (MB)':>12}")
+    for cycle, traced, rss in report["samples"]:
+        rss_text = f"{rss / 2**20:>12.1f}" if rss is not None else f"{'-':>12}"
+        print(f"{cycle:>8}{traced / 1024:>14.1f}{rss_text}")
+
+    print(
+        f"\nTraced growth: {report['traced_growth'] / 1024:.1f} kB "
+        f"({report['traced_slope']:.1f} bytes/cycle)"
+    )
+    if report["rss_growth"] is not None:
+        print(
+            f"RSS growth: {report['rss_growth'] / 2**20:.1f} MB "
+            f"({report['rss_slope']:.1f} bytes/cycle)"
+        )
+
+    print("\nTop allocation sites since the warmup:")
+    for site, size_diff, count_diff in report["top_sites"]:
+        print(f"{size_diff / 1024:>+10.1f} kB {count_diff:>+8} blocks  {site}")
+
+    failures = []
+    if report["traced_growth"] > args.budget_kb * 1024:
+        failures.append(f"traced memory growth above {args.budget_kb:g} kB")
+    if (
+        args.rss_budget_mb is not None
+        and report["rss_growth"] is not None
+        and report["rss_growth"] > args.rss_budget_mb * 2**20
+    ):
+        failures.append(f"RSS growth above {args.rss_budget_mb:g} MB")
+
+    if failures:
+        print(f"\nFAILED: {', '.join(failures)}.")
+        return 1
+    print("\nPASSED: memory growth within budget.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""
+PySantec benchmark suite.
+
+Benchmarks the pysantec hot paths against the fake DLL objects of
+``benchmarks.fakes``, so the suite runs without instruments.
+
+Usage
+    python -m benchmarks run [--output results.json] [--filter TEXT] [--quick]
+    python -m benchmarks compare baseline.json results.json [--threshold 0.1]
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+import numpy as np
+
+from . import fakes
+from .bench_logging import measure_logging_overhead
+
+pysantec = fakes.install()
+
+from pysantec.instruments import tsl_enums  # noqa: E402
+
+# Resources of the fake instruments
+TSL_RESOURCE = "GPIB0::1::INSTR"
+MPM_RESOURCE = "GPIB0::2::INSTR"
+DAQ_DEVICE = "Dev1"
+
+# Module data conversion sizes
+DATA_POINTS = (10_000, 100_000, 1_000_000)
+CHANNELS = (1, 4, 8)
+
+# Registered benchmarks: name -> function returning {case: seconds per call}
+BENCHMARKS = {}
+
+
+def benchmark(function):
+    """Register a benchmark function."""
+    BENCHMARKS[function.__name__] = function
+    return function
+
+
+def _time(call, number: int, repeat: int) -> float:
+    """Return the best time per call of several timing runs."""
+    return min(timeit.repeat(call, number=number, repeat=repeat)) / number
+
+
+def _connect():
+    """Connect to the fake TSL and MPM."""
+    im = pysantec.InstrumentManager()
+    return im, im.connect_tsl(TSL_RESOURCE), im.connect_mpm(MPM_RESOURCE)
+
+
+@benchmark
+def call_overhead(scale: float) -> dict[str, float]:
+    """Per-call overhead of the BaseInstrument DLL call helpers."""
+    _, tsl, mpm = _connect()
+    number = max(int(20000 * scale), 100)
+    return {
+        "_get_function": _time(
+            lambda: mpm._get_function("Get_Averaging_Time", float), number, 5
+        ),
+        "_set_function": _time(
+            lambda: mpm._set_function("Set_Wavelength", 1550.0), number, 5
+        ),
+        "_set_function_enum": _time(
+            lambda: tsl._set_function_enum("Set_Power_Unit", tsl_enums.PowerUnit.dBm),
+            number,
+            5,
+        ),
+        "query": _time(lambda: tsl.query("*IDN?"), number, 5),
+    }
+
+
+@benchmark
+def module_data_conversion(scale: float) -> dict[str, float]:
+    """Conversion of MPM module logging data to NumPy and to lists."""
+    _, _, mpm = _connect()
+    results = {}
+    for data_points in DATA_POINTS:
+        for channels in CHANNELS:
+            data = fakes.FakeNetArray(
+                np.random.default_rng(0).random((channels, data_points))
+            )
+            mpm._instrument.Get_Each_Module_Loggdata = lambda module, _, d=data: (0, d)
+            number = max(int(2_000_000 * scale / (data_points * channels)), 1)
+            results[f"numpy {data_points} x {channels}"] = _time(
+                lambda: mpm.get_module_logging_data_array(1), number, 5
+            )
+            if data_points == DATA_POINTS[0]:
+                results[f"list {data_points} x {channels}"] = _time(
+                    lambda: mpm.get_module_logging_data(1), 1, 3
+                )
+    return results
+
+
+@benchmark
+def connect_and_discovery(scale: float) -> dict[str, float]:
+    """InstrumentManager resource discovery and connection."""
+    number = max(int(200 * scale), 5)
+
+    def discover():
+        pysantec.InstrumentManager().list_resources()
+
+    def connect():
+        im, tsl, mpm = _connect()
+        tsl.disconnect()
+        mpm.disconnect()
+
+    return {
+        "list_resources": _time(discover, number, 5),
+        "connect_tsl_mpm": _time(connect, number, 5),
+    }
+
+
+@benchmark
+def sme_control_flow(scale: float) -> dict[str, float]:
+    """SME configure and scan control flow, without polling sleeps."""
+    _, tsl, mpm = _connect()
+    sme = pysantec.SME(tsl, mpm)
+    number = max(int(200 * scale), 5)
+
+    def configure():
+        step = sme.configure_tsl(1500.0, 1600.0, 0.1, 0.0, 50.0)
+        sme.configure_mpm(1500.0, 1600.0, 0.1, 50.0, step)
+
+    with fakes.no_sleep_or_print():
+        return {
+            "configure": _time(configure, number, 5),
+            "perform_scan": _time(sme.perform_scan, number, 5),
+        }
+
+
+@benchmark
+def sweep_cycle(scale: float) -> dict[str, float]:
+    """Sweep cycle time of the MPM (SME) and DAQ (DAQSweep) flows."""
+    im, tsl, mpm = _connect()
+    daq = im.connect_daq(DAQ_DEVICE)
+    sme = pysantec.SME(tsl, mpm)
+    daq_sweep = pysantec.DAQSweep(tsl, daq)
+    number = max(int(100 * scale), 5)
+    channels = [(1, channel) for channel in range(1, 5)]
+
+    def mpm_cycle():
+        step = sme.configure_tsl(1500.0, 1600.0, 0.01, 0.0, 50.0)
+        sme.configure_mpm(1500.0, 1600.0, 0.01, 50.0, step)
+        sme.perform_scan()
+        sme.fetch_channel_data(channels)
+
+    def daq_cycle():
+        daq_sweep.configure(1500.0, 1600.0, 0.01, 0.0, 50.0)
+        daq_sweep.measure()
+
+    with fakes.no_sleep_or_print():
+        return {
+            "mpm_cycle": _time(mpm_cycle, number, 5),
+            "daq_cycle": _time(daq_cycle, number, 5),
+        }
+
+
+@benchmark
+def logging_overhead(scale: float) -> dict[str, float]:
+    """Per-call overhead of instrument calls at each logging level."""
+    _, tsl, mpm = _connect()
+    results = measure_logging_overhead(tsl, mpm, max(int(5000 * scale), 100))
+    return {
+        f"{call_name} {level}": seconds
+        for call_name, levels in results.items()
+        for level, seconds in levels.items()
+    }
+
+
+def _metadata() -> dict:
+    """Return the environment of a benchmark run."""
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": np.__version__,
+        "pysantec": pysantec.__about__.__version__,
+    }
+
+
+def run(name_filter: str | None = None, scale: float = 1.0) -> dict:
+    """
+    Run the benchmarks.
+
+    :param name_filter: Only run benchmarks whose name contains this text.
+    :param scale: Scale factor of the number of timed calls.
+
+    :return: The metadata and the seconds per call of each benchmark case.
+    """
+    results = {}
+    for name, function in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+        print(f"{name}: {function.__doc__}")
+        for case, seconds in function(scale).items():
+            results[f"{name}/{case}"] = seconds
+            print(f"    {case:<40}{seconds * 1e6:>14.2f} us")
+    return {"metadata": _metadata(), "results": results}
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """
+    Compare two benchmark runs.
+
+    :param baseline: The baseline run.
+    :param current: The current run.
+    :param threshold: Relative slowdown reported as a regression, e.g. 0.1.
+
+    :return: The names of the regressed benchmark cases.
+    """
+    regressions = []
+    print(f"{'benchmark':<60}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, seconds in current["results"].items():
+        baseline_seconds = baseline["results"].get(name)
+        if baseline_seconds is None:
+            print(f"{name:<60}{'-':>12}{seconds * 1e6:>10.2f}us{'new':>10}")
+            continue
+        change = seconds / baseline_seconds - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<60}{baseline_seconds * 1e6:>10.2f}us{seconds * 1e6:>10.2f}us"
+            f"{change:>+10.1%}{flag}"
+        )
+    return regressions
+
+
+def save(results: dict, path: str | os.PathLike):
+    """Write benchmark results to a JSON file."""
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path: str | os.PathLike) -> dict:
+    """Read benchmark results from a JSON file."""
+    with open(path) as f:
+        return json.load(f)
@@ -5,25 +5,59 @@ PySantec - Python Package for Santec Insertion Loss
 and Polarization Dependent Loss Swept Test System.
 """
 
-from .logger import get_logger
-from .drivers import load_dlls
+from .logger import get_logger, configure_logging, shutdown_logging
+from .tracing import enable_tracing, disable_tracing
+from .flight_recorder import configure_flight_recorder, dump_flight_recorder
+from .replay import get_backend, REMOTE_BACKEND, REPLAY_BACKEND
 
 logger = get_logger(__name__)
 
-try:
-    # Initialize and Load the Santec DLLs
-    setup_dlls_result = load_dlls()
-    logger.info("Santec DLLs loaded successfully.")
-except Exception as e:
-    logger.error("Error while Santec DLLs: ", str(e))
-    raise
-
-
-from .instruments.instrument_manager import InstrumentManager
-from .measurements.single_measurement_operation import SME
+if get_backend() == REMOTE_BACKEND:
+    # Remote clients drive the instruments of a server, see pysantec.remote
+    setup_dlls_result = False
+    logger.info("Remote client backend. Santec DLLs not loaded.")
+elif get_backend() == REPLAY_BACKEND:
+    # Replayed sessions do not need the Santec DLLs
+    setup_dlls_result = True
+    logger.info("Replaying a recorded session. Santec DLLs not loaded.")
+else:
+    from .drivers import load_dlls
+
+    try:
+        # Initialize and Load the Santec DLLs
+        setup_dlls_result = load_dlls()
+        logger.info("Santec DLLs loaded successfully.")
+    except Exception as e:
+        logger.error("Error while Santec DLLs: ", str(e))
+        raise
 
 
 __all__ = [
-    "InstrumentManager",
-    "SME"
+    "configure_logging",
+    "shutdown_logging",
+    "enable_tracing",
+    "disable_tracing",
+    "configure_flight_recorder",
+    "dump_flight_recorder",
 ]
+
+if get_backend() != REMOTE_BACKEND:
+    from .instruments.instrument_manager import InstrumentManager
+    from .instruments.health_monitor import HealthMonitor
+    from .measurements.single_measurement_operation import SME
+    from .measurements.segmented_sweep import SegmentedSweep
+    from .measurements.multi_range import MultiRangeSweep
+    from .measurements.averaging import SweepAverager
+    from .measurements.switched_sweep import SwitchedSweep
+    from .measurements.daq_sweep import DAQSweep
+
+    __all__ += [
+        "InstrumentManager",
+        "HealthMonitor",
+        "SME",
+        "SegmentedSweep",
+        "MultiRangeSweep",
+        "SweepAverager",
+        "SwitchedSweep",
+        "DAQSweep",
+    ]
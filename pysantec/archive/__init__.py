@@ -0,0 +1,16 @@
+# pysantec/archive/__init__.py
+
+"""
+PySantec Archive module.
+"""
+
+from .sweep_archive import ArchivedSweep, SweepArchive, recipe_hash
+from .parquet_export import SweepParquetWriter, sweep_record_batch
+
+__all__ = [
+    "ArchivedSweep",
+    "SweepArchive",
+    "recipe_hash",
+    "SweepParquetWriter",
+    "sweep_record_batch",
+]
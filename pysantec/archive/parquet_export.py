@@ -0,0 +1,221 @@
+"""
+Arrow / Parquet export module.
+
+Writes sweep results as Arrow record batches in long format
+(one row per channel data point) and streams them to Parquet files
+in row groups. Requires the optional ``pyarrow`` dependency.
+"""
+
+import os
+import time
+from typing import Mapping, Sequence
+
+import numpy as np
+
+from ..logger import get_logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Metadata columns stored as dictionary-encoded strings
+METADATA_COLUMNS = ("dut_id", "recipe", "tsl_serial", "mpm_serial")
+
+
+def _require_pyarrow():
+    """Raise an ImportError if pyarrow is not installed."""
+    if pa is None:
+        raise ImportError(
+            "pyarrow is required for Arrow/Parquet export. "
+            "Install it with: pip install pysantec[arrow]"
+        )
+
+
+def sweep_schema(float32: bool = False) -> "pa.Schema":
+    """Return the Arrow schema of exported sweep data."""
+    _require_pyarrow()
+    dictionary_type = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [(name, dictionary_type) for name in METADATA_COLUMNS]
+        + [
+            ("timestamp", pa.timestamp("us")),
+            ("module", pa.int16()),
+            ("channel", pa.int16()),
+            ("point", pa.int32()),
+            ("wavelength", pa.float64()),
+            ("power", pa.float32() if float32 else pa.float64()),
+        ]
+    )
+
+
+def _as_points_by_channels(data, data_points: int) -> np.ndarray:
+    """Return module or channel data as a (points x channels) array."""
+    array = np.asarray(data, dtype=np.float64)
+    if array.ndim == 1:
+        return array[:, None]
+    if array.shape[0] == data_points:
+        return array
+    if array.shape[1] == data_points:
+        return array.T
+    raise ValueError(
+        f"Data shape {array.shape} does not match {data_points} data points."
+    )
+
+
+def sweep_record_batch(
+    wavelength: np.ndarray,
+    power,
+    channels: Sequence[tuple[int, int]],
+    metadata: Mapping[str, str] | None = None,
+    timestamp: float | None = None,
+    float32: bool = False,
+) -> "pa.RecordBatch":
+    """
+    Convert a sweep to an Arrow record batch without per-row Python code.
+
+    Parameters
+        wavelength: The wavelength array of the sweep.
+        power: The (points x channels) power data, e.g. an MPM module
+               logging data list of lists or a NumPy array.
+        channels: The (module number, channel number) of each column.
+        metadata: Optional values of the metadata columns.
+        timestamp: The sweep time (defaults to now).
+        float32: Down-cast the power values to float32.
+
+    Returns
+        The record batch with one row per channel data point.
+    """
+    _require_pyarrow()
+    wavelength = np.asarray(wavelength, dtype=np.float64)
+    data_points = len(wavelength)
+    power = _as_points_by_channels(power, data_points)
+    if power.shape[1] != len(channels):
+        raise ValueError(
+            f"Power data has {power.shape[1]} channels, " f"expected {len(channels)}."
+        )
+
+    rows = data_points * len(channels)
+    metadata = metadata or {}
+    timestamp = time.time() if timestamp is None else timestamp
+    modules, channel_numbers = np.asarray(channels, dtype=np.int16).reshape(-1, 2).T
+    dictionary_indices = pa.array(np.zeros(rows, dtype=np.int32))
+
+    columns = [
+        pa.DictionaryArray.from_arrays(
+            dictionary_indices, pa.array([str(metadata.get(name, ""))])
+        )
+        for name in METADATA_COLUMNS
+    ]
+    columns += [
+        pa.array(np.full(rows, np.datetime64(int(timestamp * 1e6), "us"))),
+        pa.array(np.repeat(modules, data_points)),
+        pa.array(np.repeat(channel_numbers, data_points)),
+        pa.array(np.tile(np.arange(data_points, dtype=np.int32), len(channels))),
+        pa.array(np.tile(wavelength, len(channels))),
+        pa.array(power.T.astype(np.float32 if float32 else np.float64).ravel()),
+    ]
+    return pa.RecordBatch.from_arrays(columns, schema=sweep_schema(float32))
+
+
+class SweepParquetWriter:
+    """
+    Streams sweep results to a Parquet file in row groups.
+
+    Record batches are buffered until a row group is full, so memory
+    usage is bounded by the row group size, not the file size.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        float32: bool = False,
+        row_group_size: int = 1_000_000,
+        compression: str = "zstd",
+    ):
+        """
+        Open a Parquet file for writing.
+
+        Parameters
+            path: The Parquet file path.
+            float32: Down-cast the power values to float32.
+            row_group_size: Number of rows per row group.
+            compression: The Parquet compression codec.
+        """
+        _require_pyarrow()
+        self.logger = get_logger(self.__class__.__name__)
+        self.path = path
+        self.float32 = float32
+        self.row_group_size = row_group_size
+        self._writer = pq.ParquetWriter(
+            path, sweep_schema(float32), compression=compression
+        )
+        self._pending = []
+        self._pending_rows = 0
+        self.rows_written = 0
+        self.logger.info("Opened Parquet file: %s", path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write_batch(self, batch: "pa.RecordBatch"):
+        """Buffer a record batch and write full row groups."""
+        self._pending.append(batch)
+        self._pending_rows += batch.num_rows
+        if self._pending_rows >= self.row_group_size:
+            self._flush()
+
+    def write_sweep(
+        self,
+        wavelength: np.ndarray,
+        power,
+        channels: Sequence[tuple[int, int]],
+        metadata: Mapping[str, str] | None = None,
+        timestamp: float | None = None,
+    ):
+        """Write one sweep. See ``sweep_record_batch`` for the parameters."""
+        self.write_batch(
+            sweep_record_batch(
+                wavelength, power, channels, metadata, timestamp, self.float32
+            )
+        )
+
+    def write_module_data(
+        self,
+        wavelength: np.ndarray,
+        module_number: int,
+        module_data,
+        metadata: Mapping[str, str] | None = None,
+        timestamp: float | None = None,
+    ):
+        """Write the logging data of a whole MPM module."""
+        power = _as_points_by_channels(module_data, len(wavelength))
+        channels = [(module_number, c + 1) for c in range(power.shape[1])]
+        self.write_sweep(wavelength, power, channels, metadata, timestamp)
+
+    def _flush(self):
+        """Write the buffered batches."""
+        if not self._pending:
+            return
+        table = pa.Table.from_batches(self._pending)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        self.rows_written += table.num_rows
+        self.logger.debug("Wrote %d rows to %s.", table.num_rows, self.path)
+        self._pending = []
+        self._pending_rows = 0
+
+    def close(self):
+        """Flush the buffered batches and close the file."""
+        if self._writer is None:
+            return
+        self._flush()
+        self._writer.close()
+        self._writer = None
+        self.logger.info(
+            "Closed Parquet file: %s. Rows: %s", self.path, self.rows_written
+        )
@@ -0,0 +1,313 @@
+"""
+Sweep archive module.
+
+Stores sweeps in an append-only binary data file with a fixed-size
+record index. Sweeps are read back zero-copy through ``numpy.memmap``.
+
+Archive layout
+    index.dat: 16 byte header followed by fixed-size index records.
+    sweeps.dat: Raw little-endian float64 arrays of each sweep, stored as
+                wavelength[points], power[channels, points]
+                and the optional TSL power monitor[points].
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping
+
+import numpy as np
+
+from ..logger import get_logger
+
+# Archive file names
+INDEX_FILE = "index.dat"
+DATA_FILE = "sweeps.dat"
+LOCK_FILE = "archive.lock"
+
+# Index file header: magic, format version and record size
+INDEX_MAGIC = b"PYSNTARC"
+INDEX_VERSION = 1
+INDEX_HEADER_DTYPE = np.dtype(
+    [("magic", "S8"), ("version", "<u4"), ("record_size", "<u4")]
+)
+
+# Index record layout
+INDEX_DTYPE = np.dtype(
+    [
+        ("dut_id", "S32"),
+        ("timestamp", "<f8"),
+        ("recipe_hash", "V16"),
+        ("tsl_serial", "S16"),
+        ("mpm_serial", "S16"),
+        ("offset", "<u8"),
+        ("data_points", "<u4"),
+        ("channels", "<u2"),
+        ("has_monitor", "u1"),
+    ]
+)
+
+# Sweep array data type
+DATA_DTYPE = np.dtype("<f8")
+
+
+def recipe_hash(recipe: Mapping[str, Any]) -> bytes:
+    """Return a 16 byte hash of a sweep recipe (e.g. the sweep parameters)."""
+    encoded = json.dumps(recipe, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=16).digest()
+
+
+class _FileLock:
+    """Exclusive inter-process lock on a lock file."""
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self._path, "a+b")
+        if os.name == "nt":
+            import msvcrt
+
+            while True:
+                try:
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.001)
+        else:
+            import fcntl
+
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if os.name == "nt":
+                import msvcrt
+
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+@dataclass(frozen=True)
+class ArchivedSweep:
+    """A sweep read from the archive. Arrays are read-only memory maps."""
+
+    index: int
+    dut_id: str
+    timestamp: float
+    recipe_hash: bytes
+    tsl_serial: str
+    mpm_serial: str
+    wavelength: np.ndarray
+    power: np.ndarray  # (channels x points)
+    monitor: np.ndarray | None
+
+
+class SweepArchive:
+    """Append-only, memory-mapped sweep archive with an index."""
+
+    def __init__(self, path: str | os.PathLike):
+        """
+        Open or create a sweep archive.
+
+        :param path: The archive directory.
+        """
+        self.logger = get_logger(self.__class__.__name__)
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.path / INDEX_FILE
+        self._data_path = self.path / DATA_FILE
+        self._lock_path = self.path / LOCK_FILE
+
+        with _FileLock(self._lock_path):
+            if not self._index_path.exists() or self._index_path.stat().st_size == 0:
+                header = np.array(
+                    [(INDEX_MAGIC, INDEX_VERSION, INDEX_DTYPE.itemsize)],
+                    dtype=INDEX_HEADER_DTYPE,
+                )
+                with open(self._index_path, "wb") as f:
+                    header.tofile(f)
+                self._data_path.touch()
+
+        self._check_header()
+        self.logger.info("Opened sweep archive: %s", self.path)
+
+    def _check_header(self):
+        """Validate the index file header."""
+        header = np.fromfile(self._index_path, dtype=INDEX_HEADER_DTYPE, count=1)
+        if (
+            len(header) != 1
+            or header["magic"][0] != INDEX_MAGIC
+            or header["version"][0] != INDEX_VERSION
+            or header["record_size"][0] != INDEX_DTYPE.itemsize
+        ):
+            raise ValueError(f"Invalid sweep archive index: {self._index_path}")
+
+    def __len__(self) -> int:
+        """Return the number of complete sweeps in the archive."""
+        size = self._index_path.stat().st_size - INDEX_HEADER_DTYPE.itemsize
+        return max(size, 0) // INDEX_DTYPE.itemsize
+
+    @property
+    def index(self) -> np.ndarray:
+        """Return a read-only memory map of all index records."""
+        count = len(self)
+        if count == 0:
+            return np.empty(0, dtype=INDEX_DTYPE)
+        return np.memmap(
+            self._index_path,
+            dtype=INDEX_DTYPE,
+            mode="r",
+            offset=INDEX_HEADER_DTYPE.itemsize,
+            shape=(count,),
+        )
+
+    def append(
+        self,
+        wavelength: np.ndarray,
+        power: np.ndarray,
+        dut_id: str,
+        monitor: np.ndarray | None = None,
+        recipe: Mapping[str, Any] | None = None,
+        tsl_serial: str = "",
+        mpm_serial: str = "",
+        timestamp: float | None = None,
+    ) -> int:
+        """
+        Append a sweep to the archive.
+
+        Safe to call concurrently from several processes. The sweep data
+        is written before its index record, so readers never see a
+        partially written sweep.
+
+        Parameters
+            wavelength: The wavelength array of the sweep.
+            power: The (points x channels) power data of the sweep.
+            dut_id: The DUT identifier.
+            monitor: Optional TSL power monitor data.
+            recipe: Optional sweep recipe, stored as a hash.
+            tsl_serial: The TSL serial number.
+            mpm_serial: The MPM serial number.
+            timestamp: The sweep time (defaults to now).
+
+        Returns
+            The index of the appended sweep.
+        """
+        power = np.asarray(power)
+        if power.ndim == 1:
+            power = power[:, None]
+        data_points, channels = power.shape
+        if len(wavelength) != data_points:
+            raise ValueError("Wavelength and power data lengths do not match.")
+        if monitor is not None and len(monitor) != data_points:
+            raise ValueError("Monitor and power data lengths do not match.")
+
+        record = np.zeros(1, dtype=INDEX_DTYPE)
+        for field, value in (
+            ("dut_id", dut_id),
+            ("tsl_serial", tsl_serial),
+            ("mpm_serial", mpm_serial),
+        ):
+            encoded = value.encode()
+            if len(encoded) > INDEX_DTYPE[field].itemsize:
+                raise ValueError(
+                    f"{field} exceeds {INDEX_DTYPE[field].itemsize} bytes: {value}"
+                )
+            record[field] = encoded
+        record["timestamp"] = time.time() if timestamp is None else timestamp
+        record["recipe_hash"] = np.void(recipe_hash(recipe) if recipe else bytes(16))
+        record["data_points"] = data_points
+        record["channels"] = channels
+        record["has_monitor"] = monitor is not None
+
+        with _FileLock(self._lock_path):
+            with open(self._data_path, "ab") as f:
+                record["offset"] = f.seek(0, os.SEEK_END)
+                np.asarray(wavelength, dtype=DATA_DTYPE).tofile(f)
+                np.ascontiguousarray(power.T, dtype=DATA_DTYPE).tofile(f)
+                if monitor is not None:
+                    np.asarray(monitor, dtype=DATA_DTYPE).tofile(f)
+                f.flush()
+                os.fsync(f.fileno())
+
+            with open(self._index_path, "ab") as f:
+                index = (
+                    f.seek(0, os.SEEK_END) - INDEX_HEADER_DTYPE.itemsize
+                ) // INDEX_DTYPE.itemsize
+                record.tofile(f)
+
+        self.logger.debug("Archived sweep %d of DUT %s.", index, dut_id)
+        return index
+
+    def _memmap(self, offset: int, shape: tuple[int, ...]) -> np.ndarray:
+        """Return a read-only memory map of the data file."""
+        return np.memmap(
+            self._data_path, dtype=DATA_DTYPE, mode="r", offset=offset, shape=shape
+        )
+
+    def read(self, index: int, channels: slice | None = None) -> ArchivedSweep:
+        """
+        Read a sweep without loading the data file.
+
+        :param index: The sweep index.
+        :param channels: Optional slice of channels to map.
+
+        :return: The archived sweep with memory mapped arrays.
+        """
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError(f"Sweep index out of range: {index}")
+
+        record = np.fromfile(
+            self._index_path,
+            dtype=INDEX_DTYPE,
+            count=1,
+            offset=INDEX_HEADER_DTYPE.itemsize + index * INDEX_DTYPE.itemsize,
+        )[0]
+        offset = int(record["offset"])
+        data_points = int(record["data_points"])
+        channel_count = int(record["channels"])
+        itemsize = DATA_DTYPE.itemsize
+
+        start, stop, step = (channels or slice(None)).indices(channel_count)
+        if step != 1 or stop <= start:
+            raise ValueError(f"Invalid channel slice: {channels}")
+
+        wavelength = self._memmap(offset, (data_points,))
+        power_offset = offset + (1 + start) * data_points * itemsize
+        power = self._memmap(power_offset, (stop - start, data_points))
+        monitor = None
+        if record["has_monitor"]:
+            monitor_offset = offset + (1 + channel_count) * data_points * itemsize
+            monitor = self._memmap(monitor_offset, (data_points,))
+
+        return ArchivedSweep(
+            index=index,
+            dut_id=record["dut_id"].decode(),
+            timestamp=float(record["timestamp"]),
+            recipe_hash=record["recipe_hash"].tobytes(),
+            tsl_serial=record["tsl_serial"].decode(),
+            mpm_serial=record["mpm_serial"].decode(),
+            wavelength=wavelength,
+            power=power,
+            monitor=monitor,
+        )
+
+    def find(self, dut_id: str) -> np.ndarray:
+        """Return the indices of all sweeps of a DUT."""
+        return np.flatnonzero(self.index["dut_id"] == dut_id.encode())
@@ -0,0 +1,19 @@
+# pysantec/broker/__init__.py
+
+"""
+PySantec instrument broker, sharing the instruments of a PC between processes.
+"""
+
+from .client import BrokerClient, InstrumentClient, RemoteObject
+from .server import DEFAULT_ADDRESS, InstrumentBroker
+from .service import InstrumentService, RemoteError
+
+__all__ = [
+    "BrokerClient",
+    "InstrumentClient",
+    "RemoteObject",
+    "DEFAULT_ADDRESS",
+    "InstrumentBroker",
+    "InstrumentService",
+    "RemoteError",
+]
@@ -0,0 +1,32 @@
+"""
+Run an instrument broker.
+
+    python -m pysantec.broker [--address ADDRESS] [--workers N]
+"""
+
+import argparse
+
+from .server import DEFAULT_ADDRESS, InstrumentBroker
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a PySantec instrument broker.")
+    parser.add_argument(
+        "--address", default=DEFAULT_ADDRESS, help="Socket path or named pipe."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=8, help="Threads running requests."
+    )
+    args = parser.parse_args()
+
+    broker = InstrumentBroker(args.address, workers=args.workers)
+    try:
+        broker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        broker.close()
+
+
+if __name__ == "__main__":
+    main()
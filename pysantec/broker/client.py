@@ -0,0 +1,198 @@
+"""
+Instrument broker client.
+
+Connects to an instrument broker and returns proxies mirroring the
+public methods and properties of the brokered instruments. The client
+can be shared by the threads of a process; their requests are sent
+over one connection and the responses matched by request ID.
+"""
+
+import itertools
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from multiprocessing.connection import Client
+
+from .server import CLOSE, DEFAULT_ADDRESS, FREE, read_key
+from .service import RESERVATION_TIMEOUT, decode_error
+from .shared_arrays import import_arrays
+
+
+class RemoteObject:
+    """
+    Proxy of an object served by a broker or a remote server.
+
+    Methods and properties of the served object are mirrored: calling a
+    method or reading a property sends a request. The ``status`` of the
+    proxy is the status of its last call.
+    """
+
+    def __init__(self, request, description: dict):
+        """
+        :param request: Callable sending a request (operation, *arguments)
+                        and returning its result.
+        :param description: The handle, class and interface of the object.
+        """
+        self._request = request
+        self._handle = description["handle"]
+        self._class_name = description["class"]
+        self._interface = description["interface"]
+        self.status = None
+
+    @property
+    def handle(self) -> str:
+        return self._handle
+
+    def __getattr__(self, name):
+        kind = self._interface.get(name) if not name.startswith("_") else None
+        if kind is None:
+            raise AttributeError(f"{self._class_name} has no attribute {name!r}")
+        if kind == "property":
+            value, self.status = self._request("get", self._handle, name)
+            return value
+
+        def method(*args, **kwargs):
+            result, self.status = self._request(
+                "call", self._handle, name, args, kwargs
+            )
+            return result
+
+        method.__name__ = name
+        return method
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self._interface))
+
+    def __repr__(self):
+        return f"<Remote {self._class_name} {self._handle}>"
+
+    @contextmanager
+    def reserved(self, timeout: float = RESERVATION_TIMEOUT):
+        """Run a command sequence without other clients interleaving."""
+        self._request("reserve", self._handle, timeout)
+        try:
+            yield self
+        finally:
+            self._request("unreserve", self._handle)
+
+    def release(self):
+        """Release the object, the server disconnects unused instruments."""
+        self._request("release", self._handle)
+
+
+class InstrumentClient:
+    """
+    Instruments and measurements of a server.
+
+    Subclasses send the requests to the server with ``request``.
+    """
+
+    def request(self, op: str, *args):
+        """Send a request and wait for its result."""
+        raise NotImplementedError
+
+    def list_resources(self) -> list:
+        """List the resources available to the server."""
+        return self.request("list_resources")
+
+    def connect_tsl(self, resource_name: str) -> RemoteObject:
+        """Connect to a TSL, or share the server's connection."""
+        return RemoteObject(self.request, self.request("connect", "tsl", resource_name))
+
+    def connect_mpm(self, resource_name: str) -> RemoteObject:
+        """Connect to an MPM, or share the server's connection."""
+        return RemoteObject(self.request, self.request("connect", "mpm", resource_name))
+
+    def connect_daq(self, device_name: str) -> RemoteObject:
+        """Connect to a NI DAQ device, or share the server's connection."""
+        return RemoteObject(self.request, self.request("connect", "daq", device_name))
+
+    def create_sme(self, tsl: RemoteObject, mpm: RemoteObject) -> RemoteObject:
+        """Create a single measurement operation of the client."""
+        return RemoteObject(
+            self.request, self.request("create_sme", tsl.handle, mpm.handle)
+        )
+
+
+class BrokerClient(InstrumentClient):
+    """Client of a local instrument broker."""
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, authkey: bytes | None = None):
+        """
+        :param address: The broker socket path, or named pipe on Windows.
+        :param authkey: The broker key, read from its key file by default.
+        """
+        if authkey is None:
+            authkey = read_key(address)
+        self._connection = Client(address, authkey=authkey)
+        self._pending = {}
+        self._request_ids = itertools.count(1)
+        self._send_lock = threading.Lock()
+        self._closed = False
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    def close(self):
+        """Close the connection, the broker releases the objects of the client."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            with self._send_lock:
+                self._connection.send((None, CLOSE, ()))
+        except OSError:
+            pass  # Broker gone
+        # Ends with the broker closing the connection
+        self._reader.join()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # region Requests
+    def request(self, op: str, *args):
+        """Send a request and wait for its result."""
+        return self.submit(op, *args).result()
+
+    def submit(self, op: str, *args) -> Future:
+        """Send a request and return the future of its result."""
+        if self._closed or not self._reader.is_alive():
+            raise ConnectionError("Broker connection closed.")
+        future = Future()
+        request_id = next(self._request_ids)
+        self._pending[request_id] = future
+        try:
+            with self._send_lock:
+                self._connection.send((request_id, op, args))
+        except Exception:
+            del self._pending[request_id]
+            raise
+        return future
+
+    def _read(self):
+        """Resolve the futures of the received responses."""
+        try:
+            while True:
+                request_id, ok, payload = self._connection.recv()
+                future = self._pending.pop(request_id)
+                if not ok:
+                    future.set_exception(decode_error(*payload))
+                    continue
+                names = []
+                try:
+                    future.set_result(import_arrays(payload, names))
+                finally:
+                    if names:
+                        with self._send_lock:
+                            self._connection.send((None, FREE, names))
+        except (EOFError, OSError):
+            pass
+        finally:
+            for future in self._pending.values():
+                future.set_exception(ConnectionError("Broker connection closed."))
+            self._pending.clear()
+
+    # endregion
@@ -0,0 +1,246 @@
+"""
+Instrument broker server.
+
+Owns the instrument connections of the PC and serves client processes
+over a local socket (named pipe on Windows). Requests of a client are
+multiplexed: each carries an ID, runs on a worker thread, and its
+response is sent back as soon as it completes, so a long call does not
+block the other requests of the client.
+
+Messages
+    Request: (request ID, operation, arguments). A request ID of None
+             expects no response.
+    Response: (request ID, True, result) or (request ID, False, (error
+              type, message)).
+
+Clients authenticate with a random key generated by each broker, and
+read from a key file only accessible to the user running the broker.
+"""
+
+import os
+import secrets
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+from ..logger import get_logger
+from .service import InstrumentService, encode_error
+from .shared_arrays import SHARED_MEMORY_THRESHOLD, export_arrays, free_blocks
+
+# Default broker address
+if os.name == "nt":
+    DEFAULT_ADDRESS = r"\\.\pipe\pysantec-broker"
+else:
+    DEFAULT_ADDRESS = os.path.join(tempfile.gettempdir(), "pysantec-broker.sock")
+
+# Length in bytes of the generated authentication keys
+AUTHKEY_SIZE = 32
+
+# Seconds close() waits for the accepting thread to end
+CLOSE_TIMEOUT = 5.0
+
+# Operation freeing the shared memory blocks of a response
+FREE = "free"
+
+# Operation ending a client session, the broker closes the connection
+CLOSE = "close"
+
+
+def key_path(address: str) -> str:
+    """Return the key file of a broker address."""
+    return os.path.join(tempfile.gettempdir(), os.path.basename(address) + ".key")
+
+
+def read_key(address: str) -> bytes:
+    """Return the authentication key of the broker at an address."""
+    try:
+        with open(key_path(address), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        raise ConnectionError(f"No instrument broker running at {address}.")
+
+
+def is_listening(address: str) -> bool:
+    """Return True if a broker, or another server, listens at an address."""
+    try:
+        Client(address).close()
+    except OSError:
+        return False
+    return True
+
+
+def _write_key(path: str, key: bytes):
+    """Write a key file readable by the current user only."""
+    if os.path.exists(path):
+        os.unlink(path)  # Left by a broker which did not exit cleanly
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    with os.fdopen(os.open(path, flags, 0o600), "wb") as f:
+        f.write(key)
+
+
+class InstrumentBroker:
+    """Local server sharing the instruments of the PC with client processes."""
+
+    def __init__(
+        self,
+        address: str = DEFAULT_ADDRESS,
+        authkey: bytes | None = None,
+        service: InstrumentService | None = None,
+        workers: int = 8,
+        shared_memory_threshold: int = SHARED_MEMORY_THRESHOLD,
+    ):
+        """
+        :param address: Socket path, or named pipe on Windows.
+        :param authkey: Key the clients authenticate with. By default a
+                        random key, written to the key file of the address.
+        :param service: The instrument service, with a new InstrumentManager
+                        by default.
+        :param workers: Number of threads running requests.
+        :param shared_memory_threshold: Smallest array in bytes returned
+                                        through shared memory.
+        """
+        if is_listening(address):
+            raise RuntimeError(f"An instrument broker is already running at {address}.")
+        if os.name != "nt" and os.path.exists(address):
+            os.unlink(address)  # Left by a broker which did not exit cleanly
+        self._key_path = None
+        if authkey is None:
+            authkey = secrets.token_bytes(AUTHKEY_SIZE)
+            self._key_path = key_path(address)
+        self._listener = Listener(address, authkey=authkey)
+        self._authkey = authkey
+        if self._key_path is not None:
+            _write_key(self._key_path, authkey)
+        self.service = service or InstrumentService()
+        self.shared_memory_threshold = shared_memory_threshold
+        self._executor = ThreadPoolExecutor(workers, "pysantec-broker")
+        self._connections = set()
+        self._closed = threading.Event()
+        self._thread = None
+        self.logger = get_logger(self.__class__.__name__)
+
+    @property
+    def address(self) -> str:
+        return self._listener.address
+
+    def serve_forever(self):
+        """Accept and serve clients until closed."""
+        self.logger.info("Instrument broker listening on %s.", self.address)
+        try:
+            while True:
+                try:
+                    connection = self._listener.accept()
+                except Exception as e:
+                    self.logger.warning("Rejected client: %s", e)
+                    continue
+                if self._closed.is_set():
+                    connection.close()  # Wake-up connection of close()
+                    break
+                threading.Thread(
+                    target=self._serve_client, args=(connection,), daemon=True
+                ).start()
+        finally:
+            self._listener.close()
+
+    def start(self):
+        """Serve clients in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        """Stop serving, close the client connections and the instruments."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._thread is not None:
+            # Closing the listener does not interrupt a waiting accept
+            try:
+                Client(self.address, authkey=self._authkey).close()
+            except (OSError, EOFError, AuthenticationError) as e:
+                self.logger.warning("Failed to wake the broker thread: %s", e)
+                self._listener.close()
+            self._thread.join(CLOSE_TIMEOUT)
+        else:
+            self._listener.close()
+        for connection in list(self._connections):
+            connection.close()
+        self._executor.shutdown()
+        self.service.close()
+        if self._key_path is not None:
+            try:
+                with open(self._key_path, "rb") as f:
+                    key = f.read()
+                if key == self._authkey:  # Not the key of a newer broker
+                    os.unlink(self._key_path)
+            except OSError:
+                pass
+        self.logger.info("Instrument broker closed.")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _serve_client(self, connection):
+        client = _Client(connection, self.service.open_session())
+        session = client.session
+        self._connections.add(connection)
+        self.logger.info("Client session %s opened.", session.session_id)
+        try:
+            while True:
+                try:
+                    request_id, op, args = connection.recv()
+                except (EOFError, OSError):
+                    break
+                if op == CLOSE:
+                    break
+                if op == FREE:
+                    client.free(args)
+                    continue
+                self._executor.submit(self._run, client, request_id, op, args)
+        finally:
+            self._connections.discard(connection)
+            connection.close()
+            session.close()
+            client.free(list(client.blocks))
+            self.logger.info("Client session %s closed.", session.session_id)
+
+    def _run(self, client: "_Client", request_id, op: str, args: tuple):
+        """Run a request and send its response."""
+        try:
+            blocks = []
+            result = client.session.handle(op, args)
+            result = export_arrays(result, blocks, self.shared_memory_threshold)
+            response = (request_id, True, result)
+            with client.lock:
+                client.blocks.update((block.name, block) for block in blocks)
+        except Exception as e:
+            self.logger.debug("Request %s %s failed: %s", request_id, op, e)
+            response = (request_id, False, encode_error(e))
+        if request_id is None:
+            return
+        try:
+            with client.lock:
+                client.connection.send(response)
+        except (OSError, ValueError):
+            pass  # Client disconnected
+
+
+class _Client:
+    """Connection, session and shared memory blocks of a broker client."""
+
+    def __init__(self, connection, session):
+        self.connection = connection
+        self.session = session
+        self.blocks = {}
+        self.lock = threading.Lock()
+
+    def free(self, names):
+        """Free the shared memory blocks copied by the client."""
+        with self.lock:
+            blocks = [self.blocks.pop(name, None) for name in names]
+        free_blocks([block for block in blocks if block is not None])
@@ -0,0 +1,304 @@
+"""
+Instrument service shared by the clients of a server.
+
+Owns the instrument connections of an InstrumentManager and the objects
+created for the clients, and dispatches the requests of the client
+sessions. Instruments are shared by all sessions and disconnected when
+the last session using them releases them. A session can reserve an
+instrument to run a command sequence without other sessions
+interleaving.
+"""
+
+import itertools
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from ..logger import get_logger
+
+# Exception types raised as themselves by the clients, others as RemoteError
+BUILTIN_ERRORS = {
+    error.__name__: error
+    for error in (
+        ValueError,
+        TypeError,
+        KeyError,
+        RuntimeError,
+        PermissionError,
+        NotImplementedError,
+        TimeoutError,
+    )
+}
+
+# Instrument kinds connected with the InstrumentManager connect_<kind> methods
+INSTRUMENT_KINDS = ("tsl", "mpm", "daq")
+
+# Seconds a call waits for an instrument reserved by another session
+RESERVATION_TIMEOUT = 60.0
+
+
+class RemoteError(Exception):
+    """An error raised by a server, not mapped to a built-in exception type."""
+
+    def __init__(self, type_name: str, message: str):
+        super().__init__(f"{type_name}: {message}")
+        self.type_name = type_name
+
+
+def encode_error(error: BaseException) -> tuple[str, str]:
+    """Return the type name and message of an exception."""
+    return type(error).__name__, str(error)
+
+
+def decode_error(type_name: str, message: str) -> Exception:
+    """Return the client side exception of an encoded server exception."""
+    error_type = BUILTIN_ERRORS.get(type_name)
+    if error_type is not None:
+        return error_type(message)
+    return RemoteError(type_name, message)
+
+
+def interface(obj) -> dict[str, str]:
+    """Return the public methods and properties of an object's class."""
+    members = {}
+    for name in dir(type(obj)):
+        if name.startswith("_"):
+            continue
+        member = getattr(type(obj), name)
+        if isinstance(member, property):
+            members[name] = "property"
+        elif callable(member):
+            members[name] = "method"
+    return members
+
+
+class InstrumentService:
+    """Instrument connections and objects served to client sessions."""
+
+    def __init__(self, manager=None):
+        """
+        :param manager: The InstrumentManager owning the connections.
+                        Created on first use by default.
+        """
+        self._manager = manager
+        self._objects = {}
+        self._users = Counter()
+        self._reservations = {}
+        # Running calls of each object, by session
+        self._active = defaultdict(Counter)
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._session_ids = itertools.count(1)
+        self._object_ids = itertools.count(1)
+        self.logger = get_logger(self.__class__.__name__)
+
+    @property
+    def manager(self):
+        """The InstrumentManager owning the connections."""
+        if self._manager is None:
+            # Imported on first use, clients do not need the Santec DLLs
+            from ..instruments.instrument_manager import InstrumentManager
+
+            self._manager = InstrumentManager()
+        return self._manager
+
+    def open_session(self) -> "Session":
+        """Open the session of a new client."""
+        return Session(self, next(self._session_ids))
+
+    def close(self):
+        """Disconnect all instruments."""
+        with self._lock:
+            self._objects.clear()
+            self._users.clear()
+        if self._manager is not None:
+            self._manager.disconnect_all()
+
+    # region Objects
+    def acquire_instrument(self, kind: str, resource_name: str):
+        """Return a connected instrument, connecting it on first use."""
+        if kind not in INSTRUMENT_KINDS:
+            raise ValueError(f"Invalid instrument kind: {kind}")
+        connect = getattr(self.manager, f"connect_{kind}")
+        with self._lock:
+            instrument = self._objects.get(resource_name)
+            if instrument is None:
+                instrument = self.manager.connected_instruments.get(resource_name)
+            if instrument is None:
+                instrument = connect(resource_name)
+            self._objects[resource_name] = instrument
+            self._users[resource_name] += 1
+        return instrument
+
+    def add_object(self, obj) -> str:
+        """Register an object created for a session and return its handle."""
+        handle = f"{obj.__class__.__name__}#{next(self._object_ids)}"
+        with self._lock:
+            self._objects[handle] = obj
+            self._users[handle] += 1
+        return handle
+
+    def get_object(self, handle: str):
+        obj = self._objects.get(handle)
+        if obj is None:
+            raise KeyError(f"Unknown object: {handle}")
+        return obj
+
+    def release(self, handle: str):
+        """Release a session's use of an object, disconnecting unused instruments."""
+        with self._lock:
+            self._users[handle] -= 1
+            if self._users[handle] > 0:
+                return
+            del self._users[handle]
+            self._objects.pop(handle, None)
+            disconnect = handle in self.manager.connected_instruments
+        if disconnect:
+            self.logger.info("Disconnecting unused instrument %s.", handle)
+            self.manager.disconnect(handle)
+
+    # endregion
+
+    # region Reservations
+    def reserve(self, handle: str, session_id: int, timeout: float):
+        """
+        Reserve an object for a session.
+
+        Waits until no other session reserves the object or runs a call on it.
+        """
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._reservations.get(handle, session_id) == session_id
+                and not self._active_sessions(handle, session_id),
+                timeout,
+            ):
+                raise TimeoutError(f"{handle} is reserved by another client.")
+            self._reservations[handle] = session_id
+
+    def unreserve(self, handle: str, session_id: int):
+        with self._condition:
+            if self._reservations.get(handle) == session_id:
+                del self._reservations[handle]
+                self._condition.notify_all()
+
+    @contextmanager
+    def access(self, handle: str, session_id: int):
+        """
+        Run a call of a session on an object.
+
+        Waits until the object is not reserved by another session, and
+        keeps other sessions from reserving it until the call returns.
+        """
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._reservations.get(handle, session_id) == session_id,
+                RESERVATION_TIMEOUT,
+            ):
+                raise TimeoutError(f"{handle} is reserved by another client.")
+            self._active[handle][session_id] += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                active = self._active[handle]
+                active[session_id] -= 1
+                if active[session_id] == 0:
+                    del active[session_id]
+                if not active:
+                    del self._active[handle]
+                self._condition.notify_all()
+
+    def _active_sessions(self, handle: str, session_id: int) -> bool:
+        """Return True if other sessions run calls on an object."""
+        active = self._active.get(handle)
+        return bool(active) and any(s != session_id for s in active)
+
+    # endregion
+
+
+class Session:
+    """Requests of one client, and the objects it uses."""
+
+    def __init__(self, service: InstrumentService, session_id: int):
+        self.service = service
+        self.session_id = session_id
+        self._handles = Counter()
+        self._lock = threading.Lock()
+
+    def handle(self, op: str, args: tuple):
+        """Dispatch a request and return its result."""
+        method = getattr(self, f"op_{op}", None)
+        if method is None:
+            raise ValueError(f"Invalid operation: {op}")
+        return method(*args)
+
+    def close(self):
+        """Release the objects and reservations of the session."""
+        with self._lock:
+            handles, self._handles = self._handles, Counter()
+        for handle, count in handles.items():
+            self.service.unreserve(handle, self.session_id)
+            for _ in range(count):
+                self.service.release(handle)
+
+    def _describe(self, handle: str, obj) -> dict:
+        with self._lock:
+            self._handles[handle] += 1
+        return {
+            "handle": handle,
+            "class": obj.__class__.__name__,
+            "interface": interface(obj),
+        }
+
+    # region Operations
+    def op_list_resources(self) -> list:
+        return self.service.manager.list_resources()
+
+    def op_connect(self, kind: str, resource_name: str) -> dict:
+        """Connect an instrument, or share its existing connection."""
+        instrument = self.service.acquire_instrument(kind, resource_name)
+        return self._describe(resource_name, instrument)
+
+    def op_create_sme(self, tsl_handle: str, mpm_handle: str) -> dict:
+        """Create a single measurement operation of two instruments."""
+        from ..measurements.single_measurement_operation import SME
+
+        sme = SME(
+            self.service.get_object(tsl_handle), self.service.get_object(mpm_handle)
+        )
+        return self._describe(self.service.add_object(sme), sme)
+
+    def op_call(self, handle: str, name: str, args: tuple, kwargs: dict) -> tuple:
+        """Call a public method, return its result and the call status."""
+        if name.startswith("_"):
+            raise PermissionError(f"Private method: {name}")
+        obj = self.service.get_object(handle)
+        with self.service.access(handle, self.session_id):
+            result = getattr(obj, name)(*args, **kwargs)
+            return result, getattr(obj, "status", None)
+
+    def op_get(self, handle: str, name: str) -> tuple:
+        """Return a public property and the status of reading it."""
+        if name.startswith("_"):
+            raise PermissionError(f"Private property: {name}")
+        obj = self.service.get_object(handle)
+        with self.service.access(handle, self.session_id):
+            return getattr(obj, name), getattr(obj, "status", None)
+
+    def op_reserve(self, handle: str, timeout: float = RESERVATION_TIMEOUT):
+        self.service.reserve(handle, self.session_id, timeout)
+
+    def op_unreserve(self, handle: str):
+        self.service.unreserve(handle, self.session_id)
+
+    def op_release(self, handle: str):
+        with self._lock:
+            if self._handles[handle] < 1:
+                raise KeyError(f"Object not used by the client: {handle}")
+            self._handles[handle] -= 1
+            if self._handles[handle] == 0:
+                del self._handles[handle]
+        self.service.unreserve(handle, self.session_id)
+        self.service.release(handle)
+
+    # endregion
@@ -0,0 +1,129 @@
+"""
+Bulk array transfer through shared memory.
+
+Large NumPy arrays and float lists, e.g. the logging data lists of the
+instruments, in broker responses are copied into a shared memory block,
+and only the block name, shape and data type are sent through the
+connection. The client copies the data out and asks the broker to free
+the block.
+"""
+
+import os
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Smallest array in bytes sent through shared memory, smaller ones are pickled
+SHARED_MEMORY_THRESHOLD = 64 * 1024
+
+# Names of the blocks created by this process
+_created = set()
+
+
+class SharedArray:
+    """Reference to an array in a shared memory block."""
+
+    __slots__ = ("name", "shape", "dtype", "is_list")
+
+    def __init__(self, name: str, shape: tuple, dtype: str, is_list: bool = False):
+        """
+        :param is_list: True if the shared data was a float list.
+        """
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+        self.is_list = is_list
+
+    def __reduce__(self):
+        return SharedArray, (self.name, self.shape, self.dtype, self.is_list)
+
+
+def _share(array: np.ndarray, blocks: list, is_list: bool = False) -> SharedArray:
+    """Copy an array into a new shared memory block."""
+    block = shared_memory.SharedMemory(create=True, size=array.nbytes)
+    blocks.append(block)
+    _created.add(block.name)
+    shared = np.ndarray(array.shape, array.dtype, buffer=block.buf)
+    shared[...] = array
+    del shared
+    return SharedArray(block.name, array.shape, array.dtype.str, is_list)
+
+
+def _is_float_list(value: list, threshold: int) -> bool:
+    """Return True if a list holds only floats, at least threshold bytes of them."""
+    return (
+        len(value) * 8 >= threshold
+        and isinstance(value[0], float)
+        and all(isinstance(v, float) for v in value)
+    )
+
+
+def export_arrays(value, blocks: list, threshold: int = SHARED_MEMORY_THRESHOLD):
+    """
+    Replace the large arrays of a response by shared memory references.
+
+    :param value: The response, arrays may be nested in tuples, lists and dicts.
+    :param blocks: Receives the created shared memory blocks.
+    :param threshold: Smallest array or float list in bytes to share.
+    """
+    if isinstance(value, np.ndarray):
+        if value.nbytes < threshold or value.dtype.hasobject:
+            return value
+        return _share(value, blocks)
+    if isinstance(value, tuple):
+        return tuple(export_arrays(v, blocks, threshold) for v in value)
+    if isinstance(value, list):
+        if _is_float_list(value, threshold):
+            return _share(np.array(value, dtype=np.float64), blocks, is_list=True)
+        return [export_arrays(v, blocks, threshold) for v in value]
+    if isinstance(value, dict):
+        return {k: export_arrays(v, blocks, threshold) for k, v in value.items()}
+    return value
+
+
+def import_arrays(value, names: list):
+    """
+    Copy the shared arrays of a response into process memory.
+
+    :param value: The response with shared memory references.
+    :param names: Receives the names of the copied blocks, to be freed.
+    """
+    if isinstance(value, SharedArray):
+        block = _attach(value.name)
+        try:
+            shared = np.ndarray(value.shape, np.dtype(value.dtype), buffer=block.buf)
+            array = shared.tolist() if value.is_list else shared.copy()
+            del shared
+        finally:
+            block.close()
+        names.append(value.name)
+        return array
+    if isinstance(value, tuple):
+        return tuple(import_arrays(v, names) for v in value)
+    if isinstance(value, list):
+        return [import_arrays(v, names) for v in value]
+    if isinstance(value, dict):
+        return {k: import_arrays(v, names) for k, v in value.items()}
+    return value
+
+
+def free_blocks(blocks: list):
+    """Close and remove shared memory blocks created by the broker."""
+    for block in blocks:
+        _created.discard(block.name)
+        block.close()
+        block.unlink()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to a block without taking over its lifetime."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    block = shared_memory.SharedMemory(name)
+    if os.name == "posix" and name not in _created:
+        # The resource tracker would remove the block when the client exits
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(block._name, "shared_memory")
+    return block
@@ -6,7 +6,4 @@ Drivers module.
 
 from .dll_manager import load_dlls
 
-
-__all__ = [
-    "load_dlls"
-]
+__all__ = ["load_dlls"]
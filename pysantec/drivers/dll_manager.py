@@ -51,11 +51,11 @@ def load_dlls():
     """Gets the path where the DLLs exist."""
     if dlls_exist(SYSTEM_DLL_PATH):
         dll_path = SYSTEM_DLL_PATH
-        logger.debug(f"Found DLLs in: {dll_path}")
+        logger.debug("Found DLLs in: %s", dll_path)
 
     elif dlls_exist(APPDATA_DLL_PATH):
         dll_path = APPDATA_DLL_PATH
-        logger.debug(f"Found DLLs in AppData: {dll_path}")
+        logger.debug("Found DLLs in AppData: %s", dll_path)
     else:
         raise RuntimeError("DLLs not found.")
 
@@ -75,14 +75,14 @@ def setup_dlls(dll_path, dlls=None):
     for dll in dlls:
         try:
             full_path = os.path.join(dll_path, dll)
-            logger.debug(f"Loading DLL: {full_path}")
+            logger.debug("Loading DLL: %s", full_path)
 
             # Attempt to load the DLL
             clr.AddReference(full_path)
 
-            logger.debug(f"DLL Loaded: {dll}")
+            logger.debug("DLL Loaded: %s", dll)
 
         except Exception as e:
-            logger.debug(f"Error loading DLL '{dll}': {e}")
+            logger.debug("Error loading DLL '%s': %s", dll, e)
             return False  # Stop on first failure
     return True  # Only returns True if all DLLs are loaded successfully
@@ -0,0 +1,341 @@
+"""
+PySantec flight recorder module.
+
+Records every instrument command (DLL function name, arguments, status
+code, latency and timestamp) into a fixed-size, memory-mapped binary
+ring buffer. The buffer lives in a file in the temporary directory, so
+the last commands survive a crash or hang of the process, while the hot
+path never performs disk I/O. The default per-process file is removed
+when the process exits normally.
+
+Decode a recorder file
+    python -m pysantec.flight_recorder [path] [--seconds N] [--last N]
+
+The module has no package dependencies, so a recorder file can also be
+decoded where pysantec cannot be imported:
+    python flight_recorder.py path
+"""
+
+import argparse
+import atexit
+import glob
+import itertools
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+# Default number of records in the ring buffer
+FLIGHT_RECORDER_CAPACITY = 65536
+
+# Recorder file header: magic, version, record size, capacity
+HEADER_FORMAT = "<8sIII"
+HEADER_SIZE = 64
+MAGIC = b"PYSNTFR1"
+VERSION = 1
+
+# Record: sequence number, timestamp, latency (ns), status code,
+# thread ID, instrument, function name, arguments
+RECORD = struct.Struct("<QdQiI16s32s48s")
+
+# File name prefix of the recorder files
+FILE_PREFIX = "pysantec_flight_"
+
+
+# Argument types formatted with repr, other arguments by type name
+_SIMPLE_TYPES = frozenset({bool, int, float, str, type(None)})
+
+# Maximum number of cached encoded commands
+_ENCODING_CACHE_SIZE = 4096
+
+
+def _format_args(args: tuple) -> bytes:
+    """Return a short description of the call arguments."""
+    for arg in args:
+        if arg.__class__ not in _SIMPLE_TYPES:
+            return ", ".join(
+                repr(a) if a.__class__ in _SIMPLE_TYPES else a.__class__.__name__
+                for a in args
+            ).encode("utf-8", "replace")
+    return ", ".join(map(repr, args)).encode("utf-8", "replace")
+
+
+class FlightRecorder:
+    """Fixed-size ring buffer of instrument commands in a memory-mapped file."""
+
+    def __init__(
+        self,
+        path: str | None = None,
+        capacity: int = FLIGHT_RECORDER_CAPACITY,
+        delete_on_close: bool | None = None,
+    ):
+        """
+        :param path: The recorder file (defaults to a per-process temp file).
+        :param capacity: The number of records kept.
+        :param delete_on_close: Remove the file on close, by default only
+                                the per-process temp file is removed.
+        """
+        if delete_on_close is None:
+            delete_on_close = path is None
+        if path is None:
+            path = os.path.join(
+                tempfile.gettempdir(), f"{FILE_PREFIX}{os.getpid()}.bin"
+            )
+        self.path = path
+        self.delete_on_close = delete_on_close
+        self.capacity = capacity
+        size = HEADER_SIZE + capacity * RECORD.size
+
+        with open(path, "w+b") as f:
+            f.truncate(size)
+            self._buffer = mmap.mmap(f.fileno(), size)
+        struct.pack_into(
+            HEADER_FORMAT, self._buffer, 0, MAGIC, VERSION, RECORD.size, capacity
+        )
+        self._sequence = itertools.count(1)
+        self._encoding_cache = {}
+
+    def record(
+        self,
+        instrument: str,
+        function_name: str,
+        args: tuple,
+        status: int,
+        latency_ns: int,
+    ):
+        """Record one command. Safe to call from several threads."""
+        # Polling loops repeat the same commands, so their encoding is cached
+        key = (instrument, function_name, args)
+        try:
+            encoded = self._encoding_cache[key]
+        except (KeyError, TypeError):
+            encoded = (instrument.encode(), function_name.encode(), _format_args(args))
+            try:
+                if len(self._encoding_cache) >= _ENCODING_CACHE_SIZE:
+                    self._encoding_cache.clear()
+                self._encoding_cache[key] = encoded
+            except TypeError:
+                pass  # Unhashable arguments, e.g. data lists
+
+        sequence = next(self._sequence)
+        RECORD.pack_into(
+            self._buffer,
+            HEADER_SIZE + (sequence % self.capacity) * RECORD.size,
+            sequence,
+            time.time(),
+            latency_ns,
+            status,
+            threading.get_ident() & 0xFFFFFFFF,
+            *encoded,
+        )
+
+    def close(self):
+        """Close the memory map and remove the file if ``delete_on_close``."""
+        self._buffer.close()
+        if self.delete_on_close:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+def read_records(path: str) -> list[dict]:
+    """
+    Read the records of a recorder file, oldest first.
+
+    :param path: The recorder file.
+
+    :return: The records as dictionaries.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, record_size, capacity = struct.unpack_from(HEADER_FORMAT, data)
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise ValueError(f"Invalid flight recorder file: {path}")
+
+    records = []
+    for values in RECORD.iter_unpack(data[HEADER_SIZE:]):
+        sequence, timestamp, latency_ns, status, thread_id = values[:5]
+        if sequence == 0:
+            continue
+        instrument, function_name, args = (
+            value.rstrip(b"\0").decode("utf-8", "replace") for value in values[5:]
+        )
+        records.append(
+            {
+                "sequence": sequence,
+                "timestamp": timestamp,
+                "latency_us": latency_ns / 1000,
+                "status": status,
+                "thread_id": thread_id,
+                "instrument": instrument,
+                "function": function_name,
+                "args": args,
+            }
+        )
+    records.sort(key=lambda record: record["sequence"])
+    return records
+
+
+def format_records(
+    records: list[dict], seconds: float | None = None, last: int | None = None
+) -> str:
+    """Return the records as text, optionally only the last seconds or records."""
+    if seconds is not None and records:
+        end_time = records[-1]["timestamp"]
+        records = [r for r in records if r["timestamp"] >= end_time - seconds]
+    if last is not None:
+        records = records[-last:]
+
+    lines = []
+    for r in records:
+        timestamp = time.strftime("%H:%M:%S", time.localtime(r["timestamp"]))
+        milliseconds = int(r["timestamp"] % 1 * 1000)
+        lines.append(
+            f"{r['sequence']:>10} {timestamp}.{milliseconds:03d} "
+            f"{r['thread_id']:>8} {r['instrument']:<6} "
+            f"{r['function']}({r['args']}) -> {r['status']} "
+            f"[{r['latency_us']:.1f} us]"
+        )
+    return "\n".join(lines)
+
+
+# Process-wide recorder, created on the first instrument call
+_recorder = None
+_recorder_enabled = True
+_recorder_lock = threading.Lock()
+
+
+def get_flight_recorder() -> FlightRecorder | None:
+    """Return the process-wide recorder, or None if it is disabled."""
+    global _recorder
+
+    if _recorder is None and _recorder_enabled:
+        with _recorder_lock:
+            if _recorder is None:
+                _recorder = FlightRecorder()
+    return _recorder
+
+
+def configure_flight_recorder(
+    enabled: bool = True,
+    path: str | None = None,
+    capacity: int = FLIGHT_RECORDER_CAPACITY,
+    dump_on_exception: bool = False,
+):
+    """
+    Configure the process-wide recorder.
+
+    :param enabled: False to stop recording.
+    :param path: The recorder file (defaults to a per-process temp file,
+                 removed at exit). A given file is kept.
+    :param capacity: The number of records kept.
+    :param dump_on_exception: Install hooks dumping the recorder when an
+                              unhandled exception ends a thread or process.
+    """
+    global _recorder, _recorder_enabled
+
+    with _recorder_lock:
+        if _recorder is not None:
+            _recorder.close()
+        _recorder = FlightRecorder(path, capacity) if enabled else None
+        _recorder_enabled = enabled
+    if enabled and dump_on_exception:
+        install_excepthook()
+
+
+def _close_flight_recorder():
+    """Close the process-wide recorder at exit, removing its temp file."""
+    global _recorder, _recorder_enabled
+
+    with _recorder_lock:
+        if _recorder is not None:
+            _recorder.close()
+        _recorder = None
+        _recorder_enabled = False
+
+
+atexit.register(_close_flight_recorder)
+
+
+def dump_flight_recorder(
+    seconds: float | None = 60.0, path: str | None = None
+) -> str | None:
+    """
+    Write the last records of the process-wide recorder to a text file.
+
+    :param seconds: Only dump the records of the last seconds.
+    :param path: The text file (defaults to a file next to the recorder file).
+
+    :return: The text file path, or None if nothing was recorded.
+    """
+    if _recorder is None:
+        return None
+    if path is None:
+        stem = os.path.splitext(_recorder.path)[0]
+        path = f"{stem}_{time.strftime('%Y%m%d-%H%M%S')}.txt"
+    text = format_records(read_records(_recorder.path), seconds=seconds)
+    with open(path, "w") as f:
+        f.write(text + "\n")
+    return path
+
+
+_excepthook_installed = False
+
+
+def install_excepthook(seconds: float = 60.0):
+    """Dump the recorder when an unhandled exception ends a thread or process."""
+    global _excepthook_installed
+
+    if _excepthook_installed:
+        return
+    _excepthook_installed = True
+    previous_excepthook = sys.excepthook
+    previous_thread_excepthook = threading.excepthook
+
+    def _dump():
+        try:
+            path = dump_flight_recorder(seconds)
+            if path:
+                print(f"Flight recorder dump: {path}", file=sys.stderr)
+        except Exception as e:
+            print(f"Flight recorder dump failed: {e}", file=sys.stderr)
+
+    def excepthook(exc_type, exc_value, traceback):
+        _dump()
+        previous_excepthook(exc_type, exc_value, traceback)
+
+    def thread_excepthook(args):
+        _dump()
+        previous_thread_excepthook(args)
+
+    sys.excepthook = excepthook
+    threading.excepthook = thread_excepthook
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode a flight recorder file.")
+    parser.add_argument(
+        "path",
+        nargs="?",
+        help="The recorder file (defaults to the newest one in the temp directory).",
+    )
+    parser.add_argument("--seconds", type=float, help="Only the last seconds.")
+    parser.add_argument("--last", type=int, help="Only the last records.")
+    args = parser.parse_args()
+
+    path = args.path
+    if path is None:
+        files = glob.glob(os.path.join(tempfile.gettempdir(), FILE_PREFIX + "*.bin"))
+        if not files:
+            parser.error("No flight recorder files found.")
+        path = max(files, key=os.path.getmtime)
+
+    print(format_records(read_records(path), seconds=args.seconds, last=args.last))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,11 @@ from .wrapper.enumerations import connection_enums, mpm_enums, tsl_enums
 from .tsl_instrument import TSLInstrument
 from .mpm_instrument import MPMInstrument
 from .daq_instrument import DAQInstrument
+from .optical_switch import (
+    OpticalSwitch,
+    ScpiOpticalSwitch,
+    SimulatedOpticalSwitch,
+)
 
 __all__ = [
     "connection_enums",
@@ -16,4 +21,7 @@ __all__ = [
     "TSLInstrument",
     "MPMInstrument",
     "DAQInstrument",
+    "OpticalSwitch",
+    "ScpiOpticalSwitch",
+    "SimulatedOpticalSwitch",
 ]
@@ -0,0 +1,129 @@
+"""
+Adaptive instrument I/O time outs.
+
+Learns the I/O time out of each command class of an instrument from the
+observed DLL call latency: the 99th percentile times a safety margin,
+clamped to a floor and a ceiling. A lost connection is detected after
+the time out of the class instead of the fixed connection time out,
+while slow commands can be given a longer time out by name. Bulk data
+transfers always use the ceiling, as their duration depends on the
+number of data points, not on the class.
+"""
+
+import numpy as np
+
+from .command_scheduler import CommandPriority
+from .wrapper.instrument_wrapper import DEFAULT_TIMEOUT_MS
+
+# Successful calls between two updates of the learned time out of a class
+UPDATE_INTERVAL = 256
+
+# Commands waiting on the instrument, or taking seconds to complete,
+# using the ceiling time out unless overridden
+SLOW_FUNCTIONS = frozenset(
+    {
+        "TSL_Busy_Check",
+        "Waiting_For_Sweep_Status",
+        "Waiting_for_sampling",
+        "Zeroing",
+    }
+)
+
+
+class AdaptiveTimeouts:
+    """Per command class I/O time outs learned from the observed latency."""
+
+    def __init__(
+        self,
+        margin: float = 3.0,
+        floor: float = 0.5,
+        ceiling: float = 60.0,
+        default: float = DEFAULT_TIMEOUT_MS / 1000,
+        min_samples: int = 32,
+        window: int = 1024,
+    ):
+        """
+        :param margin: Factor applied to the 99th percentile latency.
+        :param floor: Shortest time out in seconds.
+        :param ceiling: Longest time out in seconds.
+        :param default: Time out in seconds until enough calls were observed.
+                        Bulk data transfers always use the ceiling.
+        :param min_samples: Calls observed before a class time out is learned.
+        :param window: Number of recent latencies kept per class.
+        """
+        if margin < 1.0:
+            raise ValueError("Margin must be at least 1.")
+        if not 0 < floor <= default <= ceiling:
+            raise ValueError("Time outs must satisfy 0 < floor <= default <= ceiling.")
+        if min_samples < 1 or window < min_samples:
+            raise ValueError("Window must hold at least min_samples latencies.")
+        self.margin = margin
+        self.floor = floor
+        self.ceiling = ceiling
+        self.min_samples = min_samples
+        self._window = window
+        # Ring buffers of the recent latencies
+        self._latencies = {priority: [0.0] * window for priority in CommandPriority}
+        self._counts = dict.fromkeys(CommandPriority, 0)
+        self._timeouts = dict.fromkeys(CommandPriority, default)
+        self._timeouts[CommandPriority.BULK] = ceiling
+        self._overrides = dict.fromkeys(SLOW_FUNCTIONS, ceiling)
+
+    def set_override(self, function_name: str, timeout: float):
+        """Use a fixed time out in seconds for a DLL function."""
+        if timeout <= 0:
+            raise ValueError("Time out must be a positive value.")
+        self._overrides[function_name] = timeout
+
+    def clear_override(self, function_name: str):
+        """Use the learned time out of its class for a DLL function."""
+        self._overrides.pop(function_name, None)
+
+    def timeout(self, function_name: str, priority: CommandPriority) -> float:
+        """Return the time out in seconds of a DLL call."""
+        timeout = self._overrides.get(function_name)
+        return self._timeouts[priority] if timeout is None else timeout
+
+    def observe(self, function_name: str, priority: CommandPriority, latency: float):
+        """
+        Record the latency in seconds of a successful DLL call.
+
+        Called with the device lock held. Functions with a fixed time out
+        and bulk data transfers are not learned.
+        """
+        if priority == CommandPriority.BULK or function_name in self._overrides:
+            return
+        count = self._counts[priority]
+        self._latencies[priority][count % self._window] = latency
+        count = self._counts[priority] = count + 1
+        if (
+            count >= self.min_samples
+            and (count - self.min_samples) % UPDATE_INTERVAL == 0
+        ):
+            p99 = self._p99(priority)
+            self._timeouts[priority] = min(
+                self.ceiling, max(self.floor, p99 * self.margin)
+            )
+
+    def _p99(self, priority: CommandPriority) -> float:
+        """Return the 99th percentile of the recent latencies of a class."""
+        count = min(self._counts[priority], self._window)
+        if count == 0:
+            return 0.0
+        return float(np.percentile(self._latencies[priority][:count], 99))
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """
+        Return the time outs by command class.
+
+        :return: The number of observed calls, the 99th percentile latency
+                 and the current time out in seconds of each class.
+        """
+        stats = {}
+        for priority in CommandPriority:
+            stats[priority.name] = {
+                "count": self._counts[priority],
+                "p99": self._p99(priority),
+                "timeout": self._timeouts[priority],
+            }
+        return stats
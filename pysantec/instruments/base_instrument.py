@@ -3,6 +3,8 @@ Base instrument module.
 """
 
 import inspect
+import threading
+import time
 from .wrapper import (
     MPM,
     TSL,
@@ -10,7 +12,66 @@ from .wrapper import (
     InstrumentExceptionCode,
     to_instrument_exception_code,
 )
+from .adaptive_timeout import AdaptiveTimeouts
+from .command_scheduler import CommandPriority, CommandScheduler
+from .retry import RetryPolicy, RetryStats
+from ..flight_recorder import get_flight_recorder
 from ..logger import get_logger
+from ..tracing import get_tracer
+
+# DLL functions stopping an operation, scheduled before all other commands
+ABORT_FUNCTIONS = frozenset(
+    {"Sweep_Stop", "Sweep_Pause", "Logging_Stop", "Sampling_Stop"}
+)
+
+# Bulk data transfer DLL functions, scheduled after all other commands.
+# Not coalesced, as they fill caller buffers or run a scan lifecycle.
+BULK_FUNCTIONS = frozenset(
+    {
+        "Get_Logging_Data",
+        "Get_Logging_Data_Power_for_STS",
+        "Get_Each_Channel_Logdata",
+        "Get_Each_Module_Loggdata",
+        "Get_Sampling_Data",
+        "Get_Sampling_Rawdata",
+    }
+)
+
+
+# Status codes of a lost connection, recovered by reconnecting
+CONNECTION_ERROR_CODES = frozenset(
+    {InstrumentExceptionCode.NotConnected, InstrumentExceptionCode.CommunicationFailure}
+)
+
+# Setters addressing a module or channel, by the number of address arguments
+ADDRESSED_SETTERS = {"Set_Mode_Each_Module": 1, "Set_Range_Each_Channel": 2}
+
+# Setters triggering an action, not part of the instrument configuration
+ACTION_SETTERS = frozenset({"Set_Software_Trigger"})
+
+
+def _command_priority(function_name: str) -> CommandPriority:
+    """Return the scheduling priority of a DLL function."""
+    if function_name in ABORT_FUNCTIONS:
+        return CommandPriority.ABORT
+    if function_name in BULK_FUNCTIONS:
+        return CommandPriority.BULK
+    if function_name.startswith("Get_") or function_name in ("Echo", "Read"):
+        return CommandPriority.QUERY
+    return CommandPriority.CONTROL
+
+
+class _Flight:
+    """An in-flight (or recently completed) read-only DLL call."""
+
+    __slots__ = ("done", "result", "error", "end_time")
+
+    def __init__(self):
+        # Created when a second caller joins, most calls are not shared
+        self.done = None
+        self.result = None
+        self.error = None
+        self.end_time = None
 
 
 class BaseInstrument:
@@ -18,7 +79,25 @@ class BaseInstrument:
 
     def __init__(self):
         self._instrument = None
-        self._status = None
+        # Per-device command scheduler and per-thread call status
+        self._lock = CommandScheduler()
+        self._local = threading.local()
+        # Single-flight coalescing of identical read-only calls
+        self._single_flight = True
+        self._freshness = 0.0
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self.coalesced_calls = 0
+        # Retries of transient communication errors
+        self.retry_policy = RetryPolicy()
+        self.retry_stats = RetryStats()
+        # Connection health and the last applied settings, for reconnecting
+        self._last_status = 0
+        self._last_call_ns = 0
+        self._settings = {}
+        # I/O time outs learned from the command latency, None to disable
+        self.timeouts = AdaptiveTimeouts()
+        self._applied_timeout_ms = None
         self.logger = get_logger(self._instrument.__class__.__name__)
 
     def instrument(self, wrapper_type: InstrumentWrapper):
@@ -39,9 +118,34 @@ class BaseInstrument:
             self.logger.error(error_string)
             raise PermissionError(error_string)
 
+    @property
+    def lock(self) -> CommandScheduler:
+        """
+        Returns the per-device command lock.
+
+        Every DLL call holds the lock, so an instrument can be shared
+        across threads. Hold it to run several commands atomically,
+        e.g. a write followed by a read. Abort commands of other threads
+        (stop scan, stop logging) still run between the commands.
+        """
+        return self._lock
+
+    def command_latency_stats(self) -> dict[str, dict[str, float]]:
+        """Returns the command wait times for the device by priority class."""
+        return self._lock.latency_stats()
+
+    @property
+    def _status(self) -> InstrumentExceptionCode | None:
+        """The status of the last call of the current thread."""
+        return getattr(self._local, "status", None)
+
+    @_status.setter
+    def _status(self, value: InstrumentExceptionCode | None):
+        self._local.status = value
+
     @property
     def status(self) -> str:
-        """Returns the current instrument status string."""
+        """Returns the status string of the last call of the current thread."""
         return self.__status
 
     @property
@@ -54,7 +158,7 @@ class BaseInstrument:
     @__status.setter
     def __status(self, value: InstrumentExceptionCode):
         """Set the current instrument status."""
-        self.logger.debug(f"Setting instrument status: {value}")
+        self.logger.debug("Setting instrument status: %s", value)
         self._status = value
 
     def query(self, command: str) -> str:
@@ -66,9 +170,9 @@ class BaseInstrument:
         self.logger.debug("Query command: %s", command)
 
         try:
-            status, response = self._instrument.Echo(command, "")
+            status, response = self._call("Echo", command, "")
             self.__status = to_instrument_exception_code(status)
-            self.logger.debug(f"Query Status: {status}. Response: {response}.")
+            self.logger.debug("Query Status: %s. Response: %s.", status, response)
             return response
 
         except Exception as e:
@@ -84,9 +188,9 @@ class BaseInstrument:
         self.logger.debug("Write command: %s", command)
 
         try:
-            status = self._instrument.Write(command)
+            status = self._call("Write", command)
             self.__status = to_instrument_exception_code(status)
-            self.logger.debug(f"Write Status: {status}.")
+            self.logger.debug("Write Status: %s.", status)
 
         except Exception as e:
             error_string = f"Error while writing command {command}: {e}"
@@ -100,9 +204,9 @@ class BaseInstrument:
         self.logger.debug("Read command.")
 
         try:
-            status, response = self._instrument.Read("")
+            status, response = self._call("Read", "")
             self.__status = to_instrument_exception_code(status)
-            self.logger.debug(f"Read Status: {status}. Response: {response}.")
+            self.logger.debug("Read Status: %s. Response: %s.", status, response)
             return response
 
         except Exception as e:
@@ -114,33 +218,246 @@ class BaseInstrument:
     def idn(self):
         """Return the identification string of the instrument."""
         idn = self.query("*IDN?")
-        self.logger.debug(f"IDN string: {idn}")
+        self.logger.debug("IDN string: %s", idn)
         return idn
 
     @property
     def product_name(self):
         """Return the product name of the instrument."""
         product_name = self._instrument.Information.ProductName
-        self.logger.debug(f"Product name: {product_name}")
+        self.logger.debug("Product name: %s", product_name)
         return product_name
 
     @property
     def serial_number(self):
         """Return the serial number of the instrument."""
         serial_number = self._instrument.Information.SerialNumber
-        self.logger.debug(f"Serial number: {serial_number}")
+        self.logger.debug("Serial number: %s", serial_number)
         return serial_number
 
     @property
     def firmware_version(self):
         """Return the firmware version of the instrument."""
         firmware_version = self._instrument.Information.FWversion
-        self.logger.debug(f"Firmware version: {firmware_version}")
+        self.logger.debug("Firmware version: %s", firmware_version)
         return firmware_version
 
+    def configure_single_flight(self, enabled: bool = True, freshness: float = 0.0):
+        """
+        Configure the coalescing of identical read-only (``Get_``) calls.
+
+        Threads calling the same getter with the same arguments while a
+        call is in flight share its result instead of queuing another
+        bus transaction.
+
+        :param enabled: False to send every call to the instrument.
+        :param freshness: Seconds a completed result is shared with later
+                          identical calls. 0 shares in-flight calls only.
+        """
+        if freshness < 0:
+            raise ValueError("Freshness must be a non-negative value.")
+        with self._flights_lock:
+            self._single_flight = enabled
+            self._freshness = freshness
+            self._flights.clear()
+
+    def heartbeat(self) -> bool:
+        """
+        Send a cheap query to the instrument.
+
+        :return: False if the connection to the instrument is lost.
+        """
+        try:
+            result = self._call_device("Echo", "*IDN?", "")
+        except Exception as e:
+            self.logger.warning("Heartbeat failed: %s", e)
+            return False
+        error_code = result[0] if isinstance(result, tuple) else result
+        return error_code not in CONNECTION_ERROR_CODES
+
+    def reapply_configuration(self):
+        """
+        Apply the last set value of each setting again, in the order set.
+
+        Called after reconnecting to an instrument which lost its settings,
+        e.g. after a power cycle.
+        """
+        with self._lock:
+            self._last_status = 0
+            self._applied_timeout_ms = None  # Reset by the connection
+            settings = list(self._settings.values())
+            self.logger.info("Reapplying %s settings.", len(settings))
+            for function_name, args in settings:
+                error_code = self._call_device(function_name, *args)
+                if error_code != 0:
+                    self.logger.warning(
+                        "Failed to reapply %s%s: %s", function_name, args, error_code
+                    )
+
+    def _apply_timeout(self, timeout: float):
+        """Set the I/O time out of the DLL object, if changed."""
+        timeout_ms = int(timeout * 1000)
+        if timeout_ms != self._applied_timeout_ms:
+            self._instrument.TimeOut = timeout_ms
+            self._applied_timeout_ms = timeout_ms
+
+    def _record_setting(self, function_name, args):
+        """Remember a successfully applied setting."""
+        if function_name in ACTION_SETTERS:
+            return
+        key = (function_name, *args[: ADDRESSED_SETTERS.get(function_name, 0)])
+        # Moved to the end, settings are reapplied in the order last set
+        self._settings.pop(key, None)
+        self._settings[key] = (function_name, args)
+
+    def _call(self, function_name, *args):
+        """Call a DLL function of the instrument, coalescing read-only calls."""
+        if (
+            self._single_flight
+            and function_name.startswith("Get_")
+            and function_name not in BULK_FUNCTIONS
+            # A thread holding the lock for a command sequence calls directly,
+            # it would otherwise wait for a call queued behind its own lock
+            and not self._lock._is_owned()
+        ):
+            key = (function_name, args)
+            try:
+                hash(key)
+            except TypeError:
+                return self._call_device(function_name, *args)  # e.g. data lists
+            return self._call_single_flight(key)
+        return self._call_device(function_name, *args)
+
+    def _call_single_flight(self, key: tuple):
+        """Share one DLL call among identical concurrent calls."""
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            if flight is not None and flight.end_time is not None:
+                if time.monotonic() - flight.end_time > self._freshness:
+                    flight = None
+            if flight is None:
+                leader = True
+                flight = self._flights[key] = _Flight()
+            else:
+                leader = False
+                self.coalesced_calls += 1
+                if flight.end_time is None and flight.done is None:
+                    flight.done = threading.Event()
+                done = flight.done if flight.end_time is None else None
+
+        if not leader:
+            if done is not None:
+                done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._call_device(key[0], *key[1])
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                flight.end_time = time.monotonic()
+                if flight.error is not None or self._freshness <= 0:
+                    if self._flights.get(key) is flight:
+                        del self._flights[key]
+                done = flight.done
+            if done is not None:
+                done.set()
+
+    def _call_device(self, function_name, *args):
+        """Call a DLL function, retrying transient communication errors."""
+        policy = self.retry_policy
+        if not policy.is_retryable(function_name, args):
+            return self._call_once(function_name, args)
+
+        attempt = 1
+        while True:
+            try:
+                result = self._call_once(function_name, args)
+            except Exception as e:
+                if not policy.is_transient_exception(e):
+                    raise
+                result, error = None, e
+            else:
+                if not policy.is_transient_result(result):
+                    if attempt > 1:
+                        self.retry_stats.record(
+                            self.retry_stats.recovered, function_name
+                        )
+                    return result
+                error = None
+
+            if attempt >= policy.max_attempts:
+                self.retry_stats.record(self.retry_stats.failed, function_name)
+                if error is not None:
+                    raise error
+                return result
+
+            delay = policy.backoff(attempt)
+            self.retry_stats.record(self.retry_stats.retries, function_name)
+            self.logger.warning(
+                "Transient error in %s (attempt %s of %s): %s. Retrying in %.3f s.",
+                function_name,
+                attempt,
+                policy.max_attempts,
+                error if error is not None else result,
+                delay,
+            )
+            time.sleep(delay)
+            attempt += 1
+
+    def _call_once(self, function_name, args):
+        """Call a DLL function of the instrument and record the command."""
+        function = getattr(self._instrument, function_name)
+        recorder = get_flight_recorder()
+        tracer = get_tracer()
+        timeouts = self.timeouts
+        status = -1
+        priority = _command_priority(function_name)
+        self._lock.acquire(priority)
+        try:
+            if timeouts is not None:
+                self._apply_timeout(timeouts.timeout(function_name, priority))
+            start = time.perf_counter_ns()
+            try:
+                if tracer is None:
+                    result = function(*args)
+                else:
+                    with tracer.span(
+                        function_name,
+                        "dll",
+                        instrument=self._instrument.__class__.__name__,
+                    ):
+                        result = function(*args)
+                error_code = result[0] if isinstance(result, tuple) else result
+                status = error_code if isinstance(error_code, int) else 0
+                if status == 0 and function_name.startswith("Set_"):
+                    self._record_setting(function_name, args)
+                return result
+            finally:
+                latency_ns = time.perf_counter_ns() - start
+                self._last_status = status
+                self._last_call_ns = start
+                if status == 0 and timeouts is not None:
+                    timeouts.observe(function_name, priority, latency_ns / 1e9)
+                if recorder is not None:
+                    recorder.record(
+                        self._instrument.__class__.__name__,
+                        function_name,
+                        args,
+                        status,
+                        latency_ns,
+                    )
+        finally:
+            self._lock.release()
+
     def _get_response(self, function_name, *args):
         """Get a response from the instrument for a given function."""
-        error_code, response = getattr(self._instrument, function_name)(*args)
+        error_code, response = self._call(function_name, *args)
         self.__status = to_instrument_exception_code(error_code)
         return response
 
@@ -148,8 +465,8 @@ class BaseInstrument:
         """Get multiple responses from the instrument for a given function."""
         response_1 = self._init_response(response_type_1)
         response_2 = self._init_response(response_type_2)
-        error_code, response_1, response_2 = getattr(self._instrument, function_name)(
-            response_1, response_2
+        error_code, response_1, response_2 = self._call(
+            function_name, response_1, response_2
         )
         self.__status = to_instrument_exception_code(error_code)
         return response_1, response_2
@@ -161,8 +478,8 @@ class BaseInstrument:
         from the instrument for a given function."""
         response_1 = self._init_response(response_type_1)
         response_2 = self._init_response(response_type_2)
-        error_code, response_1, response_2 = getattr(self._instrument, function_name)(
-            *args, response_1, response_2
+        error_code, response_1, response_2 = self._call(
+            function_name, *args, response_1, response_2
         )
         self.__status = to_instrument_exception_code(error_code)
         return response_1, response_2
@@ -174,7 +491,7 @@ class BaseInstrument:
 
     def _set_function(self, function_name, *args):
         """Set values on the instrument for a given function."""
-        error_code = getattr(self._instrument, function_name)(*args)
+        error_code = self._call(function_name, *args)
         self.__status = to_instrument_exception_code(error_code)
 
     def _set_and_get_function(self, function_name, *args, response_type=-1):
@@ -194,27 +511,27 @@ class BaseInstrument:
         """Get an enum value from the instrument for a given function."""
         self._check_restricted_method()
         enum_value = function_enum_name.value
-        error_code, enum_value = getattr(self._instrument, function_name)(enum_value)
+        error_code, enum_value = self._call(function_name, enum_value)
         self.__status = to_instrument_exception_code(error_code)
         return function_enum_name.__class__(enum_value)
 
     def _set_function_enum(self, function_name, function_enum_name):
         """Set an enum value on the instrument for a given function."""
         self._check_restricted_method()
-        error_code = getattr(self._instrument, function_name)(function_enum_name.value)
+        error_code = self._call(function_name, function_enum_name.value)
         self.__status = to_instrument_exception_code(error_code)
 
     def _set_and_get_function_enum(self, function_name, enum_type, *args):
         """Set values and get an enum value
         from the instrument for a given function."""
         self._check_restricted_method()
-        error_code, enum_value = getattr(self._instrument, function_name)(*args)
+        error_code, enum_value = self._call(function_name, *args)
         self.__status = to_instrument_exception_code(error_code)
         return enum_type(enum_value)
 
     def disconnect(self):
         """Disconnect the instrument."""
         self.logger.info("Disconnecting instrument.")
-        error_code = self._instrument.DisConnect()
+        error_code = self._call("DisConnect")
         self.__status = to_instrument_exception_code(error_code)
-        self.logger.info(f"Instrument disconnected. Status: {self.__status}.")
+        self.logger.info("Instrument disconnected. Status: %s.", self.__status)
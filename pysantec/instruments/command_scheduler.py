@@ -0,0 +1,154 @@
+"""
+Instrument command scheduler.
+
+Serializes the DLL calls of one instrument and grants waiting threads
+access in priority order: abort commands before control commands,
+queries and bulk data transfers. A thread running a command sequence
+yields to waiting abort commands between its commands, so a stop does
+not wait for the whole sequence.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+
+import numpy as np
+
+# Number of recent wait times kept per priority for the latency statistics
+LATENCY_SAMPLES = 1024
+
+
+class CommandPriority(IntEnum):
+    """Command priority classes, highest priority first."""
+
+    ABORT = 0
+    CONTROL = 1
+    QUERY = 2
+    BULK = 3
+
+
+class CommandScheduler:
+    """
+    Reentrant per-device command lock granted in priority order.
+
+    The device is handed over directly to the highest priority waiting
+    thread on release. Can be used as a context manager to run a command
+    sequence with control priority.
+    """
+
+    def __init__(self):
+        self._state_lock = threading.Lock()
+        self._owner = None
+        self._count = 0
+        # Heap of (priority, order, wake-up lock, thread ID, lock count)
+        self._waiting = []
+        self._order = itertools.count()
+        self._wait_times = {
+            priority: deque(maxlen=LATENCY_SAMPLES) for priority in CommandPriority
+        }
+        self._wait_counts = dict.fromkeys(CommandPriority, 0)
+        self._max_wait_times = dict.fromkeys(CommandPriority, 0.0)
+
+    def acquire(self, priority: CommandPriority = CommandPriority.CONTROL):
+        """
+        Acquire the device for a command.
+
+        A thread already owning the device yields it to waiting abort
+        commands first, unless it is itself sending an abort command.
+        """
+        me = threading.get_ident()
+        with self._state_lock:
+            if self._owner is None and not self._waiting:
+                self._owner = me
+                self._count = 1
+                self._record_wait(priority, 0.0)
+                return
+            if self._owner == me:
+                if (
+                    priority == CommandPriority.ABORT
+                    or not self._waiting
+                    or self._waiting[0][0] != CommandPriority.ABORT
+                ):
+                    self._count += 1
+                    return
+                # Queued behind the waiting abort commands, ahead of all others
+                wake_up = self._enqueue(CommandPriority.ABORT, me, self._count + 1)
+                self._hand_over()
+            else:
+                wake_up = self._enqueue(priority, me, 1)
+
+        start = time.perf_counter()
+        wake_up.acquire()  # Released by the thread handing over the device
+        wait_time = time.perf_counter() - start
+        with self._state_lock:
+            self._record_wait(priority, wait_time)
+
+    def release(self):
+        """Release the device."""
+        with self._state_lock:
+            if self._owner != threading.get_ident():
+                raise RuntimeError("Cannot release a device not owned by the thread.")
+            self._count -= 1
+            if self._count == 0:
+                self._hand_over()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def locked(self) -> bool:
+        """Return True if a thread owns the device."""
+        return self._owner is not None
+
+    def _is_owned(self) -> bool:
+        """Return True if the current thread owns the device."""
+        return self._owner == threading.get_ident()
+
+    def _enqueue(self, priority: CommandPriority, me: int, count: int):
+        """Queue the thread and return the lock it is woken up with."""
+        wake_up = threading.Lock()
+        wake_up.acquire()
+        heapq.heappush(self._waiting, (priority, next(self._order), wake_up, me, count))
+        return wake_up
+
+    def _hand_over(self):
+        """Hand the device over to the next waiting thread."""
+        if not self._waiting:
+            self._owner = None
+            self._count = 0
+            return
+        _, _, wake_up, thread_id, count = heapq.heappop(self._waiting)
+        self._owner = thread_id
+        self._count = count
+        wake_up.release()
+
+    def _record_wait(self, priority: CommandPriority, wait_time: float):
+        self._wait_times[priority].append(wait_time)
+        self._wait_counts[priority] += 1
+        if wait_time > self._max_wait_times[priority]:
+            self._max_wait_times[priority] = wait_time
+
+    def latency_stats(self) -> dict[str, dict[str, float]]:
+        """
+        Return the wait times for the device by command priority.
+
+        :return: The count, and the mean, 99th percentile and maximum
+                 wait times in seconds of each priority class.
+        """
+        with self._state_lock:
+            stats = {}
+            for priority in CommandPriority:
+                samples = np.array(self._wait_times[priority])
+                stats[priority.name] = {
+                    "count": self._wait_counts[priority],
+                    "mean": float(samples.mean()) if samples.size else 0.0,
+                    "p99": float(np.percentile(samples, 99)) if samples.size else 0.0,
+                    "max": self._max_wait_times[priority],
+                }
+            return stats
@@ -2,9 +2,13 @@
 DAQ instrument module.
 """
 
+import numpy as np
+
 from ..logger import get_logger
+from ..tracing import span
 from .base_instrument import BaseInstrument
 from .wrapper import DAQ
+from .wrapper.net_arrays import to_numpy
 
 
 class DAQInstrument(BaseInstrument):
@@ -14,6 +18,7 @@ class DAQInstrument(BaseInstrument):
         """Initialize the DAQ instrument."""
         super().__init__()
         self._instrument = DAQ()
+        self.timeouts = None  # Local device without I/O time out
         self.logger = get_logger(self.__class__.__name__)
         self.logger.info("Initializing DAQ Instrument...")
 
@@ -21,7 +26,7 @@ class DAQInstrument(BaseInstrument):
     @property
     def idn(self):
         """Return the IDN of the instrument."""
-        self.logger.info("Retrieving IDN of the DAQ Instrument...")
+        self.logger.debug("Retrieving IDN of the DAQ Instrument...")
         return self._instrument.DeviceName
 
     @property
@@ -44,71 +49,75 @@ class DAQInstrument(BaseInstrument):
 
     # endregion
 
+    def heartbeat(self) -> bool:
+        """Return False if the connection to the DAQ device is lost."""
+        return bool(self._instrument.IsConnected)
+
     # region Setter & Getter Methods
     def get_devices(self):
         """Get a list of connected DAQ devices."""
         device_list = list(self._get_function("Get_Device_ID", None))
-        self.logger.info(f"Connected DAQ devices: {device_list}")
+        self.logger.info("Connected DAQ devices: %s", device_list)
         return device_list
 
     # Time Coefficient
     def get_time_coefficient(self):
         """Get the time coefficient of the instrument."""
         time_coefficient = self._instrument.Time_coefficient
-        self.logger.debug(f"Time Coefficient: {time_coefficient}")
+        self.logger.debug("Time Coefficient: %s", time_coefficient)
         return time_coefficient
 
     def set_time_coefficient(self, value: float):
         """Set the time coefficient of the instrument."""
-        self.logger.info(f"Setting Time Coefficient to {value}.")
+        self.logger.debug("Setting Time Coefficient to %s.", value)
         self._instrument.Time_coefficient = value
 
     # Averaging Time
     def get_averaging_time(self):
         """Get the averaging time of the instrument."""
         averaging_time = self._instrument.AveragingTime
-        self.logger.debug(f"Averaging Time: {averaging_time}")
+        self.logger.debug("Averaging Time: %s", averaging_time)
         return averaging_time
 
     def set_averaging_time(self, value: float):
         """Set the averaging time of the instrument."""
-        self.logger.info(f"Setting Averaging Time to {value}.")
+        self.logger.debug("Setting Averaging Time to %s.", value)
         self._instrument.AveragingTime = value
 
     # F Additional Time
     def get_f_additional_time(self):
         """Get the additional time factor for the instrument."""
         f_additional_time = self._instrument.F_AdditonalTime
-        self.logger.debug(f"F Additional Time: {f_additional_time}")
+        self.logger.debug("F Additional Time: %s", f_additional_time)
         return f_additional_time
 
     def set_f_additional_time(self, value: float):
         """Set the additional time factor for the instrument."""
-        self.logger.info(f"Setting Additional Time Factor to {value}.")
+        self.logger.debug("Setting Additional Time Factor to %s.", value)
         self._instrument.F_AdditonalTime = value
 
     # Add Time Coefficient
     def get_add_time_coefficient(self):
         """Get the additional time coefficient for the instrument."""
         add_time_coefficient = self._instrument.AddTime_coefficient
-        self.logger.debug(f"Add Time Coefficient: {add_time_coefficient}")
+        self.logger.debug("Add Time Coefficient: %s", add_time_coefficient)
         return add_time_coefficient
 
     def set_add_time_coefficient(self, value: float):
         """Set the additional time coefficient for the instrument."""
-        self.logger.info(f"Setting Additional Time Coefficient to {value}.")
+        self.logger.debug("Setting Additional Time Coefficient to %s.", value)
         self._instrument.AddTime_coefficient = value
 
     # Measurement Sampling Time
     def get_meas_sampling_time(self):
         """Get the measurement sampling time of the instrument."""
         meas_sampling_time = self._instrument.Meas_Sampling_time
-        self.logger.debug(f"Measurement Sampling Time: {meas_sampling_time}")
+        self.logger.debug("Measurement Sampling Time: %s", meas_sampling_time)
         return meas_sampling_time
 
     def set_meas_sampling_time(self, value: float):
         """Set the measurement sampling time of the instrument."""
-        self.logger.info(f"Setting Measurement Sampling Time to {value}.")
+        self.logger.debug("Setting Measurement Sampling Time to %s.", value)
         self._instrument.Meas_Sampling_time = value
 
     # endregion
@@ -123,11 +132,15 @@ class DAQInstrument(BaseInstrument):
     ):
         """Set the sampling parameters for the instrument."""
         self.logger.info(
-            f"Setting Sampling Parameters: "
-            f"Start Wavelength: {start_wavelength}, "
-            f"Stop Wavelength: {stop_wavelength}, "
-            f"Speed: {speed}, "
-            f"TSL Actual Step: {tsl_actual_step}."
+            "Setting Sampling Parameters: "
+            "Start Wavelength: %s, "
+            "Stop Wavelength: %s, "
+            "Speed: %s, "
+            "TSL Actual Step: %s.",
+            start_wavelength,
+            stop_wavelength,
+            speed,
+            tsl_actual_step,
         )
         self._set_function(
             "Set_Sampling_Parameter",
@@ -154,7 +167,7 @@ class DAQInstrument(BaseInstrument):
 
     def get_sampling_data(self):
         """Get the sampling data from the instrument."""
-        self.logger.info("Retrieving sampling data.")
+        self.logger.debug("Retrieving sampling data.")
 
         trigger, monitor = self._get_multiple_responses("Get_Sampling_Data", None, None)
 
@@ -167,15 +180,16 @@ class DAQInstrument(BaseInstrument):
             raise ValueError("Trigger and monitor data lengths do not match.")
 
         self.logger.info(
-            f"Retrieved {len(trigger)} trigger "
-            f"and {len(monitor)} monitor data points."
+            "Retrieved %s trigger and %s monitor data points.",
+            len(trigger),
+            len(monitor),
         )
 
         return trigger, monitor
 
     def get_sampling_raw_data(self):
         """Get the raw sampling data from the instrument."""
-        self.logger.info("Retrieving raw sampling data...")
+        self.logger.debug("Retrieving raw sampling data...")
 
         trigger, monitor = self._get_multiple_responses(
             "Get_Sampling_Rawdata", None, None
@@ -190,10 +204,34 @@ class DAQInstrument(BaseInstrument):
             raise ValueError("Trigger and monitor raw data lengths do not match.")
 
         self.logger.info(
-            f"Retrieved {len(trigger)} trigger "
-            f"and {len(monitor)} monitor raw data points."
+            "Retrieved %s trigger and %s monitor raw data points.",
+            len(trigger),
+            len(monitor),
         )
 
         return trigger, monitor
 
+    def get_sampling_data_array(
+        self, raw: bool = False
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the trigger and monitor sampling data as NumPy arrays.
+
+        :param raw: True to get the raw sampling data.
+        """
+        function_name = "Get_Sampling_Rawdata" if raw else "Get_Sampling_Data"
+        self.logger.debug("Retrieving sampling data arrays (raw: %s).", raw)
+        trigger, monitor = self._get_multiple_responses(function_name, None, None)
+        if trigger is None or monitor is None:
+            self.logger.error("Failed to retrieve sampling data.")
+            raise ValueError("No data received from the instrument.")
+
+        with span("DAQ convert", "convert"):
+            trigger, monitor = to_numpy(trigger), to_numpy(monitor)
+        if trigger.shape != monitor.shape:
+            self.logger.error("Mismatch in lengths of trigger and monitor data.")
+            raise ValueError("Trigger and monitor data lengths do not match.")
+        self.logger.debug("Retrieved %s sampling data points.", len(trigger))
+        return trigger, monitor
+
     # endregion
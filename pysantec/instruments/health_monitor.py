@@ -0,0 +1,116 @@
+"""
+Instrument connection health monitor.
+
+Checks the connected instruments of an InstrumentManager in a
+background thread. Idle instruments get a cheap heartbeat query;
+instruments whose last command failed with a lost connection, or whose
+heartbeat fails, are reconnected and their settings reapplied.
+"""
+
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from ..logger import get_logger
+from .base_instrument import CONNECTION_ERROR_CODES, BaseInstrument
+
+
+class HealthMonitor:
+    """Background heartbeat and reconnect of the connected instruments."""
+
+    def __init__(self, manager, interval: float = 5.0, idle_time: float | None = None):
+        """
+        :param manager: The InstrumentManager of the instruments.
+        :param interval: Seconds between the health checks.
+        :param idle_time: Seconds without commands before an instrument gets
+                          a heartbeat. Defaults to the interval, so jobs
+                          sending commands, like sweeps, are not disturbed.
+        """
+        if interval <= 0:
+            raise ValueError("Interval must be a positive value.")
+        self.manager = manager
+        self.interval = interval
+        self.idle_time = interval if idle_time is None else idle_time
+        self.reconnections = Counter()
+        self.logger = get_logger(self.__class__.__name__)
+        self._pause_count = 0
+        self._pause_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the health checks in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="pysantec-health-monitor", daemon=True
+        )
+        self._thread.start()
+        self.logger.info("Health monitor started, interval %s s.", self.interval)
+
+    def stop(self):
+        """Stop the health checks."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.logger.info("Health monitor stopped.")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @contextmanager
+    def paused(self):
+        """Suspend the health checks, e.g. during a sweep with idle phases."""
+        with self._pause_lock:
+            self._pause_count += 1
+        try:
+            yield self
+        finally:
+            with self._pause_lock:
+                self._pause_count -= 1
+
+    def check(self) -> list[str]:
+        """
+        Check all connected instruments once.
+
+        :return: The resource names of the reconnected instruments.
+        """
+        reconnected = []
+        for resource_name, instrument in self.manager.connected_instruments.items():
+            if self._pause_count or self._stop.is_set():
+                break
+            if self._is_healthy(instrument):
+                continue
+            self.logger.warning("Connection to %s lost.", resource_name)
+            try:
+                self.manager.reconnect(resource_name)
+            except Exception as e:
+                # Tried again with the next check
+                self.logger.error("Failed to reconnect %s: %s", resource_name, e)
+                continue
+            self.reconnections[resource_name] += 1
+            reconnected.append(resource_name)
+        return reconnected
+
+    def _is_healthy(self, instrument: BaseInstrument) -> bool:
+        """Return False if an instrument lost its connection."""
+        if instrument._last_status in CONNECTION_ERROR_CODES:
+            return False
+        idle_ns = time.perf_counter_ns() - instrument._last_call_ns
+        if instrument.lock.locked() or idle_ns < self.idle_time * 1e9:
+            return True  # Busy, not interrupted by a heartbeat
+        return instrument.heartbeat()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                self.logger.error("Health check failed: %s", e)
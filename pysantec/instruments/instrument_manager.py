@@ -2,8 +2,9 @@
 Instrument Manager module.
 """
 
+import threading
 from typing import Dict
-from ..logger import get_logger
+from ..logger import get_logger, log_run_info
 from .base_instrument import BaseInstrument
 from .daq_instrument import DAQInstrument
 from .mpm_instrument import MPMInstrument
@@ -20,8 +21,12 @@ class InstrumentManager:
         self._resources = []
         self.logger = get_logger(self.__class__.__name__)
         self._instrument_wrapper = InstrumentWrapper(self.logger)
-        self._instrument: BaseInstrument | None = None
         self._connected_instruments: Dict[str, BaseInstrument] = {}
+        # Instrument, connection type and terminator of each connected resource
+        self._connection_parameters: Dict[
+            str, tuple[BaseInstrument, ConnectionType, Terminator]
+        ] = {}
+        self._lock = threading.RLock()
         self._resources_listed: bool = False
         self.logger.info("Initializing Instrument Manager...")
 
@@ -53,7 +58,7 @@ class InstrumentManager:
                 self._resources.extend(gpib_resources)
 
         except Exception as e:
-            self.logger.error(f"Error listing VISA GPIB resources: {e}")
+            self.logger.error("Error listing VISA GPIB resources: %s", e)
 
     def _list_usb_resources(self):
         """Lists FTDI USB resources."""
@@ -63,7 +68,7 @@ class InstrumentManager:
             if usb_resources:
                 self._resources.extend(usb_resources)
         except Exception as e:
-            self.logger.error(f"Error listing FTDI USB resources: {e}")
+            self.logger.error("Error listing FTDI USB resources: %s", e)
 
     def _list_daq_resources(self):
         """Lists NI DAQ devices."""
@@ -73,7 +78,7 @@ class InstrumentManager:
             if daq_devices:
                 self._resources.extend(daq_devices)
         except Exception as e:
-            self.logger.error(f"Error listing NI DAQ resources: {e}")
+            self.logger.error("Error listing NI DAQ resources: %s", e)
 
     def _list_serial_port_resources(self):
         """Lists Serial Port devices."""
@@ -83,10 +88,23 @@ class InstrumentManager:
             if serial_port_devices:
                 self._resources.extend(serial_port_devices)
         except Exception as e:
-            self.logger.error(f"Error listing Serial Port resources: {e}")
+            self.logger.error("Error listing Serial Port resources: %s", e)
 
-    def _connect(self, resource_name, terminator: Terminator = Terminator.CRLF):
-        """Connects to the specified resource."""
+    def _connect(
+        self,
+        instrument: BaseInstrument,
+        resource_name,
+        terminator: Terminator = Terminator.CRLF,
+    ):
+        """Connects an instrument to the specified resource."""
+        with self._lock:
+            return self._connect_resource(instrument, resource_name, terminator)
+
+    def _connect_resource(
+        self, instrument: BaseInstrument, resource_name, terminator: Terminator
+    ):
+        """Connects an instrument to the specified resource."""
+        log_run_info()
         connection_type = None
         if resource_name in self._connected_instruments.keys():
             raise Exception(f"Resource {resource_name} already connected.")
@@ -99,76 +117,83 @@ class InstrumentManager:
             raise Exception(f"No resources available: {len(self._resources)}")
 
         if resource_name not in self._resources:
-            self.logger.error(f"Try to connect invalid resource: {resource_name}")
+            self.logger.error("Try to connect invalid resource: %s", resource_name)
             raise Exception(f"Invalid resource: {resource_name}")
 
         if not connection_type:
             connection_type = self._get_connection_type(resource_name)
 
-        self._establish_connection(resource_name, connection_type, terminator)
-        if not self._instrument:
-            raise Exception(f"Failed to connect: {resource_name}")
+        self._establish_connection(
+            instrument, resource_name, connection_type, terminator
+        )
 
-        self._connected_instruments[resource_name] = self._instrument
+        self._connected_instruments[resource_name] = instrument
+        self._connection_parameters[resource_name] = (
+            instrument,
+            connection_type,
+            terminator,
+        )
 
-        return self._instrument
+        return instrument
 
     def _establish_connection(
         self,
+        instrument: BaseInstrument,
         resource_name: str,
         connection_type: ConnectionType,
         terminator: Terminator,
     ):
         """Establishes a connection to the specified resource."""
         self.logger.info(
-            f"Establishing connection to {resource_name} "
-            f"of type {connection_type.name}..."
+            "Establishing connection to %s of type %s...",
+            resource_name,
+            connection_type.name,
         )
         match connection_type:
             case ConnectionType.GPIB:
-                self._gpib_connection(resource_name, terminator)
+                self._gpib_connection(instrument, resource_name, terminator)
             case ConnectionType.USB:
-                self._usb_connection(resource_name)
+                self._usb_connection(instrument, resource_name)
             case ConnectionType.TCPIP:
-                self._tcpip_connection(resource_name, terminator)
+                self._tcpip_connection(instrument, resource_name, terminator)
             case ConnectionType.DEV:
-                self._dev_connection(resource_name)
+                self._dev_connection(instrument, resource_name)
             case ConnectionType.NULL:
                 raise Exception(f"Invalid connection type: {connection_type}")
 
-    def _gpib_connection(self, resource_name, terminator):
+    def _gpib_connection(self, instrument, resource_name, terminator):
         """Establishes a GPIB connection."""
-        self.logger.info(f"Connecting to GPIB resource: {resource_name}")
+        self.logger.info("Connecting to GPIB resource: %s", resource_name)
         gpib_board, gpib_address, _ = resource_name.split("::")  # GPIB0::10::INSTR
         gpib_board = gpib_board[-1]
         self._instrument_wrapper.connect_gpib(
-            self._instrument,
+            instrument,
             int(gpib_board),
             int(gpib_address),
             GPIBType.NI4882,
             terminator,
         )
 
-    def _usb_connection(self, resource_name):
+    def _usb_connection(self, instrument, resource_name):
         """Establishes a USB connection."""
-        self.logger.info(f"Connecting to USB resource: {resource_name}")
+        self.logger.info("Connecting to USB resource: %s", resource_name)
         # usb_device_id = 1  # TODO: Refactor the usb device ID assignment
         raise NotImplementedError("USB connection is yet to be implemented.")
 
-    def _tcpip_connection(self, resource_name, terminator):
+    def _tcpip_connection(self, instrument, resource_name, terminator):
         """Establishes a TCPIP connection."""
-        self.logger.info(f"Connecting to TCPIP resource: {resource_name}")
+        self.logger.info("Connecting to TCPIP resource: %s", resource_name)
         _, ip_address, port_number, _ = resource_name.split(
             "::"
         )  # TCPIP0::192.168.10.101::5000::SOCKET
         self._instrument_wrapper.connect_tcpip(
-            self._instrument, str(ip_address), int(port_number), terminator
+            instrument, str(ip_address), int(port_number), terminator
         )
 
-    def _dev_connection(self, resource_name):
+    def _dev_connection(self, instrument, resource_name):
         """Establishes a connection to a NI DAQ device."""
-        self.logger.info(f"Connecting to NI DAQ resource: {resource_name}")
-        self._instrument_wrapper.connect_daq(self._instrument, resource_name)  # Dev1
+        self.logger.info("Connecting to NI DAQ resource: %s", resource_name)
+        self._instrument_wrapper.connect_daq(instrument, resource_name)  # Dev1
 
     @staticmethod
     def _get_connection_type(resource_name):
@@ -193,37 +218,90 @@ class InstrumentManager:
         self._list_resources()
         resources = self._resources
         if len(resources) < 1:
-            self.logger.debug(f"No resources available: {len(resources)}")
+            self.logger.debug("No resources available: %s", len(resources))
             return []
 
-        self.logger.info(f"Found {len(resources)} resources")
+        self.logger.info("Found %s resources", len(resources))
         return resources
 
+    @property
+    def connected_instruments(self) -> Dict[str, BaseInstrument]:
+        """Returns the connected instruments by resource name."""
+        with self._lock:
+            return dict(self._connected_instruments)
+
+    def disconnect(self, resource_name: str):
+        """
+        Disconnects an instrument.
+
+        The resource can be connected again, or reconnected with the
+        same instrument object and settings with ``reconnect``.
+        """
+        with self._lock:
+            instrument = self._connected_instruments.pop(resource_name, None)
+        if instrument is None:
+            raise ValueError(f"Resource {resource_name} is not connected.")
+        instrument.disconnect()
+
+    def disconnect_all(self):
+        """Disconnects all instruments."""
+        for resource_name in self.connected_instruments:
+            try:
+                self.disconnect(resource_name)
+            except Exception as e:
+                self.logger.error("Error disconnecting %s: %s", resource_name, e)
+
+    def reconnect(self, resource_name: str) -> BaseInstrument:
+        """
+        Reconnects an instrument with its stored connection parameters.
+
+        Commands of other threads wait while reconnecting. The last set
+        value of each instrument setting is applied again afterwards.
+
+        :return: The reconnected instrument object.
+        """
+        with self._lock:
+            if resource_name not in self._connection_parameters:
+                raise ValueError(f"Resource {resource_name} was never connected.")
+            instrument, connection_type, terminator = self._connection_parameters[
+                resource_name
+            ]
+            self.logger.info("Reconnecting to %s...", resource_name)
+            with instrument.lock:
+                try:
+                    instrument._call("DisConnect")
+                except Exception as e:
+                    self.logger.debug("Error closing %s: %s", resource_name, e)
+                self._establish_connection(
+                    instrument, resource_name, connection_type, terminator
+                )
+                instrument.reapply_configuration()
+            self._connected_instruments[resource_name] = instrument
+            self.logger.info("Reconnected to %s.", resource_name)
+            return instrument
+
     def connect_tsl(self, resource_name: str) -> TSLInstrument | BaseInstrument:
         """Connects to a TSL instrument."""
         self._list_resources()
         if not resource_name:
             raise ValueError("Resource name cannot be empty.")
-        self.logger.info(f"Connecting to TSL resource: {resource_name}")
+        self.logger.info("Connecting to TSL resource: %s", resource_name)
         terminator = Terminator.CR
-        self._instrument = TSLInstrument()
-        return self._connect(resource_name, terminator)
+        return self._connect(TSLInstrument(), resource_name, terminator)
 
     def connect_mpm(self, resource_name: str) -> MPMInstrument | BaseInstrument:
         """Connects to an MPM instrument."""
         self._list_resources()
         if not resource_name:
             raise ValueError("Resource name cannot be empty.")
-        self.logger.info(f"Connecting to MPM resource: {resource_name}")
+        self.logger.info("Connecting to MPM resource: %s", resource_name)
         terminator = Terminator.LF
-        self._instrument = MPMInstrument()
-        return self._connect(resource_name, terminator)
+        return self._connect(MPMInstrument(), resource_name, terminator)
 
     def connect_daq(self, device_name: str) -> DAQInstrument | BaseInstrument:
         """Connects to a NI DAQ device."""
         self._list_resources()
         if not device_name:
             raise ValueError("Device name cannot be empty.")
-        self.logger.info(f"Connecting to NI DAQ device: {device_name}")
-        self._instrument = DAQInstrument()
-        return self._connect(device_name)
+        self.logger.info("Connecting to NI DAQ device: %s", device_name)
+        return self._connect(DAQInstrument(), device_name)
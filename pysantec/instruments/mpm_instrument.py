@@ -2,9 +2,13 @@
 MPM instrument module.
 """
 
+import numpy as np
+
 from ..logger import get_logger
+from ..tracing import span
 from .base_instrument import BaseInstrument
 from .wrapper import MPM
+from .wrapper.net_arrays import to_numpy
 from .wrapper.enumerations.mpm_enums import (
     LoggingStatus,
     MeasurementMode,
@@ -13,6 +17,9 @@ from .wrapper.enumerations.mpm_enums import (
     TriggerInputMode,
 )
 
+# Maximum number of logging data points supported by the MPM
+MAX_LOGGING_DATA_POINTS = 1000001
+
 
 class MPMInstrument(BaseInstrument):
     """MPM Instrument class for controlling and monitoring the MPM device."""
@@ -28,19 +35,19 @@ class MPMInstrument(BaseInstrument):
     def get_range_mode(self) -> RangeMode:
         """Get the current range mode of the MPM instrument."""
         range_mode = self._get_function_enum("Get_READ_Range_Mode", RangeMode.AUTO)
-        self.logger.debug(f"Current range mode: {range_mode}")
+        self.logger.debug("Current range mode: %s", range_mode)
         return range_mode
 
     def get_power_unit(self) -> PowerUnit:
         """Get the current power unit setting of the MPM instrument."""
         power_unit = self._get_function_enum("Get_Unit", PowerUnit.dBm)
-        self.logger.debug(f"Current power unit: {power_unit}")
+        self.logger.debug("Current power unit: %s", power_unit)
         return power_unit
 
     def get_measurement_mode(self) -> MeasurementMode:
         """Get the current measurement mode of the MPM instrument."""
         measurement_mode = self._get_function_enum("Get_Mode", MeasurementMode.FREERUN)
-        self.logger.debug(f"Current measurement mode: {measurement_mode}")
+        self.logger.debug("Current measurement mode: %s", measurement_mode)
         return measurement_mode
 
     def get_trigger_input_mode(self) -> TriggerInputMode:
@@ -48,25 +55,25 @@ class MPMInstrument(BaseInstrument):
         trigger_input_mode = self._get_function_enum(
             "Get_Trigger_Input_Mode", TriggerInputMode.INTERNAL
         )
-        self.logger.debug(f"Current trigger input mode: {trigger_input_mode}")
+        self.logger.debug("Current trigger input mode: %s", trigger_input_mode)
         return trigger_input_mode
 
     def get_range_value(self) -> int:
         """Get the current dynamic range value of the MPM instrument."""
         range_value = self._get_function("Get_Range", int)
-        self.logger.debug(f"Current range value: {range_value}")
+        self.logger.debug("Current range value: %s", range_value)
         return range_value
 
     def get_averaging_time(self) -> float:
         """Get the current averaging time setting of the MPM instrument."""
         averaging_time = self._get_function("Get_Averaging_Time", float)
-        self.logger.debug(f"Current averaging time: {averaging_time} seconds")
+        self.logger.debug("Current averaging time: %s seconds", averaging_time)
         return averaging_time
 
     def get_wavelength(self) -> float:
         """Get the current wavelength setting of the MPM instrument."""
         wavelength_value = self._get_function("Get_Wavelength", float)
-        self.logger.debug(f"Current wavelength: {wavelength_value} nm")
+        self.logger.debug("Current wavelength: %s nm", wavelength_value)
         return wavelength_value
 
     def get_module_measurement_mode(self, module_number: int):
@@ -78,7 +85,7 @@ class MPMInstrument(BaseInstrument):
             MeasurementMode.FREERUN.value,
         )
         self.logger.debug(
-            f"Module {module_number} measurement mode: {module_measurement_mode}"
+            "Module %s measurement mode: %s", module_number, module_measurement_mode
         )
         return module_measurement_mode
 
@@ -91,42 +98,37 @@ class MPMInstrument(BaseInstrument):
             response_type=int,
         )
         self.logger.debug(
-            f"Module {module_number}, Channel {channel_number} range value: {channel_range_value}"
+            "Module %s, Channel %s range value: %s",
+            module_number,
+            channel_number,
+            channel_range_value,
         )
         return channel_range_value
 
     def get_scan_speed(self):
         """Get the current scan speed setting of the MPM instrument."""
         scan_speed = self._get_function("Get_Sweep_Speed", float)
-        self.logger.debug(f"Current sweep speed: {scan_speed} nm/s")
+        self.logger.debug("Current sweep speed: %s nm/s", scan_speed)
         return scan_speed
 
     def get_logging_data_point(self):
         """Get the number of logging data points
         configured in the MPM instrument."""
         logging_data_points = self._get_function("Get_Logging_Data_Point", int)
-        self.logger.info(f"Current logging data points: {logging_data_points}")
+        self.logger.debug("Current logging data points: %s", logging_data_points)
         return logging_data_points
 
     def get_logging_status(self):
         """Get the current logging status of the MPM instrument."""
         status, count = self._get_multiple_responses("Get_Logging_Status", int, int)
         logging_status = LoggingStatus(status)
-        if logging_status == LoggingStatus.COMPLETED:
-            self.logger.info("Logging is completed.")
-        elif logging_status == LoggingStatus.STOPPED:
-            self.logger.info("Logging is stopped.")
-        elif logging_status == LoggingStatus.LOGGING:
-            self.logger.info(f"Logging is running with {count} data points.")
-        self.logger.debug(f"Logging status: {logging_status}, Count: {count}")
-        self.logger.debug(f"Logging status: {logging_status}. Data count: {count}")
+        # Polled in tight loops, so only logged at DEBUG level
+        self.logger.debug("Logging status: %s. Data count: %s", logging_status, count)
         return logging_status, count
 
     def get_module_logging_data(self, module_number: int):
         """Get the logging data for a specific module."""
-        self.logger.info(
-            f"Fetching module logging data for " f"module: {module_number}."
-        )
+        self.logger.debug("Fetching module logging data for module: %s.", module_number)
 
         try:
             data = self._set_and_get_function(
@@ -135,7 +137,7 @@ class MPMInstrument(BaseInstrument):
             if data is None or len(data) == 0:
                 self.logger.info("Data is empty. Could not fetch any logging data.")
                 return []
-            self.logger.info(f"Logging data length: {len(data)}")
+            self.logger.debug("Logging data length: %s", len(data))
 
         except Exception as e:
             error_string = f"Error while fetching module logging data: {e}"
@@ -148,20 +150,22 @@ class MPMInstrument(BaseInstrument):
 
         # Convert to a list of lists
         result = []
-        for i in range(rows):
-            row = []
-            for j in range(cols):
-                row.append(data[i, j])
-            result.append(row)
-
-        self.logger.info(f"Module logging data result: {len(result)}")
+        with span("MPM convert", "convert", rows=rows, columns=cols):
+            for i in range(rows):
+                row = []
+                for j in range(cols):
+                    row.append(data[i, j])
+                result.append(row)
+
+        self.logger.debug("Module logging data result: %s", len(result))
         return list(result)
 
     def get_channel_logging_data(self, module_number: int, channel_number: int):
         """Get the logging data for a specific channel in a module."""
-        self.logger.info(
-            f"Fetching channel logging data for "
-            f"module: {module_number} and chanel: {channel_number}."
+        self.logger.debug(
+            "Fetching channel logging data for module: %s and chanel: %s.",
+            module_number,
+            channel_number,
         )
 
         try:
@@ -174,7 +178,7 @@ class MPMInstrument(BaseInstrument):
             if data is None or len(data) == 0:
                 self.logger.info("Data is empty. Could not fetch any logging data.")
                 return []
-            self.logger.info(f"Logging data length: {len(data)}")
+            self.logger.debug("Logging data length: %s", len(data))
 
         except Exception as e:
             error_string = f"Error while fetching channel logging data: {e}"
@@ -183,32 +187,88 @@ class MPMInstrument(BaseInstrument):
 
         return list(data)
 
+    def get_module_logging_data_array(
+        self, module_number: int, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        Get the logging data for a specific module as a NumPy array.
+
+        The array keeps the (rows, columns) layout returned by the DLL.
+        If ``out`` is given, the data is copied directly into it.
+        """
+        self.logger.debug(
+            "Fetching module logging array for module: %s.", module_number
+        )
+        data = self._set_and_get_function(
+            "Get_Each_Module_Loggdata", module_number, response_type=None
+        )
+        if data is None:
+            if out is not None:
+                self.logger.error("Could not fetch any logging data.")
+                raise ValueError("No logging data received from the instrument.")
+            self.logger.info("Data is empty. Could not fetch any logging data.")
+            return np.empty((0, 0))
+        with span("MPM convert", "convert", module=module_number):
+            return to_numpy(data, out)
+
+    def get_channel_logging_data_array(
+        self,
+        module_number: int,
+        channel_number: int,
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        Get the logging data for a specific channel as a NumPy array.
+
+        If ``out`` is given, the data is copied directly into it,
+        e.g. into one column of a preallocated (points x channels) buffer.
+        """
+        self.logger.debug(
+            "Fetching channel logging array for module: %s and channel: %s.",
+            module_number,
+            channel_number,
+        )
+        data = self._set_and_get_function(
+            "Get_Each_Channel_Logdata",
+            module_number,
+            channel_number,
+            response_type=None,
+        )
+        if data is None:
+            if out is not None:
+                self.logger.error("Could not fetch any logging data.")
+                raise ValueError("No logging data received from the instrument.")
+            self.logger.info("Data is empty. Could not fetch any logging data.")
+            return np.empty(0)
+        with span("MPM convert", "convert", module=module_number):
+            return to_numpy(data, out)
+
     # endregion
 
     # region Set Methods
     def set_range_mode(self, range_mode: RangeMode):
         """Set the dynamic range mode of the MPM instrument."""
-        self.logger.info(f"Setting range mode to: {range_mode.name}")
+        self.logger.debug("Setting range mode to: %s", range_mode.name)
         self._set_function_enum("Set_READ_Range_Mode", range_mode)
 
     def set_power_unit(self, power_unit: PowerUnit):
         """Set the power unit for the MPM instrument."""
-        self.logger.info(f"Setting power unit to: {power_unit.name}")
+        self.logger.debug("Setting power unit to: %s", power_unit.name)
         self._set_function_enum("Set_Unit", power_unit)
 
     def set_measurement_mode(self, measurement_mode: MeasurementMode):
         """Set the measurement mode of the MPM instrument."""
-        self.logger.info(f"Setting measurement mode to: {measurement_mode.name}")
+        self.logger.debug("Setting measurement mode to: %s", measurement_mode.name)
         self._set_function_enum("Set_Mode", measurement_mode)
 
     def set_trigger_input_mode(self, mode: TriggerInputMode):
         """Set the trigger input mode of the MPM instrument."""
-        self.logger.info(f"Setting trigger input mode to: {mode.name}")
+        self.logger.debug("Setting trigger input mode to: %s", mode.name)
         self._set_function_enum("Set_Trigger_Input_Mode", mode)
 
     def set_range_value(self, value: int):
         """Set the dynamic range value of the MPM instrument."""
-        self.logger.info(f"Setting range value to: {value}")
+        self.logger.debug("Setting range value to: %s", value)
         if value < 0:
             self.logger.error("Range value must be a non-negative integer.")
             raise ValueError("Range value must be a non-negative integer.")
@@ -219,7 +279,7 @@ class MPMInstrument(BaseInstrument):
 
     def set_averaging_time(self, value: float):
         """Set the averaging time for the MPM instrument."""
-        self.logger.info(f"Setting averaging time to: {value} seconds")
+        self.logger.debug("Setting averaging time to: %s seconds", value)
         if value < 0.0:
             self.logger.error("Averaging time must be a non-negative float.")
             raise ValueError("Averaging time must be a non-negative float.")
@@ -234,13 +294,13 @@ class MPMInstrument(BaseInstrument):
 
     def set_wavelength(self, value: float):
         """Set the wavelength for the MPM instrument."""
-        self.logger.info(f"Setting wavelength to: {value} nm")
+        self.logger.debug("Setting wavelength to: %s nm", value)
         self._set_function("Set_Wavelength", value)
 
     def set_module_measurement_mode(self, module_number: int, mode: MeasurementMode):
         """Set the measurement mode for a specific module."""
-        self.logger.info(
-            f"Setting measurement mode for module {module_number} " f"to: {mode.name}"
+        self.logger.debug(
+            "Setting measurement mode for module %s to: %s", module_number, mode.name
         )
         self._set_function("Set_Mode_Each_Module", module_number, mode.value)
 
@@ -248,8 +308,11 @@ class MPMInstrument(BaseInstrument):
         self, module_number: int, channel_number: int, range_value: int
     ):
         """Set the range value for a specific channel in a module."""
-        self.logger.info(
-            f"Setting range for module {module_number}, " f"channel {channel_number}"
+        self.logger.debug(
+            "Setting range for module %s, channel %s to: %s",
+            module_number,
+            channel_number,
+            range_value,
         )
         self._set_function(
             "Set_Range_Each_Channel",
@@ -260,7 +323,7 @@ class MPMInstrument(BaseInstrument):
 
     def set_scan_speed(self, speed: float):
         """Set the scan speed for the MPM instrument."""
-        self.logger.info(f"Setting sweep speed to: {speed} nm/s")
+        self.logger.debug("Setting sweep speed to: %s nm/s", speed)
         self._set_function("Set_Sweep_Speed", speed)
 
     def set_logging_data_point(self, data_points: int):
@@ -268,17 +331,17 @@ class MPMInstrument(BaseInstrument):
         Set the number of logging data points for the MPM instrument.
         Do not set this when using SWEEP2/CONST2 measurement modes.
         """
-        self.logger.info(f"Setting logging data points to: {data_points}")
+        self.logger.debug("Setting logging data points to: %s", data_points)
         if data_points < 1:
             self.logger.error("Logging data points must be a positive integer.")
             raise ValueError("Logging data points must be a positive integer.")
-        elif data_points > 1000001:
-            self.logger.error(
-                "Logging data points must be less than or equal to 1000001."
-            )
-            raise ValueError(
-                "Logging data points must be less than or equal to 1000001."
+        elif data_points > MAX_LOGGING_DATA_POINTS:
+            error_string = (
+                f"Logging data points must be less than "
+                f"or equal to {MAX_LOGGING_DATA_POINTS}."
             )
+            self.logger.error(error_string)
+            raise ValueError(error_string)
         self._set_function("Set_Logging_Data_Point", data_points)
 
     # endregion
@@ -295,13 +358,19 @@ class MPMInstrument(BaseInstrument):
     ):
         """Set the scan parameters for the MPM instrument."""
         self.logger.info(
-            f"Setting scan parameters: "
-            f"Start Wavelength: {start_wavelength} nm, "
-            f"Stop Wavelength: {stop_wavelength} nm, "
-            f"Step Wavelength: {step_wavelength} nm, "
-            f"Scan Speed: {scan_speed} nm/s, "
-            f"TSL Actual Step: {tsl_actual_step} nm, "
-            f"Mode: {mode.name}"
+            "Setting scan parameters: "
+            "Start Wavelength: %s nm, "
+            "Stop Wavelength: %s nm, "
+            "Step Wavelength: %s nm, "
+            "Scan Speed: %s nm/s, "
+            "TSL Actual Step: %s nm, "
+            "Mode: %s",
+            start_wavelength,
+            stop_wavelength,
+            step_wavelength,
+            scan_speed,
+            tsl_actual_step,
+            mode.name,
         )
         self._set_function(
             "Set_Logging_Paremeter_for_STS",
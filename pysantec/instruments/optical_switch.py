@@ -0,0 +1,157 @@
+"""
+Optical switch module.
+
+Drivers of 1xN optical switches routing the TSL output, or the DUT
+outputs, to the ports of a station. Switching is split into ``select``,
+which only sends the command, and ``wait_settled``, so a caller can do
+other work, e.g. read out the previous port, while the switch settles.
+"""
+
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from ..logger import get_logger
+
+
+class OpticalSwitch(ABC):
+    """Base class of the 1xN optical switch drivers."""
+
+    def __init__(self, port_count: int, settling_time: float):
+        """
+        :param port_count: Number of output ports, numbered from 1.
+        :param settling_time: Seconds the optical path needs to settle
+                              after switching.
+        """
+        if port_count < 1:
+            raise ValueError("Port count must be at least 1.")
+        if settling_time < 0:
+            raise ValueError("Settling time must be a non-negative value.")
+        self.port_count = port_count
+        self.settling_time = settling_time
+        self._port = None
+        self._settled_at = 0.0
+        self.logger = get_logger(self.__class__.__name__)
+
+    @property
+    def port(self) -> int | None:
+        """The last selected port, None before the first selection."""
+        return self._port
+
+    def select(self, port: int):
+        """Start switching to a port without waiting for it to settle."""
+        if not 1 <= port <= self.port_count:
+            raise ValueError(f"Port must be between 1 and {self.port_count}.")
+        if port == self._port:
+            return
+        self.logger.debug("Switching to port %s.", port)
+        self._select(port)
+        self._port = port
+        self._settled_at = time.monotonic() + self.settling_time
+
+    def wait_settled(self) -> float:
+        """
+        Wait until the selected port has settled.
+
+        :return: The seconds waited, 0 if the switch settled meanwhile.
+        """
+        remaining = self._settled_at - time.monotonic()
+        if remaining <= 0:
+            return 0.0
+        time.sleep(remaining)
+        return remaining
+
+    def switch_to(self, port: int):
+        """Switch to a port and wait for it to settle."""
+        self.select(port)
+        self.wait_settled()
+
+    def close(self):
+        """Close the connection to the switch."""
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @abstractmethod
+    def _select(self, port: int):
+        """Send the command switching to a port."""
+
+
+class ScpiOpticalSwitch(OpticalSwitch):
+    """Optical switch controlled with SCPI commands over a TCP socket."""
+
+    def __init__(
+        self,
+        host: str,
+        port_count: int,
+        tcp_port: int = 5025,
+        module: int = 1,
+        settling_time: float = 0.025,
+        timeout: float = 5.0,
+    ):
+        """
+        :param host: The switch host name or address.
+        :param port_count: Number of output ports.
+        :param tcp_port: The SCPI socket port.
+        :param module: The switch module, for switches with several 1xN modules.
+        :param settling_time: Minimum seconds to wait after switching.
+        :param timeout: Seconds to wait for a response.
+        """
+        super().__init__(port_count, settling_time)
+        self.module = module
+        self._socket = socket.create_connection((host, tcp_port), timeout)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._socket.makefile("rb")
+        self._lock = threading.Lock()
+        self.logger.info("Connected to optical switch %s:%s.", host, tcp_port)
+
+    @property
+    def idn(self) -> str:
+        return self.query("*IDN?")
+
+    def write(self, command: str):
+        """Send a command."""
+        with self._lock:
+            self._socket.sendall(command.encode("ascii") + b"\n")
+
+    def query(self, command: str) -> str:
+        """Send a query and return its response."""
+        with self._lock:
+            self._socket.sendall(command.encode("ascii") + b"\n")
+            response = self._file.readline()
+        if not response:
+            raise ConnectionError("Optical switch connection closed.")
+        return response.decode("ascii").strip()
+
+    def get_port(self) -> int:
+        """Return the port reported by the switch."""
+        return int(self.query(f"ROUT{self.module}:CLOS?"))
+
+    def wait_settled(self) -> float:
+        """Wait for the switch to complete the move and the settling time."""
+        start = time.monotonic()
+        self.query("*OPC?")
+        return (time.monotonic() - start) + super().wait_settled()
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def _select(self, port: int):
+        self.write(f"ROUT{self.module}:CLOS {port}")
+
+
+class SimulatedOpticalSwitch(OpticalSwitch):
+    """Optical switch simulation, e.g. for tests and station dry runs."""
+
+    def __init__(self, port_count: int, settling_time: float = 0.025):
+        super().__init__(port_count, settling_time)
+        self.selections = []
+
+    def _select(self, port: int):
+        self.selections.append(port)
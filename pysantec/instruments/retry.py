@@ -0,0 +1,126 @@
+"""
+Instrument command retry policy.
+
+Retries idempotent DLL calls failing with a transient communication
+error (time out, communication failure, I/O error) with jittered
+exponential backoff. Commands with side effects, such as starting a
+sweep or the logging, are never retried.
+"""
+
+import random
+import threading
+from collections import Counter
+
+from .wrapper import InstrumentExceptionCode
+
+# Status codes of transient communication errors
+TRANSIENT_ERROR_CODES = frozenset(
+    {
+        InstrumentExceptionCode.TimeOut,
+        InstrumentExceptionCode.CommunicationFailure,
+        InstrumentExceptionCode.IOException,
+    }
+)
+
+# Exception type names of transient .NET and Python communication errors
+TRANSIENT_EXCEPTION_NAMES = frozenset(
+    {"IOException", "TimeoutException", "TimeoutError", "ConnectionError"}
+)
+
+# DLL functions which must not be repeated: they start an operation,
+# consume a response, or wait with an expected time out
+NON_IDEMPOTENT_FUNCTIONS = frozenset(
+    {
+        "Connect",
+        "DisConnect",
+        "Write",
+        "Read",
+        "Sweep_Start",
+        "Sweep_Restart",
+        "Set_Software_Trigger",
+        "Logging_Start",
+        "Sampling_Start",
+        "Zeroing",
+        "TSL_Busy_Check",
+        "Waiting_For_Sweep_Status",
+        "Waiting_for_sampling",
+        "Get_Logging_Data",
+        "Get_Logging_Data_Power_for_STS",
+    }
+)
+
+
+class RetryPolicy:
+    """Which DLL calls are retried, how often and with which backoff."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.05,
+        max_delay: float = 1.0,
+        non_idempotent_functions: frozenset[str] = NON_IDEMPOTENT_FUNCTIONS,
+    ):
+        """
+        :param max_attempts: Attempts per call, 1 disables retries.
+        :param base_delay: Backoff before the first retry in seconds.
+        :param max_delay: Maximum backoff in seconds.
+        :param non_idempotent_functions: DLL functions never retried.
+        """
+        if max_attempts < 1:
+            raise ValueError("Max attempts must be at least 1.")
+        if base_delay < 0 or max_delay < base_delay:
+            raise ValueError("Invalid retry delays.")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.non_idempotent_functions = non_idempotent_functions
+
+    def is_retryable(self, function_name: str, args: tuple) -> bool:
+        """Return True if a DLL call may be repeated."""
+        if self.max_attempts == 1 or function_name in self.non_idempotent_functions:
+            return False
+        if function_name == "Echo":
+            # Only queries, other commands may change the instrument state
+            return bool(args) and str(args[0]).rstrip().endswith("?")
+        return True
+
+    @staticmethod
+    def is_transient_result(result) -> bool:
+        """Return True if a DLL call result is a transient error status."""
+        error_code = result[0] if isinstance(result, tuple) else result
+        return isinstance(error_code, int) and error_code in TRANSIENT_ERROR_CODES
+
+    @staticmethod
+    def is_transient_exception(exception: BaseException) -> bool:
+        """Return True if an exception is a transient communication error."""
+        return any(
+            cls.__name__ in TRANSIENT_EXCEPTION_NAMES for cls in type(exception).__mro__
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Return the jittered delay in seconds after a failed attempt."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(delay / 2, delay)
+
+
+class RetryStats:
+    """Thread-safe retry counters of an instrument."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.retries = Counter()
+        self.recovered = Counter()
+        self.failed = Counter()
+
+    def record(self, counter: Counter, function_name: str):
+        with self._lock:
+            counter[function_name] += 1
+
+    def as_dict(self) -> dict[str, dict[str, int]]:
+        """Return the retried, recovered and failed calls by DLL function."""
+        with self._lock:
+            return {
+                "retries": dict(self.retries),
+                "recovered": dict(self.recovered),
+                "failed": dict(self.failed),
+            }
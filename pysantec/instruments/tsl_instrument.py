@@ -2,9 +2,12 @@
 TSL instrument module.
 """
 
+import time
+
 from ..logger import get_logger
+from ..tracing import span
 from .base_instrument import BaseInstrument
-from .wrapper import TSL
+from .wrapper import TSL, InstrumentExceptionCode
 from .wrapper.enumerations.tsl_enums import (
     LDStatus,
     PowerUnit,
@@ -20,6 +23,16 @@ from .wrapper.enumerations.tsl_enums import (
     TriggerInputMode,
 )
 
+# Longest blocking DLL wait in milliseconds. Longer waits are split,
+# so abort commands of other threads can run in between.
+# TSL_Busy_Check and Waiting_For_Sweep_Status take their wait time in
+# milliseconds (Santec TSL command DLL reference, and the Santec STS
+# samples, e.g. Waiting_For_Sweep_Status(2000, ...)). The reference
+# does not specify the status of an expired wait: TimeOut (-2) is
+# returned by current DLL versions, so a wait which used its whole
+# time is also treated as expired, whatever its status.
+WAIT_CHUNK = 1000
+
 
 class TSLInstrument(BaseInstrument):
     """TSL Instrument class for controlling TSL devices."""
@@ -43,13 +56,13 @@ class TSLInstrument(BaseInstrument):
     def get_system_error(self):
         """Get the system error from the TSL instrument."""
         system_error = self._get_function("Get_System_Error", "")
-        self.logger.debug(f"System error: {system_error}")
+        self.logger.debug("System error: %s", system_error)
         return system_error
 
     def get_power_unit(self) -> PowerUnit:
         """Get the current power unit setting."""
         power_unit = self._get_function_enum("Get_Power_Unit", PowerUnit.dBm)
-        self.logger.debug(f"Current power unit: {power_unit}.")
+        self.logger.debug("Current power unit: %s.", power_unit)
         return power_unit
 
     def get_wavelength_unit(self) -> WavelengthUnit:
@@ -57,7 +70,7 @@ class TSLInstrument(BaseInstrument):
         wavelength_unit = self._get_function_enum(
             "Get_Wavelength_Unit", WavelengthUnit.nm
         )
-        self.logger.debug(f"Current wavelength unit: {wavelength_unit}.")
+        self.logger.debug("Current wavelength unit: %s.", wavelength_unit)
         return wavelength_unit
 
     def get_power_mode(self) -> PowerMode:
@@ -65,13 +78,13 @@ class TSLInstrument(BaseInstrument):
         power_mode = self._get_function_enum(
             "Get_Power_Mode", PowerMode.AutoCurrentControl
         )
-        self.logger.debug(f"Current power mode: {power_mode}.")
+        self.logger.debug("Current power mode: %s.", power_mode)
         return power_mode
 
     def get_ld_status(self) -> LDStatus:
         """Get the current status of the laser diode."""
         ld_status = self._get_function_enum("Get_LD_Status", LDStatus.OFF)
-        self.logger.debug(f"Current LD status: {ld_status}.")
+        self.logger.debug("Current LD status: %s.", ld_status)
         return ld_status
 
     def get_scan_start_mode(self) -> ScanStartMode:
@@ -79,19 +92,19 @@ class TSLInstrument(BaseInstrument):
         scan_start_mode = self._get_function_enum(
             "Get_Sweep_Start_Mode", ScanStartMode.NORMAL
         )
-        self.logger.debug(f"Current scan start mode: {scan_start_mode}.")
+        self.logger.debug("Current scan start mode: %s.", scan_start_mode)
         return scan_start_mode
 
     def get_scan_status(self) -> ScanStatus:
         """Get the current scan status of the TSL instrument."""
         scan_status = self._get_function_enum("Get_Sweep_Status", ScanStatus.PAUSE)
-        self.logger.debug(f"Current sweep status: {scan_status}.")
+        self.logger.debug("Current sweep status: %s.", scan_status)
         return scan_status
 
     def get_scan_mode(self) -> ScanMode:
         """Get the current scan mode."""
         scan_mode = self._get_function_enum("Get_Sweep_Mode", ScanMode.STEPPED_ONE_WAY)
-        self.logger.debug(f"Current scan mode: {scan_mode}.")
+        self.logger.debug("Current scan mode: %s.", scan_mode)
         return scan_mode
 
     def get_shutter_status(self) -> ShutterStatus:
@@ -99,75 +112,75 @@ class TSLInstrument(BaseInstrument):
         shutter_status = self._get_function_enum(
             "Get_Shutter_Status", ShutterStatus.OPEN
         )
-        self.logger.debug(f"Current shutter status: {shutter_status}.")
+        self.logger.debug("Current shutter status: %s.", shutter_status)
         return shutter_status
 
     def get_power(self) -> float:
         """Get the current power setting in dBm."""
         power_value = self._get_function("Get_Setting_Power_dBm", float)
-        self.logger.debug(f"Current power setting: {power_value} dBm.")
+        self.logger.debug("Current power setting: %s dBm.", power_value)
         return power_value
 
     def get_wavelength(self) -> float:
         """Get the current wavelength setting in nm."""
         wavelength_value = self._get_function("Get_Wavelength", float)
-        self.logger.debug(f"Current wavelength setting: {wavelength_value} nm.")
+        self.logger.debug("Current wavelength setting: %s nm.", wavelength_value)
         return wavelength_value
 
     def get_speed(self) -> float:
         """Get the current speed setting in nm/sec."""
         speed_value = self._get_function("Get_Sweep_Speed", float)
-        self.logger.debug(f"Current speed setting: {speed_value} nm/sec.")
+        self.logger.debug("Current speed setting: %s nm/sec.", speed_value)
         return speed_value
 
     def get_step_wavelength(self) -> float:
         """Get the current step wavelength setting in nm."""
         step_wavelength = self._get_function("Get_Wavelength_Step", float)
-        self.logger.debug(f"Current step wavelength setting: {step_wavelength} nm.")
+        self.logger.debug("Current step wavelength setting: %s nm.", step_wavelength)
         return step_wavelength
 
     # region Logging Data Related methods
     def get_logging_data_points(self) -> int:
         """Get the number of data points available in the logging data."""
-        self.logger.info("Fetch logging data points.")
+        self.logger.debug("Fetch logging data points.")
         data_points = self.query(":READ:POIN?")
 
         if data_points is None:
-            self.logger.error(
-                f"Failed to retrieve data points." f" Status: {self.status}"
-            )
+            self.logger.error("Failed to retrieve data points. Status: %s", self.status)
             return 0
 
         data_points = int(data_points)
-        self.logger.info(f"Retrieved data points: {data_points}")
+        self.logger.debug("Retrieved data points: %s", data_points)
 
         return data_points
 
     def _fetch_logging_data(self, fetch_dll_func, *args):
         """Generic helper to fetch logging data with a scan lifecycle."""
-        self.tsl_busy_check(2)  # Ensure TSL is not busy
+        # The scan lifecycle and the fetch must not interleave with other threads
+        with self._lock:
+            self.tsl_busy_check(2)  # Ensure TSL is not busy
 
-        data_points = self.get_logging_data_points()
+            data_points = self.get_logging_data_points()
 
-        if data_points <= 0:
-            self.logger.error("No data points found.")
-            return 0, None
+            if data_points <= 0:
+                self.logger.error("No data points found.")
+                return 0, None
 
-        # Initialize data list
-        data = [0.0] * data_points
+            # Initialize data list
+            data = [0.0] * data_points
 
-        self.tsl_busy_check(2)  # Ensure TSL is not busy
+            self.tsl_busy_check(2)  # Ensure TSL is not busy
 
-        # Set the TSL start scan mode to waiting for trigger
-        self.set_scan_start_mode(ScanStartMode.WAITING_FOR_TRIGGER)
-        self.start_scan()
+            # Set the TSL start scan mode to waiting for trigger
+            self.set_scan_start_mode(ScanStartMode.WAITING_FOR_TRIGGER)
+            self.start_scan()
 
-        try:
-            result = getattr(self._instrument, fetch_dll_func)(*args, 0, data)
+            try:
+                result = self._call(fetch_dll_func, *args, 0, data)
 
-        finally:
-            self.stop_scan()  # Stop TSL process
-            pass
+            finally:
+                self.stop_scan()  # Stop TSL process
+                pass
 
         if not result or any(r is None for r in result if r is not None):
             self.logger.error("Failed to retrieve logging data.")
@@ -176,20 +189,23 @@ class TSLInstrument(BaseInstrument):
         status, data_points, data = result
 
         if data_points:
-            self.logger.info(
-                f"Retrieved logging data points: {data_points}."
-                f" Status: {self.status}."
-                f" Received data length: {len(data)}."
+            self.logger.debug(
+                "Retrieved logging data points: %s. Status: %s. "
+                "Received data length: %s.",
+                data_points,
+                self.status,
+                len(data),
             )
 
         if not isinstance(data, list):
-            data = list(data)
+            with span("TSL convert", "convert", data_points=len(data)):
+                data = list(data)
 
         return data
 
     def get_wavelength_logging_data(self):
         """Get the wavelength logging data."""
-        self.logger.info("Fetch the wavelength logging data.")
+        self.logger.debug("Fetch the wavelength logging data.")
 
         return self._fetch_logging_data("Get_Logging_Data")
 
@@ -202,21 +218,24 @@ class TSLInstrument(BaseInstrument):
         Speed in nm/sec.
         Step wavelength in nm.
         """
-        self.logger.info(f"Fetch power logging data.")
+        self.logger.debug("Fetch power logging data.")
 
-        if not speed:
-            speed = self.get_speed()
+        with self._lock:
+            if not speed:
+                speed = self.get_speed()
 
-        if not step_wavelength:
-            step_wavelength = self.get_step_wavelength()
+            if not step_wavelength:
+                step_wavelength = self.get_step_wavelength()
 
-        self.logger.info(f"Speed value: {speed}. Step wavelength: {step_wavelength}")
+            self.logger.debug(
+                "Speed value: %s. Step wavelength: %s", speed, step_wavelength
+            )
 
-        return self._fetch_logging_data(
-            "Get_Logging_Data_Power_for_STS",
-            speed,
-            step_wavelength,
-        )
+            return self._fetch_logging_data(
+                "Get_Logging_Data_Power_for_STS",
+                speed,
+                step_wavelength,
+            )
 
     # endregion
     # endregion
@@ -224,32 +243,32 @@ class TSLInstrument(BaseInstrument):
     # region Set methods
     def set_power_unit(self, unit: PowerUnit):
         """Set the power unit for the TSL instrument."""
-        self.logger.info(f"Setting power unit to {unit.name}.")
+        self.logger.debug("Setting power unit to %s.", unit.name)
         self._set_function_enum("Set_Power_Unit", unit)
 
     def set_wavelength_unit(self, unit: WavelengthUnit):
         """Set the wavelength unit for the TSL instrument."""
-        self.logger.info(f"Setting wavelength unit to {unit.name}.")
+        self.logger.debug("Setting wavelength unit to %s.", unit.name)
         self._set_function_enum("Set_Wavelength_Unit", unit)
 
     def set_power_mode(self, unit: PowerMode):
         """Set the power mode for the TSL instrument."""
-        self.logger.info(f"Setting power mode to {unit.name}.")
+        self.logger.debug("Setting power mode to %s.", unit.name)
         self._set_function_enum("Set_Power_Mode", unit)
 
     def set_ld_status(self, status: LDStatus):
         """Set the laser diode status."""
-        self.logger.info(f"Setting LD status to {status.name}.")
+        self.logger.debug("Setting LD status to %s.", status.name)
         self._set_function_enum("Set_LD_Status", status)
 
     def set_scan_start_mode(self, mode: ScanStartMode):
         """Set the scan start mode."""
-        self.logger.info(f"Setting Sweep Start Mode to {mode.name}.")
+        self.logger.debug("Setting Sweep Start Mode to %s.", mode.name)
         self._set_function_enum("Set_Sweep_Start_Mode", mode)
 
     def set_trigger_output_setting(self, mode: TriggerOutputSetting):
         """Set the trigger output setting."""
-        self.logger.info(f"Setting Trigger Output Setting to {mode.name}.")
+        self.logger.debug("Setting Trigger Output Setting to %s.", mode.name)
         self._set_function_enum("Set_TriggerOutput_Source", mode)
 
     def set_trigger_input_mode(self, mode: TriggerInputMode):
@@ -257,7 +276,7 @@ class TSLInstrument(BaseInstrument):
         Set the external trigger input setting.
         Enables / Disables external trigger input.
         """
-        self.logger.info(f"Setting Trigger Input Mode to {mode.name}.")
+        self.logger.debug("Setting Trigger Input Mode to %s.", mode.name)
         self._set_function_enum("Set_Input_Trigger_Mode", mode)
 
     def set_trigger_output_mode(self, mode: TriggerOutputMode):
@@ -265,37 +284,37 @@ class TSLInstrument(BaseInstrument):
         Set the trigger output setting.
         Sets the timing of the trigger signal output.
         """
-        self.logger.info(f"Setting Trigger Output Mode to {mode.name}.")
+        self.logger.debug("Setting Trigger Output Mode to %s.", mode.name)
         self._set_function_enum("Set_Trigger_Output_Mode", mode)
 
     def set_scan_mode(self, mode: ScanMode):
         """Set the scan mode."""
-        self.logger.info(f"Setting Sweep Mode to {mode.name}.")
+        self.logger.debug("Setting Sweep Mode to %s.", mode.name)
         self._set_function_enum("Set_Sweep_Mode", mode)
 
     def set_shutter_status(self, mode: ShutterStatus):
         """Set the shutter status."""
-        self.logger.info(f"Setting Shutter Status to {mode.name}.")
+        self.logger.debug("Setting Shutter Status to %s.", mode.name)
         self._set_function_enum("Set_Shutter_Status", mode)
 
     def set_power(self, value: float):
         """Set the power in dBm."""
-        self.logger.info(f"Setting power to {value} dBm.")
+        self.logger.debug("Setting power to %s dBm.", value)
         self._set_function("Set_APC_Power_dBm", value)
 
     def set_wavelength(self, value: float):
         """Set the wavelength in nm."""
-        self.logger.info(f"Setting wavelength to {value} nm.")
+        self.logger.debug("Setting wavelength to %s nm.", value)
         self._set_function("Set_Wavelength", value)
 
     def set_speed(self, value: float):
         """Set the speed in nm/sec."""
-        self.logger.info(f"Setting speed to {value} nm/sec.")
+        self.logger.debug("Setting speed to %s nm/sec.", value)
         self._set_function("Set_Sweep_Speed", value)
 
     def set_step_wavelength(self, value: float):
         """Set the step wavelength in nm."""
-        self.logger.info(f"Setting step wavelength to {value} nm.")
+        self.logger.debug("Setting step wavelength to %s nm.", value)
         self._set_function("Set_Wavelength_Step", value)
 
     # region Scan Related methods
@@ -309,11 +328,15 @@ class TSLInstrument(BaseInstrument):
         """Set the scan parameters for the TSL instrument
         and return the actual step wavelength."""
         self.logger.info(
-            f"Setting scan parameters: "
-            f"Start Wavelength: {start_wavelength} nm, "
-            f"Stop Wavelength: {stop_wavelength} nm, "
-            f"Step Wavelength: {step_wavelength} nm, "
-            f"Scan Speed: {scan_speed} nm/s."
+            "Setting scan parameters: "
+            "Start Wavelength: %s nm, "
+            "Stop Wavelength: %s nm, "
+            "Step Wavelength: %s nm, "
+            "Scan Speed: %s nm/s.",
+            start_wavelength,
+            stop_wavelength,
+            step_wavelength,
+            scan_speed,
         )
         actual_step = self._set_and_get_function(
             "Set_Sweep_Parameter_for_STS",
@@ -324,7 +347,7 @@ class TSLInstrument(BaseInstrument):
             0.0,
         )
         self.logger.info(
-            f"Scan parameters set successfully. TSL actual step: {actual_step} nm."
+            "Scan parameters set successfully. TSL actual step: %s nm.", actual_step
         )
         return actual_step
 
@@ -344,11 +367,16 @@ class TSLInstrument(BaseInstrument):
         self._set_function("Set_Software_Trigger")
 
     def wait_for_scan_status(self, wait_time: int, scan_status: ScanStatus):
-        """Wait for the scan status to change to the specified status."""
+        """
+        Wait for the scan status to change to the specified status.
+
+        :param wait_time: The maximum wait time in milliseconds.
+        :param scan_status: The scan status to wait for.
+        """
         self.logger.info(
-            f"Waiting for scan status: {scan_status.name} " f"for {wait_time} seconds."
+            "Waiting for scan status: %s for %s ms.", scan_status.name, wait_time
         )
-        self._set_function("Waiting_For_Sweep_Status", wait_time, scan_status.value)
+        self._chunked_wait("Waiting_For_Sweep_Status", wait_time, scan_status.value)
 
     def pause_scan(self):
         """Pause the scan on the TSL instrument."""
@@ -366,10 +394,28 @@ class TSLInstrument(BaseInstrument):
     # region TSL specific methods
     def tsl_busy_check(self, wait_time: int):
         """Check if the TSL instrument is busy
-        and wait for it to become available."""
-        self.logger.info(f"Checking if TSL is busy, waiting for {wait_time} seconds.")
+        and wait for it to become available.
+
+        :param wait_time: The maximum wait time in milliseconds.
+        """
+        self.logger.debug("Checking if TSL is busy, waiting for %s ms.", wait_time)
         # This function will wait for the TSL instrument to become available
-        self._set_function("TSL_Busy_Check", wait_time)
+        self._chunked_wait("TSL_Busy_Check", wait_time)
+
+    def _chunked_wait(self, function_name: str, wait_time: int, *args):
+        """Run a blocking DLL wait in chunks of at most WAIT_CHUNK milliseconds."""
+        remaining = wait_time
+        while True:
+            chunk = min(remaining, WAIT_CHUNK)
+            start = time.monotonic()
+            self._set_function(function_name, chunk, *args)
+            remaining -= chunk
+            if remaining <= 0 or self._status == InstrumentExceptionCode.Succeed:
+                return
+            # Other errors end the wait, unless the chunk used its whole time
+            expired = (time.monotonic() - start) * 1000 >= chunk
+            if self._status != InstrumentExceptionCode.TimeOut and not expired:
+                return
 
     def status_clear(self):
         """Status clear."""
@@ -384,22 +430,22 @@ class TSLInstrument(BaseInstrument):
     def operation_query(self):
         """Queries the completion of operation."""
         operation_query = self.query("*OPC?")
-        self.logger.info(f"Operation query result: {operation_query}")
+        self.logger.info("Operation query result: %s", operation_query)
         return operation_query
 
     def set_command_mode(self, is_scpi: bool = False):
         """Sets command mode to Legacy / SCPI."""
         if is_scpi:
-            self.logger.info(f"Setting command mode to SCPI.")
+            self.logger.debug("Setting command mode to SCPI.")
             self.write("SYST:COMM:COD 1")  # Sets the command set to SCPI.
         else:
-            self.logger.info(f"Setting command mode to Legacy.")
+            self.logger.debug("Setting command mode to Legacy.")
             self.write("SYST:COMM:COD 0")  # Sets the command set to Legacy.
 
     def set_gpib_command_delimiter(self, delimiter: GPIBDelimiter):
         """Sets the GPIB command delimiter."""
         delimiter_value = delimiter.value
-        self.logger.info(f"Setting GPIB command delimiter to {delimiter}.")
+        self.logger.debug("Setting GPIB command delimiter to %s.", delimiter)
         self.write(f"SYST:COMM:GPIB:DEL {delimiter_value}")
 
     # endregion
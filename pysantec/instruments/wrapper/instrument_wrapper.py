@@ -10,6 +10,9 @@ from .exceptions import InstrumentConnectionError, InstrumentOperationError
 from .santec_communication_wrapper import MainCommunication
 from .santec_wrapper import DAQ
 
+# I/O time out of new connections in milliseconds
+DEFAULT_TIMEOUT_MS = 5000
+
 
 class InstrumentWrapper:
     """Unified wrapper for the Santec Instrument DLL."""
@@ -31,7 +34,7 @@ class InstrumentWrapper:
             List of USB resource identifiers
         """
         resources = list(self._main_comm.Get_USB_Resouce())
-        self.logger.debug(f"USB resources found: {len(resources)}")
+        self.logger.debug("USB resources found: %s", len(resources))
         return resources
 
     def get_gpib_resources(self) -> List[str]:
@@ -41,7 +44,7 @@ class InstrumentWrapper:
             List of GPIB resource identifiers
         """
         resources = list(self._main_comm.Get_GPIB_Resources())
-        self.logger.debug(f"GPIB resources found: {len(resources)}")
+        self.logger.debug("GPIB resources found: %s", len(resources))
         return resources
 
     def get_serial_ports(self) -> List[str]:
@@ -51,7 +54,7 @@ class InstrumentWrapper:
             List of serial port identifiers
         """
         resources = list(self._main_comm.Get_Serial_Port())
-        self.logger.debug(f"Serial port resources found: {len(resources)}")
+        self.logger.debug("Serial port resources found: %s", len(resources))
         return resources
 
     def get_daq_devices(self) -> Optional[List[str]]:
@@ -66,7 +69,7 @@ class InstrumentWrapper:
         response = self._spu.Get_Device_ID(None)
         error_code, devices = response[0], list(response[1])
 
-        self.logger.debug(f"DAQ devices found: {len(devices)}")
+        self.logger.debug("DAQ devices found: %s", len(devices))
 
         if error_code == -11:
             self.logger.debug("No DAQ devices connected")
@@ -159,7 +162,7 @@ class InstrumentWrapper:
 
         instrument.IPAddress = ip_address
         instrument.Port = port_number
-        instrument.TimeOut = 5000
+        instrument.TimeOut = DEFAULT_TIMEOUT_MS
         instrument.Terminator = terminator.value
 
         try:
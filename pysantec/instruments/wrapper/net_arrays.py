@@ -0,0 +1,74 @@
+"""
+.NET array conversion helpers.
+
+Converts the arrays returned by the Santec DLLs to NumPy arrays
+with a single memory copy.
+"""
+
+import ctypes
+
+import numpy as np
+
+# .NET element type name to NumPy dtype
+NET_TO_NUMPY_DTYPE = {
+    "Double": np.float64,
+    "Single": np.float32,
+    "Int64": np.int64,
+    "Int32": np.int32,
+    "Int16": np.int16,
+    "Byte": np.uint8,
+}
+
+
+def _pinned_view(handle, dtype, shape):
+    """Return a NumPy view over the pinned memory of a .NET array."""
+    address = handle.AddrOfPinnedObject().ToInt64()
+    nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    buffer = (ctypes.c_byte * nbytes).from_address(address)
+    return np.frombuffer(buffer, dtype=dtype).reshape(shape)
+
+
+def to_numpy(net_array, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Convert a .NET array (1D or 2D) to a NumPy array.
+
+    The .NET array is pinned and its memory copied once, either into
+    a new array or directly into ``out``. ``out`` may be a strided view
+    of a larger buffer, e.g. one column of a (points x channels) array.
+    Plain Python sequences and NumPy arrays are accepted as well.
+
+    :param net_array: The .NET array or sequence to convert.
+    :param out: Optional destination array with a matching shape.
+
+    :return: The converted array (``out`` if given).
+    """
+    if not hasattr(net_array, "GetType"):
+        source = np.asarray(net_array)
+        if out is None:
+            return source.copy()
+        np.copyto(out, source.reshape(out.shape), casting="same_kind")
+        return out
+
+    from System.Runtime.InteropServices import GCHandle, GCHandleType
+
+    element_type = net_array.GetType().GetElementType().Name
+    dtype = NET_TO_NUMPY_DTYPE.get(element_type)
+    if dtype is None:
+        raise TypeError(f"Unsupported .NET array element type: {element_type}")
+
+    shape = tuple(net_array.GetLength(d) for d in range(net_array.Rank))
+    if out is not None and out.size != int(np.prod(shape)):
+        raise ValueError(
+            f"Output buffer size {out.size} does not match "
+            f"the data size {int(np.prod(shape))}."
+        )
+
+    handle = GCHandle.Alloc(net_array, GCHandleType.Pinned)
+    try:
+        view = _pinned_view(handle, dtype, shape)
+        if out is None:
+            return view.copy()
+        np.copyto(out, view.reshape(out.shape), casting="same_kind")
+        return out
+    finally:
+        handle.Free()
@@ -2,7 +2,9 @@
 Santec Communication DLL Wrapper.
 """
 
-import Santec.Communication as Comm
+from ...replay import santec_namespace
+
+Comm = santec_namespace("Santec.Communication")
 
 # Define the main classes and types for communication
 GPIBConnectType = Comm.GPIBConnectType
@@ -2,7 +2,10 @@
 Santec Instrument DLL Wrapper.
 """
 
-import Santec
+from ...replay import santec_namespace
+
+# Santec .NET namespace (or its record/replay stand-in)
+Santec = santec_namespace("Santec")
 
 # Santec Communication Terminator Enum class
 CommunicationTerminator = Santec.CommunicationTerminator
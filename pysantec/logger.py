@@ -1,48 +1,57 @@
 """
 PySantec logger module.
+
+Logging is not configured at import. Call ``configure_logging()`` to
+write the log records to rotating log files. The records are written
+by a background thread, so instrument calls never block on disk I/O.
 """
 
+import atexit
 import datetime
+import functools
+import glob
 import logging
 import os
 import platform
+import queue
 import sys
+import time
 
-from . import __about__
-
-# Ensure log directory exists
+# Log directory and file name
 LOG_DIR = "logs"
-os.makedirs(LOG_DIR, exist_ok=True)
-
-# Date and time for logging
-dt = datetime.datetime.now()
-dt = dt.strftime("%Y%m%d")
-
-# Configure the logger
-LOG_FILE = os.path.join(LOG_DIR, f"output_{dt}.log")
+LOG_FILE = "output.log"
 
 # Logging Level
 LOGGING_LEVEL = logging.INFO
 
-# Initialize root logger
-root_logger = logging.getLogger()
-if not root_logger.hasHandlers():
-    logging.basicConfig(
-        level=LOGGING_LEVEL,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        handlers=[
-            logging.FileHandler(LOG_FILE, mode="w"),
-            # logging.StreamHandler()
-        ],
-    )
+# Log record format
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+# Default log rotation settings
+MAX_LOG_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 30
 
-# Log the project version
-logging.info(f"Project Version: {__about__.__version__}")
+# Background listener writing the queued log records
+# (logging.handlers is imported on demand, it is slow to import)
+_listener = None
+_queue_handler = None
 
+# Set once the environment information has been logged
+_run_info_logged = False
 
-def _log_run_info():
-    """Log environment information."""
-    info = [
+
+@functools.lru_cache(maxsize=None)
+def get_run_info() -> tuple[str, ...]:
+    """
+    Return the project version and environment information.
+
+    Collected on first use and cached, as some of the platform
+    queries spawn subprocesses.
+    """
+    from . import __about__
+
+    return (
+        f"Project Version: {__about__.__version__}",
         f"Python Version: {sys.version}",
         f"Python Implementation: {platform.python_implementation()}",
         f"Architecture: {platform.architecture()[0]}",
@@ -50,16 +59,253 @@ def _log_run_info():
         f"Platform ID: {platform.platform()}",
         f"Machine: {platform.machine()}",
         f"Processor: {platform.processor()}",
-    ]
-    for line in info:
-        logging.info(line)
+    )
+
 
+def log_run_info():
+    """Log the environment information once per session."""
+    global _run_info_logged
 
-# Log the environment information
-_log_run_info()
+    if _run_info_logged:
+        return
+    _run_info_logged = True
+    # A named logger, as the module level functions configure the root logger
+    logger = get_logger(__name__)
+    for line in get_run_info():
+        logger.info(line)
 
 
 # Return the logger
 def get_logger(name: str) -> logging.Logger:
     """Get a logger with the specified name."""
     return logging.getLogger(name)
+
+
+class LogRateLimiter:
+    """
+    Limits the rate of a repeated log message, e.g. in polling loops.
+
+    At most one message is emitted per interval. The number of messages
+    suppressed since the last emitted one is appended to the next message.
+    """
+
+    def __init__(self, logger: logging.Logger, interval: float = 1.0):
+        """
+        :param logger: The logger to emit the messages to.
+        :param interval: The minimum time between messages in seconds.
+        """
+        self.logger = logger
+        self.interval = interval
+        self.suppressed = 0
+        self._last_time = None
+
+    def log(self, level: int, msg: str, *args):
+        """Log a message unless one was logged within the interval."""
+        if not self.logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        if self._last_time is not None and now - self._last_time < self.interval:
+            self.suppressed += 1
+            return
+        if self.suppressed:
+            msg += " (%d similar messages suppressed)"
+            args += (self.suppressed,)
+        self._last_time = now
+        self.suppressed = 0
+        self.logger.log(level, msg, *args)
+
+
+class RotatingLogFileHandler(logging.FileHandler):
+    """
+    Log file handler rotating on file size and at midnight.
+
+    Rotated files are renamed with a timestamp, optionally compressed
+    with gzip and deleted once the retention limits are exceeded.
+    The file is opened in append mode, so restarts keep earlier records.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int = MAX_LOG_BYTES,
+        rotate_daily: bool = True,
+        backup_count: int = LOG_BACKUP_COUNT,
+        retention_days: float | None = None,
+        compress: bool = True,
+        encoding: str = "utf-8",
+    ):
+        """
+        :param filename: The log file path.
+        :param max_bytes: Rotate when the file would exceed this size (0 disables).
+        :param rotate_daily: Rotate at local midnight.
+        :param backup_count: Number of rotated files to keep (0 keeps all).
+        :param retention_days: Delete rotated files older than this many days.
+        :param compress: Compress rotated files with gzip.
+        :param encoding: The log file encoding.
+        """
+        super().__init__(filename, "a", encoding=encoding, delay=True)
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.backup_count = backup_count
+        self.retention_days = retention_days
+        self.compress = compress
+        self.rollover_at = self._next_rollover_time()
+
+    @staticmethod
+    def _next_rollover_time() -> float:
+        """Return the timestamp of the next local midnight."""
+        tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+        return datetime.datetime.combine(tomorrow, datetime.time()).timestamp()
+
+    def emit(self, record: logging.LogRecord):
+        """Rotate the file if needed, then write the record."""
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            super().emit(record)
+        except Exception:
+            self.handleError(record)
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        """Return True if the record must go to a new file."""
+        if self.rotate_daily and time.time() >= self.rollover_at:
+            return True
+        if self.max_bytes > 0:
+            if self.stream is None:
+                self.stream = self._open()
+            message = f"{self.format(record)}\n"
+            if self.stream.tell() + len(message) >= self.max_bytes:
+                return self.stream.tell() > 0
+        return False
+
+    def _rotated_file_prefix(self) -> str:
+        """Return the common path prefix of the rotated files."""
+        return os.path.splitext(self.baseFilename)[0] + "_"
+
+    def doRollover(self):
+        """Rotate the current file and delete expired rotated files."""
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename):
+            extension = os.path.splitext(self.baseFilename)[1]
+            stem = self._rotated_file_prefix() + time.strftime("%Y%m%d-%H%M%S")
+            rotated = stem + extension
+            index = 1
+            while glob.glob(glob.escape(rotated) + "*"):
+                rotated = f"{stem}.{index}{extension}"
+                index += 1
+            os.rename(self.baseFilename, rotated)
+            if self.compress:
+                import gzip
+                import shutil
+
+                with open(rotated, "rb") as source:
+                    with gzip.open(rotated + ".gz", "wb") as destination:
+                        shutil.copyfileobj(source, destination)
+                os.remove(rotated)
+
+        self._delete_expired_files()
+        self.rollover_at = self._next_rollover_time()
+
+    def _delete_expired_files(self):
+        """Apply the retention limits to the rotated files."""
+        rotated_files = sorted(
+            glob.glob(glob.escape(self._rotated_file_prefix()) + "*"),
+            key=os.path.getmtime,
+            reverse=True,
+        )
+        expired = []
+        if self.backup_count > 0:
+            expired += rotated_files[self.backup_count :]
+        if self.retention_days is not None:
+            oldest_time = time.time() - self.retention_days * 86400
+            expired += [f for f in rotated_files if os.path.getmtime(f) < oldest_time]
+        for path in set(expired):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def configure_logging(
+    log_dir: str = LOG_DIR,
+    level: int = LOGGING_LEVEL,
+    filename: str = LOG_FILE,
+    max_bytes: int = MAX_LOG_BYTES,
+    rotate_daily: bool = True,
+    backup_count: int = LOG_BACKUP_COUNT,
+    retention_days: float | None = None,
+    compress: bool = True,
+    console: bool = False,
+):
+    """
+    Configure queued, rotating file logging on the root logger.
+
+    Log records are put on an in-memory queue and written to the log
+    file by a background listener thread. Calling this function again
+    replaces the previous configuration.
+
+    Parameters
+        log_dir: The log directory, created if it does not exist.
+        level: The logging level.
+        filename: The log file name.
+        max_bytes: Rotate when the log file would exceed this size.
+        rotate_daily: Rotate the log file at local midnight.
+        backup_count: Number of rotated files to keep.
+        retention_days: Delete rotated files older than this many days.
+        compress: Compress rotated files with gzip.
+        console: Also write the log records to stderr.
+    """
+    import logging.handlers
+
+    global _listener, _queue_handler
+
+    shutdown_logging()
+    os.makedirs(log_dir, exist_ok=True)
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [
+        RotatingLogFileHandler(
+            os.path.join(log_dir, filename),
+            max_bytes=max_bytes,
+            rotate_daily=rotate_daily,
+            backup_count=backup_count,
+            retention_days=retention_days,
+            compress=compress,
+        )
+    ]
+    if console:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+
+    root_logger = logging.getLogger()
+    root_logger.addHandler(_queue_handler)
+    root_logger.setLevel(level)
+
+
+def shutdown_logging():
+    """Write the queued log records and close the log files."""
+    global _listener, _queue_handler
+
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
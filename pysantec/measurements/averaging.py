@@ -0,0 +1,163 @@
+"""
+Multi-sweep averaging.
+
+Accumulates a running mean and variance of repeated sweeps in linear
+power with memory bounded by the sweep size, not the sweep count.
+"""
+
+# Basic Imports
+from typing import Sequence
+
+# Imports
+import numpy as np
+
+from ..logger import get_logger
+from ..tracing import traced
+from .single_measurement_operation import SME
+
+
+class SweepAverager:
+    """
+    Streaming (Welford) mean and variance of sweep data.
+
+    Sweeps are accumulated in linear power (mW). Memory usage is a few
+    (points x channels) arrays, regardless of the number of sweeps.
+    With sigma clipping enabled, readings further than ``sigma_clip``
+    standard deviations from the running mean are rejected per point
+    once ``min_clip_samples`` sweeps have been accumulated. Readings
+    within ``clip_tolerance`` (relative to the mean) are always accepted,
+    so a point with identical readings so far does not reject every
+    later reading.
+    """
+
+    def __init__(
+        self,
+        data_points: int,
+        channels: int,
+        sigma_clip: float | None = None,
+        min_clip_samples: int = 3,
+        clip_tolerance: float = 1e-3,
+        is_dbm: bool = True,
+    ):
+        """
+        Initialize the averager.
+
+        Parameters
+            data_points: Number of data points per sweep.
+            channels: Number of channels per sweep.
+            sigma_clip: Outlier rejection threshold in standard deviations.
+            min_clip_samples: Sweeps accumulated before clipping starts.
+            clip_tolerance: Relative deviation from the mean never clipped.
+            is_dbm: True if the sweep data is in dBm, False if in mW.
+        """
+        if sigma_clip is not None and sigma_clip <= 0:
+            raise ValueError("Sigma clip threshold must be a positive value.")
+        if min_clip_samples < 2:
+            raise ValueError("Minimum clip samples must be at least 2.")
+        if clip_tolerance < 0:
+            raise ValueError("Clip tolerance must be a non-negative value.")
+
+        self.logger = get_logger(self.__class__.__name__)
+        self.sigma_clip = sigma_clip
+        self.min_clip_samples = min_clip_samples
+        self.clip_tolerance = clip_tolerance
+        self.is_dbm = is_dbm
+        self.sweep_count = 0
+
+        shape = (data_points, channels)
+        self._mean = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+        self._count = np.zeros(shape, dtype=np.int64)
+        self._scratch = np.empty(shape)
+        self.logger.info(
+            "Initialized sweep averager: %s data points, %s channels, sigma clip: %s.",
+            data_points,
+            channels,
+            sigma_clip,
+        )
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Return the (points x channels) shape of the sweeps."""
+        return self._mean.shape
+
+    def add(self, sweep: np.ndarray):
+        """Accumulate one (points x channels) sweep."""
+        if sweep.shape != self.shape:
+            raise ValueError(f"Sweep shape {sweep.shape} does not match {self.shape}.")
+        if sweep is not self._scratch:
+            np.copyto(self._scratch, sweep)
+        self._accumulate(self._scratch)
+
+    def add_sme_sweep(self, sme: SME, channels: Sequence[tuple[int, int]]):
+        """
+        Fetch and accumulate the last SME sweep.
+
+        The channel data is fetched directly into a reused buffer,
+        so no per-sweep arrays are kept.
+        """
+        sme.fetch_channel_data(channels, out=self._scratch)
+        self._accumulate(self._scratch)
+
+    @traced("SweepAverager accumulate", "analyze")
+    def _accumulate(self, values: np.ndarray):
+        """Welford update with the values of one sweep (modified in place)."""
+        if self.is_dbm:
+            np.multiply(values, 0.1, out=values)
+            np.power(10.0, values, out=values)
+
+        accepted = np.isfinite(values)
+        if self.sigma_clip is not None:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                deviation = np.abs(values - self._mean)
+                limit = np.maximum(
+                    self.sigma_clip * np.sqrt(self._m2 / (self._count - 1)),
+                    self.clip_tolerance * np.abs(self._mean),
+                )
+            accepted &= (deviation <= limit) | (self._count < self.min_clip_samples)
+
+        self._count += accepted
+        delta = np.where(accepted, values - self._mean, 0.0)
+        np.divide(delta, self._count, out=values, where=accepted)
+        np.add(self._mean, values, out=self._mean, where=accepted)
+        self._m2 += delta * np.where(accepted, values, 0.0) * (self._count - 1)
+
+        self.sweep_count += 1
+        rejected = accepted.size - int(np.count_nonzero(accepted))
+        self.logger.debug(
+            "Accumulated sweep %d. Rejected points: %d.", self.sweep_count, rejected
+        )
+
+    @property
+    def count(self) -> np.ndarray:
+        """Return the number of accepted readings of each point."""
+        return self._count.copy()
+
+    @property
+    def mean(self) -> np.ndarray:
+        """Return the mean power in mW."""
+        return np.where(self._count > 0, self._mean, np.nan)
+
+    @property
+    def mean_dbm(self) -> np.ndarray:
+        """Return the mean power in dBm."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return 10.0 * np.log10(self.mean)
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Return the sample variance of the power in mW^2."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self._count > 1, self._m2 / (self._count - 1), np.nan)
+
+    @property
+    def std(self) -> np.ndarray:
+        """Return the sample standard deviation of the power in mW."""
+        return np.sqrt(self.variance)
+
+    def reset(self):
+        """Clear the accumulated sweeps."""
+        self._mean.fill(0.0)
+        self._m2.fill(0.0)
+        self._count.fill(0)
+        self.sweep_count = 0
@@ -0,0 +1,146 @@
+"""
+DAQ sweep operation.
+
+Swept measurement with a Santec SPU (NI DAQ) sampling the DUT signal
+on the triggers of the TSL sweep, together with the TSL power monitor.
+The DUT signal is normalized by the power monitor to remove the laser
+power variation over the sweep.
+"""
+
+# Basic Imports
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Imports
+import numpy as np
+
+from ..instruments import DAQInstrument, TSLInstrument, tsl_enums
+from ..logger import get_logger
+from ..tracing import span, traced
+from .single_measurement_operation import configure_tsl_sweep, data_point_count
+
+
+def normalize_by_monitor(
+    signal: np.ndarray, monitor: np.ndarray, out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Normalize a DUT signal by the TSL power monitor, in dB.
+
+    Points with a non-positive signal or monitor value are set to NaN.
+
+    :param signal: The DUT signal samples.
+    :param monitor: The power monitor samples of the same points.
+    :param out: Optional output array.
+
+    :return: 10 log10(signal / monitor) of each point.
+    """
+    if signal.shape != monitor.shape:
+        raise ValueError(
+            f"Signal shape {signal.shape} does not match monitor {monitor.shape}."
+        )
+    out = np.divide(signal, monitor, out=out)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.log10(out, out=out)
+    np.multiply(out, 10.0, out=out)
+    out[(signal <= 0) | (monitor <= 0)] = np.nan
+    return out
+
+
+class DAQSweep:
+    """Swept measurement with a TSL and a SPU (NI DAQ) device."""
+
+    def __init__(self, tsl: TSLInstrument, daq: DAQInstrument):
+        self.logger = get_logger(self.__class__.__name__)
+        self.laser = tsl
+        self.daq = daq
+        self.wavelengths = None
+        self.logger.info("Initialized DAQ sweep.")
+
+    @traced("DAQSweep configure", "sme")
+    def configure(
+        self,
+        start_wavelength: float,
+        stop_wavelength: float,
+        step_wavelength: float,
+        output_power: float,
+        scan_speed: float,
+    ) -> float:
+        """
+        Configure the TSL and the SPU.
+
+        The SPU is stopped while the TSL is configured, and its
+        sampling parameters are set with the actual TSL step.
+
+        Returns
+            The actual step value of the TSL.
+        """
+        self.logger.info("Configuring DAQ sweep.")
+        with ThreadPoolExecutor(1, "pysantec-daq") as executor:
+            stopped = executor.submit(self.daq.stop_sampling)
+            tsl_actual_step = configure_tsl_sweep(
+                self.laser,
+                start_wavelength,
+                stop_wavelength,
+                step_wavelength,
+                output_power,
+                scan_speed,
+            )
+            stopped.result()
+
+        self.daq.set_sampling_parameters(
+            start_wavelength, stop_wavelength, scan_speed, tsl_actual_step
+        )
+        data_points = data_point_count(
+            start_wavelength, stop_wavelength, step_wavelength
+        )
+        self.wavelengths = start_wavelength + np.arange(data_points) * step_wavelength
+        return tsl_actual_step
+
+    @traced("DAQSweep scan", "sme")
+    def perform_scan(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Run a sweep and return the DUT signal and power monitor samples.
+
+        The SPU is armed in parallel with the TSL, then the TSL is
+        triggered and the SPU samples on its trigger output. The DUT
+        signal is the SPU trigger data.
+        """
+        self.logger.info("Performing DAQ sweep.")
+        with span("DAQSweep arm", "sme"):
+            with ThreadPoolExecutor(1, "pysantec-daq") as executor:
+                sampling = executor.submit(self.daq.start_sampling)
+                self._arm_laser()
+                sampling.result()
+
+        with span("DAQSweep trigger", "sme"):
+            self.laser.soft_trigger()
+
+        with span("DAQSweep wait", "sme"):
+            self.daq.wait_for_sampling()
+
+        with span("DAQSweep fetch", "sme"):
+            signal, monitor = self.daq.get_sampling_data_array()
+        self.logger.info("DAQ sweep completed: %s data points.", len(signal))
+        return signal, monitor
+
+    def measure(self, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Run a sweep and return the normalized DUT signal in dB.
+
+        :param out: Optional output array, reused across sweeps.
+        """
+        signal, monitor = self.perform_scan()
+        with span("DAQSweep normalize", "analyze"):
+            return normalize_by_monitor(signal, monitor, out)
+
+    def _arm_laser(self):
+        """Start the TSL sweep, waiting for the software trigger."""
+        self.laser.set_scan_start_mode(tsl_enums.ScanStartMode.WAITING_FOR_TRIGGER)
+        self.laser.start_scan()
+
+        # Force the TSL to start the scan if not started
+        scan_status = self.laser.get_scan_status()
+        while scan_status != tsl_enums.ScanStatus.STANDING_BY_TRIGGER:
+            self.laser.start_scan()
+            scan_status = self.laser.get_scan_status()
+            time.sleep(0.2)
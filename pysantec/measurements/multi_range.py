@@ -0,0 +1,154 @@
+"""
+Multi-range sweep operation.
+
+Sweeps the same DUT at several manual MPM dynamic ranges and merges
+the spectra point by point into one high dynamic range spectrum.
+"""
+
+# Basic Imports
+from typing import Mapping, Sequence
+
+# Imports
+import numpy as np
+
+from ..logger import get_logger
+from ..tracing import span
+from .single_measurement_operation import SME, data_point_count
+
+# Nominal manual dynamic ranges of the MPM-211 module
+# as (upper limit, lower limit) in dBm
+MPM_RANGE_LIMITS = {
+    1: (10.0, -30.0),
+    2: (0.0, -40.0),
+    3: (-10.0, -50.0),
+    4: (-20.0, -60.0),
+    5: (-30.0, -70.0),
+}
+
+
+def merge_ranges(
+    data: np.ndarray,
+    upper_limits: Sequence[float],
+    lower_limits: Sequence[float],
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Merge multi-range sweep data point by point.
+
+    A reading is valid in its range when it is finite, below the
+    saturation (upper) limit and above the noise floor (lower limit).
+    Each merged point is taken from the valid range with the lowest
+    noise floor. Points without any valid range are set to NaN.
+
+    :param data: The (ranges x points x channels) power data in dBm.
+    :param upper_limits: The saturation limit of each range in dBm.
+    :param lower_limits: The noise floor of each range in dBm.
+
+    :return: The merged (points x channels) data and the index of
+             the range each point was taken from (-1 if none).
+    """
+    upper = np.asarray(upper_limits, dtype=float)[:, None, None]
+    lower = np.asarray(lower_limits, dtype=float)[:, None, None]
+    if upper.shape[0] != data.shape[0] or lower.shape[0] != data.shape[0]:
+        raise ValueError("Range limits must be given for every range.")
+
+    with np.errstate(invalid="ignore"):
+        valid = (data < upper) & (data > lower)
+
+    # Score each valid reading by the sensitivity of its range
+    score = np.where(valid, -lower, -np.inf)
+    source = np.argmax(score, axis=0)
+    merged = np.take_along_axis(data, source[None], axis=0)[0]
+
+    has_valid = np.take_along_axis(valid, source[None], axis=0)[0]
+    merged[~has_valid] = np.nan
+    source[~has_valid] = -1
+
+    return merged, source
+
+
+class MultiRangeSweep:
+    """Sweeps at several MPM dynamic ranges and merges the spectra."""
+
+    def __init__(
+        self,
+        sme: SME,
+        range_limits: Mapping[int, tuple[float, float]] = MPM_RANGE_LIMITS,
+    ):
+        self.logger = get_logger(self.__class__.__name__)
+        self.sme = sme
+        self.range_limits = dict(range_limits)
+        self.logger.info("Initialized multi-range sweep.")
+
+    def run(
+        self,
+        start_wavelength: float,
+        stop_wavelength: float,
+        step_wavelength: float,
+        output_power: float,
+        scan_speed: float,
+        channels: Sequence[tuple[int, int]],
+        ranges: Sequence[int] = (1, 2, 3),
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Sweep the DUT at each range and merge the channel data.
+
+        The TSL is configured once and reused for every range,
+        only the range value of the MPM(s) changes between the sweeps.
+
+        Parameters
+            channels: The (module number, channel number) pairs to fetch.
+            ranges: The manual dynamic range values to sweep.
+
+        Returns
+            The wavelength array, the merged (points x channels) data
+            in dBm and the range value of each point (-1 if none).
+        """
+        if not ranges:
+            raise ValueError("At least one range must be swept.")
+        unknown_ranges = [r for r in ranges if r not in self.range_limits]
+        if unknown_ranges:
+            raise ValueError(f"No range limits defined for ranges: {unknown_ranges}")
+
+        data_points = data_point_count(
+            start_wavelength, stop_wavelength, step_wavelength
+        )
+        self.logger.info(
+            "Running multi-range sweep: ranges %s, %s data points, %s channels.",
+            list(ranges),
+            data_points,
+            len(channels),
+        )
+
+        tsl_actual_step = self.sme.configure_tsl(
+            start_wavelength,
+            stop_wavelength,
+            step_wavelength,
+            output_power,
+            scan_speed,
+        )
+        self.sme.configure_mpm(
+            start_wavelength,
+            stop_wavelength,
+            step_wavelength,
+            scan_speed,
+            tsl_actual_step,
+            range_value=ranges[0],
+        )
+
+        data = np.empty((len(ranges), data_points, len(channels)))
+        for index, range_value in enumerate(ranges):
+            self.logger.info("Sweeping at range: %s.", range_value)
+            if index > 0:
+                for power_meter in self.sme.power_meters:
+                    power_meter.set_range_value(range_value)
+            self.sme.perform_scan()
+            self.sme.fetch_channel_data(channels, out=data[index])
+
+        upper_limits = [self.range_limits[r][0] for r in ranges]
+        lower_limits = [self.range_limits[r][1] for r in ranges]
+        with span("MultiRangeSweep merge", "analyze"):
+            merged, source = merge_ranges(data, upper_limits, lower_limits)
+            source_ranges = np.where(source >= 0, np.asarray(ranges)[source], -1)
+
+        wavelengths = start_wavelength + np.arange(data_points) * step_wavelength
+        return wavelengths, merged, source_ranges
@@ -0,0 +1,192 @@
+"""
+Segmented sweep operation.
+
+Splits a sweep that exceeds the MPM logging data point limit
+into back-to-back segments, runs each segment through the SME flow
+and stitches the segment data into one preallocated array.
+"""
+
+# Basic Imports
+import math
+from dataclasses import dataclass
+from typing import Sequence
+
+# Imports
+import numpy as np
+
+from ..logger import get_logger
+from ..tracing import span
+from ..instruments.mpm_instrument import MAX_LOGGING_DATA_POINTS
+from .single_measurement_operation import SME, data_point_count
+
+
+@dataclass(frozen=True)
+class SweepSegment:
+    """A single segment of a segmented sweep."""
+
+    index: int
+    start_wavelength: float
+    stop_wavelength: float
+    data_points: int
+    offset: int  # Index of the first segment point in the stitched data
+
+
+def plan_segments(
+    start_wavelength: float,
+    stop_wavelength: float,
+    step_wavelength: float,
+    max_data_points: int = MAX_LOGGING_DATA_POINTS,
+) -> list[SweepSegment]:
+    """
+    Split a sweep into back-to-back segments within the MPM limit.
+
+    Consecutive segments share their boundary wavelength, so the
+    stitched data has no gaps and no duplicate points. The sweep
+    intervals are spread evenly over the segments.
+
+    :param start_wavelength: Sweep start wavelength in nm.
+    :param stop_wavelength: Sweep stop wavelength in nm.
+    :param step_wavelength: Sweep step wavelength in nm.
+    :param max_data_points: Maximum logging data points per segment.
+
+    :return: The list of sweep segments.
+    """
+    if step_wavelength <= 0:
+        raise ValueError("Step wavelength must be a positive value.")
+    if stop_wavelength <= start_wavelength:
+        raise ValueError("Stop wavelength must be greater than start wavelength.")
+    if max_data_points < 2:
+        raise ValueError("Maximum data points must be at least 2.")
+
+    total_points = data_point_count(start_wavelength, stop_wavelength, step_wavelength)
+    intervals = total_points - 1
+    segment_count = math.ceil(intervals / (max_data_points - 1))
+    base_intervals, extra_intervals = divmod(intervals, segment_count)
+
+    segments = []
+    offset = 0
+    for index in range(segment_count):
+        segment_intervals = base_intervals + (1 if index < extra_intervals else 0)
+        segments.append(
+            SweepSegment(
+                index=index,
+                start_wavelength=start_wavelength + offset * step_wavelength,
+                stop_wavelength=start_wavelength
+                + (offset + segment_intervals) * step_wavelength,
+                data_points=segment_intervals + 1,
+                offset=offset,
+            )
+        )
+        offset += segment_intervals
+
+    return segments
+
+
+class SegmentedSweep:
+    """Runs sweeps longer than the MPM logging limit as several SME sweeps."""
+
+    def __init__(self, sme: SME, max_data_points: int = MAX_LOGGING_DATA_POINTS):
+        self.logger = get_logger(self.__class__.__name__)
+        self.sme = sme
+        self.max_data_points = max_data_points
+        self.logger.info(
+            "Initialized segmented sweep. Max data points: %s.", max_data_points
+        )
+
+    def plan(
+        self,
+        start_wavelength: float,
+        stop_wavelength: float,
+        step_wavelength: float,
+    ) -> list[SweepSegment]:
+        """Return the segments of a sweep."""
+        return plan_segments(
+            start_wavelength, stop_wavelength, step_wavelength, self.max_data_points
+        )
+
+    def run(
+        self,
+        start_wavelength: float,
+        stop_wavelength: float,
+        step_wavelength: float,
+        output_power: float,
+        scan_speed: float,
+        channels: Sequence[tuple[int, int]],
+        is_mpm_215: bool = False,
+        out: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Perform the segmented sweep and stitch the channel data.
+
+        Parameters
+            channels: The (module number, channel number) pairs to fetch.
+            is_mpm_215: True if using an MPM-215 module, else False.
+            out: Optional preallocated (points x channels) buffer.
+
+        Returns
+            The wavelength array and the (points x channels) data array.
+        """
+        segments = self.plan(start_wavelength, stop_wavelength, step_wavelength)
+        last_segment = segments[-1]
+        total_points = last_segment.offset + last_segment.data_points
+        self.logger.info(
+            "Running segmented sweep: %s segments, %s data points, %s channels.",
+            len(segments),
+            total_points,
+            len(channels),
+        )
+
+        if out is None:
+            out = np.empty((total_points, len(channels)))
+        elif out.shape != (total_points, len(channels)):
+            raise ValueError(
+                f"Output buffer shape {out.shape} does not match "
+                f"{(total_points, len(channels))}."
+            )
+
+        for segment in segments:
+            self.logger.info(
+                "Segment %s/%s: %s - %s nm, %s data points.",
+                segment.index + 1,
+                len(segments),
+                segment.start_wavelength,
+                segment.stop_wavelength,
+                segment.data_points,
+            )
+            with span("SegmentedSweep segment", "sme", index=segment.index):
+                if segment.index == 0:
+                    # Full instrument setup once, for the first segment
+                    tsl_actual_step = self.sme.configure_tsl(
+                        segment.start_wavelength,
+                        segment.stop_wavelength,
+                        step_wavelength,
+                        output_power,
+                        scan_speed,
+                    )
+                    self.sme.configure_mpm(
+                        segment.start_wavelength,
+                        segment.stop_wavelength,
+                        step_wavelength,
+                        scan_speed,
+                        tsl_actual_step,
+                        is_mpm_215,
+                    )
+                else:
+                    self.sme.update_scan_parameters(
+                        segment.start_wavelength,
+                        segment.stop_wavelength,
+                        step_wavelength,
+                        scan_speed,
+                        is_mpm_215,
+                    )
+                self.sme.perform_scan()
+
+                # The first point of a segment repeats the last point of
+                # the previous segment, and overwrites it in place.
+                segment_view = out[
+                    segment.offset : segment.offset + segment.data_points
+                ]
+                self.sme.fetch_channel_data(channels, out=segment_view)
+
+        wavelengths = start_wavelength + np.arange(total_points) * step_wavelength
+        return wavelengths, out
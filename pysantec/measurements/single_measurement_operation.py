@@ -6,20 +6,102 @@ GPIB and TCPIP.
 """
 
 # Basic Imports
+import logging
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Sequence
 
 # Imports
-from ..logger import get_logger
+import numpy as np
+
+from ..logger import get_logger, LogRateLimiter
+from ..tracing import span, traced
 from ..instruments import TSLInstrument, MPMInstrument, tsl_enums, mpm_enums
 
 
+def data_point_count(
+    start_wavelength: float, stop_wavelength: float, step_wavelength: float
+) -> int:
+    """Return the number of logging data points of a sweep."""
+    return int(round((stop_wavelength - start_wavelength) / step_wavelength)) + 1
+
+
+def configure_tsl_sweep(
+    laser: TSLInstrument,
+    start_wavelength: float,
+    stop_wavelength: float,
+    step_wavelength: float,
+    output_power: float,
+    scan_speed: float,
+) -> float:
+    """
+    Configure a TSL for a triggered wavelength sweep.
+
+    Returns
+        The actual step value of the TSL.
+    """
+    # Reset and basic setup
+    laser.status_clear()
+    laser.device_reset()
+
+    # Sets the command set to Legacy.
+    laser.set_command_mode(is_scpi=False)
+
+    # Sets the command delimiter for GPIB communication.
+    laser.set_gpib_command_delimiter(tsl_enums.GPIBDelimiter.CR)
+
+    # Turn on output if off
+    if laser.get_ld_status() == tsl_enums.LDStatus.OFF:
+        laser.set_ld_status(tsl_enums.LDStatus.ON)
+        while laser.operation_query() == 0:  # Queries the completion of operation.
+            time.sleep(0.5)
+
+    # Units and mode settings
+    laser.set_power_unit(tsl_enums.PowerUnit.dBm)  # Power in dBm
+    laser.set_wavelength_unit(tsl_enums.WavelengthUnit.nm)  # Wavelength in nm
+    laser.set_power_mode(tsl_enums.PowerMode.AutoPowerControl)  # Auto power control
+    laser.set_shutter_status(tsl_enums.ShutterStatus.OPEN)  # Open shutter
+
+    # Scan settings
+    laser.set_power(output_power)
+    actual_step = laser.set_scan_parameters(
+        start_wavelength, stop_wavelength, step_wavelength, scan_speed
+    )
+    laser.set_wavelength(start_wavelength)
+
+    return actual_step
+
+
 class SME:
-    def __init__(self, tsl: TSLInstrument, mpm: MPMInstrument):
+    def __init__(
+        self, tsl: TSLInstrument, mpm: MPMInstrument | Sequence[MPMInstrument]
+    ):
+        """
+        Parameters
+            tsl: The TSL driving the sweep.
+            mpm: The MPM, or several MPM mainframes triggered by the TSL.
+                 ``power_meter`` is the first one.
+        """
         self.logger = get_logger(self.__class__.__name__)
         self.laser = tsl
-        self.power_meter = mpm
-        self.logger.info("Initialized SME process.")
+        self.power_meters = list(mpm) if isinstance(mpm, (list, tuple)) else [mpm]
+        if not self.power_meters:
+            raise ValueError("At least one MPM is required.")
+        self.power_meter = self.power_meters[0]
+        self.logger.info(
+            "Initialized SME process with %s MPM(s).", len(self.power_meters)
+        )
+
+    @staticmethod
+    def _run_concurrently(function: Callable, items: Sequence) -> list:
+        """Call a function for each item, in parallel threads if there are several."""
+        if len(items) == 1:
+            return [function(items[0])]
+        with ThreadPoolExecutor(len(items), "pysantec-sme") as executor:
+            return list(executor.map(function, items))
 
+    @traced("SME configure TSL", "sme")
     def configure_tsl(
         self,
         start_wavelength: float,
@@ -30,45 +112,20 @@ class SME:
     ):
         """Configure the TSL."""
         self.logger.info("Configuring TSL parameters.")
-
-        # Reset and basic setup
-        self.laser.status_clear()
-        self.laser.device_reset()
-
-        # Sets the command set to Legacy.
-        self.laser.set_command_mode(is_scpi=False)
-
-        # Sets the command delimiter for GPIB communication.
-        self.laser.set_gpib_command_delimiter(tsl_enums.GPIBDelimiter.CR)
-
-        # Turn on output if off
-        if self.laser.get_ld_status() == tsl_enums.LDStatus.OFF:
-            self.laser.set_ld_status(tsl_enums.LDStatus.ON)
-            while (
-                self.laser.operation_query() == 0
-            ):  # Queries the completion of operation.
-                time.sleep(0.5)
-
-        # Units and mode settings
-        self.laser.set_power_unit(tsl_enums.PowerUnit.dBm)  # Power in dBm
-        self.laser.set_wavelength_unit(tsl_enums.WavelengthUnit.nm)  # Wavelength in nm
-        self.laser.set_power_mode(
-            tsl_enums.PowerMode.AutoPowerControl
-        )  # Auto power control
-        self.laser.set_shutter_status(tsl_enums.ShutterStatus.OPEN)  # Open shutter
-
-        # Scan settings
-        self.laser.set_power(output_power)
-        actual_step = self.laser.set_scan_parameters(
-            start_wavelength, stop_wavelength, step_wavelength, scan_speed
+        actual_step = configure_tsl_sweep(
+            self.laser,
+            start_wavelength,
+            stop_wavelength,
+            step_wavelength,
+            output_power,
+            scan_speed,
         )
-        self.laser.set_wavelength(start_wavelength)
-
-        self.logger.info(f"TSL actual step value: {actual_step}")
+        self.logger.info("TSL actual step value: %s", actual_step)
 
         # Return the TSL actual step value
         return actual_step
 
+    @traced("SME configure MPM", "sme")
     def configure_mpm(
         self,
         start_wavelength: float,
@@ -77,46 +134,95 @@ class SME:
         scan_speed: float,
         tsl_actual_step: float,
         is_mpm_215: bool = False,
+        range_value: int = 1,
     ):
         """
-        Configure the MPM.
+        Configure the MPM, or all MPM mainframes concurrently.
 
         Parameters
             tsl_actual_step: A step value in float
                              returned after setting the TSL scan parameters.
             is_mpm_215: True if using an MPM-215 module, else False.
+            range_value: The manual dynamic range value (ignored for MPM-215).
+                         The default first range is -30 ~ +10 dBm.
         """
         self.logger.info("Configuring MPM parameters.")
         self.logger.info(
-            f"TSL actual step value: {tsl_actual_step}. " f"Is MPM 215: {is_mpm_215}"
+            "TSL actual step value: %s. Is MPM 215: %s", tsl_actual_step, is_mpm_215
+        )
+
+        # MPM mainframes are configured concurrently
+        self._run_concurrently(
+            lambda power_meter: self._configure_power_meter(
+                power_meter,
+                start_wavelength,
+                stop_wavelength,
+                step_wavelength,
+                scan_speed,
+                tsl_actual_step,
+                is_mpm_215,
+                range_value,
+            ),
+            self.power_meters,
         )
 
+    def _configure_power_meter(
+        self,
+        power_meter: MPMInstrument,
+        start_wavelength: float,
+        stop_wavelength: float,
+        step_wavelength: float,
+        scan_speed: float,
+        tsl_actual_step: float,
+        is_mpm_215: bool,
+        range_value: int,
+    ):
+        """Configure one MPM mainframe."""
         # Stop any ongoing measurements
-        self.power_meter.stop_logging()
+        power_meter.stop_logging()
 
         # Set the mpm power unit to dBm
-        self.power_meter.set_power_unit(mpm_enums.PowerUnit.dBm)
+        power_meter.set_power_unit(mpm_enums.PowerUnit.dBm)
 
-        # Set default manual dynamic range mode
+        # Set manual dynamic range mode
         # and select SWEEP1 measurements mode
-        self.power_meter.set_range_mode(mpm_enums.RangeMode.MANUAL)
-        self.power_meter.set_range_value(
-            1
-        )  # Sets the first dynamic range value (-30 ~ +10 dBm)
+        power_meter.set_range_mode(mpm_enums.RangeMode.MANUAL)
+        power_meter.set_range_value(range_value)
         measurement_mode = mpm_enums.MeasurementMode.SWEEP1
 
         # If MPM-215 module is connected, select auto dynamic range mode
         # and SWEEP2 measurements mode settings
         if is_mpm_215:
-            self.power_meter.set_range_mode(mpm_enums.RangeMode.AUTO)
+            power_meter.set_range_mode(mpm_enums.RangeMode.AUTO)
             measurement_mode = mpm_enums.MeasurementMode.SWEEP2
 
         # Trigger settings
         # Enable external trigger
-        self.power_meter.set_trigger_input_mode(mpm_enums.TriggerInputMode.EXTERNAL)
+        power_meter.set_trigger_input_mode(mpm_enums.TriggerInputMode.EXTERNAL)
 
+        self._set_power_meter_scan(
+            power_meter,
+            start_wavelength,
+            stop_wavelength,
+            step_wavelength,
+            scan_speed,
+            tsl_actual_step,
+            measurement_mode,
+        )
+
+    @staticmethod
+    def _set_power_meter_scan(
+        power_meter: MPMInstrument,
+        start_wavelength: float,
+        stop_wavelength: float,
+        step_wavelength: float,
+        scan_speed: float,
+        tsl_actual_step: float,
+        measurement_mode: mpm_enums.MeasurementMode,
+    ):
+        """Set the scan parameters of one MPM mainframe."""
         # Scan settings
-        self.power_meter.set_scan_parameters(
+        power_meter.set_scan_parameters(
             start_wavelength,
             stop_wavelength,
             step_wavelength,
@@ -127,66 +233,134 @@ class SME:
 
         # Force set the measurements mode if not set
         while True:
-            if self.power_meter.get_measurement_mode() == measurement_mode:
+            if power_meter.get_measurement_mode() == measurement_mode:
                 break
-            self.power_meter.set_measurement_mode(measurement_mode)
-        print("Set Sweep mode: ", self.power_meter.get_measurement_mode())
+            power_meter.set_measurement_mode(measurement_mode)
+        print("Set Sweep mode: ", power_meter.get_measurement_mode())
 
         # Average wavelength setting
         average_wavelength = (start_wavelength + stop_wavelength) / 2
-        self.power_meter.set_wavelength(average_wavelength)
+        power_meter.set_wavelength(average_wavelength)
 
         # Set the expected read data count
-        data_count = int((stop_wavelength - start_wavelength) / step_wavelength + 1)
-        self.power_meter.set_logging_data_point(data_count)
+        data_count = data_point_count(
+            start_wavelength, stop_wavelength, step_wavelength
+        )
+        power_meter.set_logging_data_point(data_count)
+
+    @traced("SME update scan", "sme")
+    def update_scan_parameters(
+        self,
+        start_wavelength: float,
+        stop_wavelength: float,
+        step_wavelength: float,
+        scan_speed: float,
+        is_mpm_215: bool = False,
+    ) -> float:
+        """
+        Change the sweep range of the configured TSL and MPM(s).
+
+        Only the scan parameters are set, without the reset and the
+        laser and range setup of ``configure_tsl`` and ``configure_mpm``.
 
+        Returns
+            The actual step value of the TSL.
+        """
+        self.logger.info(
+            "Updating scan parameters: %s - %s nm.", start_wavelength, stop_wavelength
+        )
+        tsl_actual_step = self.laser.set_scan_parameters(
+            start_wavelength, stop_wavelength, step_wavelength, scan_speed
+        )
+        self.laser.set_wavelength(start_wavelength)
+
+        measurement_mode = (
+            mpm_enums.MeasurementMode.SWEEP2
+            if is_mpm_215
+            else mpm_enums.MeasurementMode.SWEEP1
+        )
+        self._run_concurrently(
+            lambda power_meter: self._set_power_meter_scan(
+                power_meter,
+                start_wavelength,
+                stop_wavelength,
+                step_wavelength,
+                scan_speed,
+                tsl_actual_step,
+                measurement_mode,
+            ),
+            self.power_meters,
+        )
+        return tsl_actual_step
+
+    @traced("SME scan", "sme")
     def perform_scan(self, display_logging_status: bool = False):
         """Executes the wavelength sweep and triggers measurement."""
         self.logger.info(
-            f"Performing Scan. Display logging status: {display_logging_status}."
+            "Performing Scan. Display logging status: %s.", display_logging_status
         )
 
-        # Set TSL scan status to waiting for trigger
-        self.laser.set_scan_start_mode(tsl_enums.ScanStartMode.WAITING_FOR_TRIGGER)
-
         print("\nStarting the SME process....\n")
 
-        # Start MPM measurements
-        self.power_meter.start_logging()
+        with span("SME arm", "sme"):
+            # Set TSL scan status to waiting for trigger
+            self.laser.set_scan_start_mode(tsl_enums.ScanStartMode.WAITING_FOR_TRIGGER)
 
-        # Start TSL scan
-        self.laser.start_scan()
+            # Start MPM measurements, on all mainframes in parallel
+            self._run_concurrently(
+                lambda power_meter: power_meter.start_logging(), self.power_meters
+            )
 
-        # Check TSL status and force set TSL to start scan if not started
-        scan_status = self.laser.get_scan_status()
-        while scan_status != tsl_enums.ScanStatus.STANDING_BY_TRIGGER:
+            # Start TSL scan
             self.laser.start_scan()
+
+            # Check TSL status and force set TSL to start scan if not started
             scan_status = self.laser.get_scan_status()
-            time.sleep(0.2)
+            while scan_status != tsl_enums.ScanStatus.STANDING_BY_TRIGGER:
+                self.laser.start_scan()
+                scan_status = self.laser.get_scan_status()
+                time.sleep(0.2)
 
         # Issue software trigger to the TSL
-        self.laser.soft_trigger()
+        with span("SME trigger", "sme"):
+            self.laser.soft_trigger()
 
         # Start timer
         start_time = time.time()
 
         # Wait for measurements to complete
-        while (
-            self.power_meter.get_logging_status()[0] == mpm_enums.LoggingStatus.LOGGING
-        ):
-            # Print the MPM logging status
-            if display_logging_status:
-                status, count = self.power_meter.get_logging_status()
-                print_string = f"Logging Status: {status.name}. Data Count: {count}"
-                self.logger.debug(print_string)
-                print(print_string)
-            time.sleep(0.2)
+        with span("SME wait", "sme"):
+            status_logger = LogRateLimiter(self.logger)
+            # Final logging status and data count of each MPM
+            results = {}
+            while True:
+                for index, power_meter in enumerate(self.power_meters):
+                    if index in results:
+                        continue
+                    status, count = power_meter.get_logging_status()
+                    if status != mpm_enums.LoggingStatus.LOGGING:
+                        results[index] = status, count
+                    else:
+                        logging_status = status, count
+                if len(results) == len(self.power_meters):
+                    break
+                status, count = logging_status
+                status_logger.log(
+                    logging.DEBUG,
+                    "Logging Status: %s. Data Count: %s",
+                    status.name,
+                    count,
+                )
+                # Print the MPM logging status
+                if display_logging_status:
+                    print(f"Logging Status: {status.name}. Data Count: {count}")
+                time.sleep(0.2)
+            status, count = results[0]
 
         # Scan end time and calculate elapsed time
         end_time = time.time()
         elapsed_time = round(end_time - start_time, 2)
 
-        status, count = self.power_meter.get_logging_status()
         print_string = f"Logging Status: {status.name}. Total Data Count: {count}"
         self.logger.info(print_string)
         print(f"\n{print_string}")
@@ -196,3 +370,55 @@ class SME:
         )
         self.logger.info(print_string)
         print(f"\n{print_string}")
+
+    @traced("SME fetch", "sme")
+    def fetch_channel_data(
+        self,
+        channels: Sequence[tuple[int, int] | tuple[int, int, int]],
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        Fetch the logging data of several channels into one array.
+
+        Parameters
+            channels: The (module number, channel number) pairs to fetch
+                      from the first MPM, or (MPM index, module number,
+                      channel number) triples with several MPMs.
+            out: Optional preallocated (points x channels) buffer.
+                 Each channel is copied directly into its column.
+
+        Returns
+            The (points x channels) array of logging data.
+        """
+        if not channels:
+            raise ValueError("At least one channel must be fetched.")
+        if out is not None and out.shape[1] != len(channels):
+            raise ValueError(
+                f"Output buffer has {out.shape[1]} columns "
+                f"for {len(channels)} channels."
+            )
+
+        # Columns of each MPM, as (column, module number, channel number)
+        columns = defaultdict(list)
+        for column, channel in enumerate(channels):
+            mpm_index, module_number, channel_number = (0, *channel)[-3:]
+            if not 0 <= mpm_index < len(self.power_meters):
+                raise ValueError(f"Invalid MPM index: {mpm_index}")
+            columns[mpm_index].append((column, module_number, channel_number))
+
+        if out is None:
+            data_points = self.power_meters[min(columns)].get_logging_data_point()
+            out = np.empty((data_points, len(channels)))
+
+        def fetch(mpm_index: int):
+            power_meter = self.power_meters[mpm_index]
+            # All channels of an MPM are fetched from the same logging run
+            with power_meter.lock:
+                for column, module_number, channel_number in columns[mpm_index]:
+                    power_meter.get_channel_logging_data_array(
+                        module_number, channel_number, out=out[:, column]
+                    )
+
+        # MPM mainframes are fetched in parallel
+        self._run_concurrently(fetch, list(columns))
+        return out
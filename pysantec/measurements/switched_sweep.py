@@ -0,0 +1,110 @@
+"""
+Optical switch multiplexed sweep operation.
+
+Sweeps the DUT ports behind a 1xN optical switch with one TSL and MPM
+setup. The switch is moved to the next port as soon as a scan ends, so
+it settles while the logging data of the previous port is read out.
+"""
+
+# Basic Imports
+from typing import Sequence
+
+# Imports
+import numpy as np
+
+from ..instruments.optical_switch import OpticalSwitch
+from ..logger import get_logger
+from ..tracing import span
+from .single_measurement_operation import SME, data_point_count
+
+
+class SwitchedSweep:
+    """Sweeps the ports of an optical switch and batches their data."""
+
+    def __init__(self, sme: SME, switch: OpticalSwitch):
+        self.logger = get_logger(self.__class__.__name__)
+        self.sme = sme
+        self.switch = switch
+        self.settle_wait = 0.0
+        self.logger.info("Initialized switched sweep.")
+
+    def run(
+        self,
+        start_wavelength: float,
+        stop_wavelength: float,
+        step_wavelength: float,
+        output_power: float,
+        scan_speed: float,
+        channels: Sequence[tuple[int, int]],
+        ports: Sequence[int] | None = None,
+        out: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sweep each switch port and fetch its channel data.
+
+        The TSL and MPM are configured once and reused for every port.
+        After each scan the switch is moved to the next port before the
+        data is fetched, so settling overlaps with the readout.
+
+        Parameters
+            channels: The (module number, channel number) pairs to fetch.
+            ports: The switch ports to sweep, all ports by default.
+            out: Optional preallocated (ports x points x channels) buffer.
+
+        Returns
+            The wavelength array and the (ports x points x channels) data.
+        """
+        if ports is None:
+            ports = range(1, self.switch.port_count + 1)
+        ports = list(ports)
+        if not ports:
+            raise ValueError("At least one port must be swept.")
+
+        data_points = data_point_count(
+            start_wavelength, stop_wavelength, step_wavelength
+        )
+        shape = (len(ports), data_points, len(channels))
+        if out is None:
+            out = np.empty(shape)
+        elif out.shape != shape:
+            raise ValueError(f"Output buffer shape {out.shape} does not match {shape}.")
+        self.logger.info(
+            "Running switched sweep: ports %s, %s data points, %s channels.",
+            ports,
+            data_points,
+            len(channels),
+        )
+
+        # The first port settles while the instruments are configured
+        self.switch.select(ports[0])
+        tsl_actual_step = self.sme.configure_tsl(
+            start_wavelength,
+            stop_wavelength,
+            step_wavelength,
+            output_power,
+            scan_speed,
+        )
+        self.sme.configure_mpm(
+            start_wavelength,
+            stop_wavelength,
+            step_wavelength,
+            scan_speed,
+            tsl_actual_step,
+        )
+
+        self.settle_wait = 0.0
+        for index, port in enumerate(ports):
+            with span("SwitchedSweep settle", "sme", port=port):
+                self.settle_wait += self.switch.wait_settled()
+            self.logger.info("Sweeping port: %s.", port)
+            self.sme.perform_scan()
+            if index + 1 < len(ports):
+                self.switch.select(ports[index + 1])
+            self.sme.fetch_channel_data(channels, out=out[index])
+
+        self.logger.info(
+            "Switched sweep completed. Switch settling wait: %.3f s.",
+            self.settle_wait,
+        )
+        wavelengths = start_wavelength + np.arange(data_points) * step_wavelength
+        return wavelengths, out
@@ -0,0 +1,15 @@
+# pysantec/remote/__init__.py
+
+"""
+PySantec remote instrument server, driving the instruments of a PC over the network.
+"""
+
+from .client import Batch, RemoteClient
+from .server import DEFAULT_PORT, RemoteServer
+
+__all__ = [
+    "Batch",
+    "RemoteClient",
+    "DEFAULT_PORT",
+    "RemoteServer",
+]
@@ -0,0 +1,41 @@
+"""
+Run a remote instrument server.
+
+    python -m pysantec.remote [--host HOST] [--port PORT] [--token TOKEN]
+"""
+
+import argparse
+
+from .server import DEFAULT_PORT, RemoteServer
+
+# Addresses served without a token, only reachable from the instrument PC
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run a PySantec remote instrument server."
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Address to listen on, 0.0.0.0 for all interfaces (requires --token).",
+    )
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port.")
+    parser.add_argument("--token", help="Token the clients must send.")
+    args = parser.parse_args()
+    if args.host not in LOOPBACK_HOSTS and not args.token:
+        parser.error("--token is required to listen on other than the loopback.")
+
+    token = args.token.encode() if args.token else None
+    server = RemoteServer(args.host, args.port, token=token)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Remote instrument server client.
+
+Connects to a remote server and returns proxies mirroring the public
+methods and properties of the served instruments and measurements. The
+enums of the instrument classes are mirrored by name, e.g.
+``client.enums.tsl_enums.PowerUnit.mW``. Command sequences can be sent
+in one round trip with ``batch``.
+"""
+
+import itertools
+import socket
+import threading
+from concurrent.futures import Future
+from enum import Enum
+from types import SimpleNamespace
+
+from ..broker.client import InstrumentClient, RemoteObject
+from ..broker.service import decode_error
+from .protocol import PROTOCOL_VERSION, receive_message, send_message
+from .server import DEFAULT_PORT, HELLO
+
+# Seconds to wait for the server to accept the connection
+CONNECT_TIMEOUT = 10.0
+
+
+class RemoteClient(InstrumentClient):
+    """Client of a remote instrument server."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int = DEFAULT_PORT,
+        timeout: float | None = None,
+        token: bytes | None = None,
+    ):
+        """
+        :param host: The server host name or address.
+        :param port: The server TCP port.
+        :param timeout: Seconds to wait for a response, no limit by default.
+        :param token: Token of the server, if it requires one.
+        """
+        self._socket = socket.create_connection((host, port), CONNECT_TIMEOUT)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._socket.settimeout(timeout)
+        self._lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+        self._enums = {}
+        try:
+            hello = self.request(HELLO, PROTOCOL_VERSION, token)
+        except Exception:
+            self._socket.close()
+            raise
+        self.enums = self._mirror_enums(hello["enums"])
+
+    def close(self):
+        """Close the connection, the server releases the objects of the client."""
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # region Requests
+    def request(self, op: str, *args):
+        """Send a request and wait for its result."""
+        ok, payload = self.exchange([(op, args)])[0]
+        if not ok:
+            raise decode_error(*payload)
+        return payload
+
+    def exchange(self, calls: list) -> list:
+        """
+        Send operations in one request, return their (ok, result) pairs.
+
+        :param calls: The (operation, arguments) pairs, run in order.
+        """
+        with self._lock:
+            request_id = next(self._request_ids)
+            try:
+                send_message(self._socket, (request_id, calls))
+                response_id, results = receive_message(self._socket, self._enums)
+            except (EOFError, OSError) as e:
+                self._socket.close()
+                raise ConnectionError(f"Remote server connection lost: {e}") from e
+        if response_id != request_id:
+            raise ConnectionError(f"Response {response_id} to request {request_id}.")
+        return results
+
+    def batch(self) -> "Batch":
+        """Return a batch of calls sent in one round trip."""
+        return Batch(self)
+
+    # endregion
+
+    def _mirror_enums(self, enums: dict) -> SimpleNamespace:
+        """Create the client side enums, by module and class name."""
+        modules = {}
+        for name, members in enums.items():
+            module, class_name = name.split(".", 1)
+            enum = Enum(class_name, members, module=module, qualname=class_name)
+            self._enums[name] = enum
+            modules.setdefault(module, {})[class_name] = enum
+        return SimpleNamespace(
+            **{
+                module: SimpleNamespace(**classes)
+                for module, classes in modules.items()
+            }
+        )
+
+
+class Batch:
+    """
+    Calls sent to a remote server in one round trip.
+
+    The calls are sent when ``send`` is called or the ``with`` block
+    exits, and run in order; their futures hold their results. A failed
+    call does not stop the following calls.
+    """
+
+    def __init__(self, client: RemoteClient):
+        self._client = client
+        self._calls = []
+        self._pending = []
+
+    def call(self, obj: RemoteObject, name: str, *args, **kwargs) -> Future:
+        """Add a method call, return the future of its result."""
+        return self._add(obj, ("call", (obj.handle, name, args, kwargs)))
+
+    def get(self, obj: RemoteObject, name: str) -> Future:
+        """Add a property read, return the future of its value."""
+        return self._add(obj, ("get", (obj.handle, name)))
+
+    def send(self):
+        """Send the calls and resolve their futures."""
+        calls, self._calls = self._calls, []
+        pending, self._pending = self._pending, []
+        if not calls:
+            return
+        try:
+            results = self._client.exchange(calls)
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(e)
+            raise
+        for (obj, future), (ok, payload) in zip(pending, results):
+            if not ok:
+                future.set_exception(decode_error(*payload))
+                continue
+            value, obj.status = payload
+            future.set_result(value)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.send()
+
+    def _add(self, obj: RemoteObject, call: tuple) -> Future:
+        future = Future()
+        self._calls.append(call)
+        self._pending.append((obj, future))
+        return future
@@ -0,0 +1,275 @@
+"""
+Binary protocol of the remote instrument server.
+
+Messages are length-prefixed frames of tagged values. NumPy arrays and
+lists of floats are sent as their raw little-endian bytes after a short
+header, without per-element encoding, and decoded as views of the
+received frame.
+
+Frame
+    u64 payload length, followed by one encoded value.
+
+Values (one tag byte, then)
+    N / T / F: None, True, False.
+    i: i64. I: Integer of any size as a decimal string.
+    d: f64.
+    s / b: u32 length and UTF-8 text or bytes.
+    l / t: u32 item count and the items of a list or tuple.
+    m: u32 item count and the keys and values of a dict.
+    e: Enum class name and member name strings, e.g. "tsl_enums.PowerUnit", "dBm".
+    a: dtype string, u8 dimensions, u64 shape per dimension, u64 byte count
+       and the raw little-endian array data.
+    f: List of floats, sent like a 1D f64 array.
+"""
+
+import struct
+from enum import Enum
+
+import numpy as np
+
+PROTOCOL_VERSION = 1
+
+# Frames up to this size are sent with one system call, larger ones in chunks
+SMALL_FRAME = 64 * 1024
+
+# Receive buffer size in bytes
+RECEIVE_CHUNK = 1 << 20
+
+NONE, TRUE, FALSE = b"N", b"T", b"F"
+INT, BIG_INT, FLOAT = b"i", b"I", b"d"
+STR, BYTES = b"s", b"b"
+LIST, TUPLE, DICT = b"l", b"t", b"m"
+ENUM, ARRAY, FLOAT_LIST = b"e", b"a", b"f"
+
+_U8 = struct.Struct("<B")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+_I64_MIN, _I64_MAX = -(2**63), 2**63 - 1
+
+
+def enum_name(enum_class: type) -> str:
+    """Return the protocol name of an enum class, e.g. "tsl_enums.PowerUnit"."""
+    return f"{enum_class.__module__.rsplit('.', 1)[-1]}.{enum_class.__qualname__}"
+
+
+class Encoder:
+    """Encodes values into a list of byte chunks, arrays are not copied."""
+
+    def __init__(self):
+        self.chunks = []
+        self._buffer = bytearray()
+
+    def encode(self, value) -> "Encoder":
+        buffer = self._buffer
+        if value is None:
+            buffer += NONE
+        elif value is True:
+            buffer += TRUE
+        elif value is False:
+            buffer += FALSE
+        elif isinstance(value, Enum):
+            buffer += ENUM
+            self._string(enum_name(type(value)))
+            self._string(value.name)
+        elif isinstance(value, int):
+            if _I64_MIN <= value <= _I64_MAX:
+                buffer += INT + _I64.pack(value)
+            else:
+                buffer += BIG_INT
+                self._string(str(value))
+        elif isinstance(value, float):
+            buffer += FLOAT + _F64.pack(value)
+        elif isinstance(value, str):
+            buffer += STR
+            self._string(value)
+        elif isinstance(value, (bytes, bytearray)):
+            buffer += BYTES + _U32.pack(len(value))
+            buffer += value
+        elif isinstance(value, np.ndarray):
+            self._array(ARRAY, value)
+        elif isinstance(value, np.generic):
+            self.encode(value.item())
+        elif isinstance(value, list):
+            if value and all(isinstance(v, float) for v in value):
+                self._array(FLOAT_LIST, np.asarray(value, dtype="<f8"))
+            else:
+                buffer += LIST + _U32.pack(len(value))
+                for item in value:
+                    self.encode(item)
+        elif isinstance(value, tuple):
+            buffer += TUPLE + _U32.pack(len(value))
+            for item in value:
+                self.encode(item)
+        elif isinstance(value, dict):
+            buffer += DICT + _U32.pack(len(value))
+            for key, item in value.items():
+                self.encode(key)
+                self.encode(item)
+        else:
+            raise TypeError(f"Cannot encode {type(value).__name__} values.")
+        return self
+
+    def begin_list(self, count: int) -> "Encoder":
+        """Start a list, its items are encoded or appended next."""
+        self._buffer += LIST + _U32.pack(count)
+        return self
+
+    def extend(self, other: "Encoder") -> "Encoder":
+        """Append the values encoded by another encoder."""
+        self._flush()
+        self.chunks.extend(other.finish())
+        return self
+
+    def finish(self) -> list:
+        """Return the encoded chunks."""
+        self._flush()
+        return self.chunks
+
+    def _string(self, value: str):
+        data = value.encode()
+        self._buffer += _U32.pack(len(data))
+        self._buffer += data
+
+    def _array(self, tag: bytes, array: np.ndarray):
+        if array.dtype.hasobject:
+            raise TypeError("Cannot encode object arrays.")
+        array = np.ascontiguousarray(array, array.dtype.newbyteorder("<"))
+        buffer = self._buffer
+        buffer += tag
+        if tag == ARRAY:
+            self._string(array.dtype.str)
+            buffer += _U8.pack(array.ndim)
+            for size in array.shape:
+                buffer += _U64.pack(size)
+        buffer += _U64.pack(array.nbytes)
+        if array.nbytes < SMALL_FRAME:
+            buffer += array.tobytes()
+        else:
+            self._flush()
+            self.chunks.append(memoryview(array).cast("B"))
+
+    def _flush(self):
+        if self._buffer:
+            self.chunks.append(bytes(self._buffer))
+            self._buffer = bytearray()
+
+
+class Decoder:
+    """Decodes a received frame."""
+
+    def __init__(self, data: bytearray, enums: dict | None = None):
+        """
+        :param data: The frame payload.
+        :param enums: Enum classes by protocol name.
+        """
+        self._data = data
+        self._view = memoryview(data)
+        self._position = 0
+        self._enums = enums or {}
+
+    def decode(self):
+        tag = self._read(1)
+        if tag == NONE:
+            return None
+        if tag == TRUE:
+            return True
+        if tag == FALSE:
+            return False
+        if tag == INT:
+            return self._unpack(_I64)
+        if tag == BIG_INT:
+            return int(self._string())
+        if tag == FLOAT:
+            return self._unpack(_F64)
+        if tag == STR:
+            return self._string()
+        if tag == BYTES:
+            return bytes(self._read(self._unpack(_U32)))
+        if tag == LIST:
+            return [self.decode() for _ in range(self._unpack(_U32))]
+        if tag == TUPLE:
+            return tuple(self.decode() for _ in range(self._unpack(_U32)))
+        if tag == DICT:
+            return {self.decode(): self.decode() for _ in range(self._unpack(_U32))}
+        if tag == ENUM:
+            class_name, member_name = self._string(), self._string()
+            enum_class = self._enums.get(class_name)
+            if enum_class is None:
+                raise ValueError(f"Unknown enum: {class_name}")
+            return enum_class[member_name]
+        if tag == ARRAY:
+            dtype = np.dtype(self._string())
+            shape = tuple(self._unpack(_U64) for _ in range(self._unpack(_U8)))
+            return self._array_view(dtype, shape)
+        if tag == FLOAT_LIST:
+            return self._array_view(np.dtype("<f8"), None).tolist()
+        raise ValueError(f"Invalid value tag: {tag!r}")
+
+    def _array_view(self, dtype: np.dtype, shape) -> np.ndarray:
+        nbytes = self._unpack(_U64)
+        start = self._position
+        self._read(nbytes)
+        array = np.frombuffer(self._data, dtype, nbytes // dtype.itemsize, start)
+        return array if shape is None else array.reshape(shape)
+
+    def _string(self) -> str:
+        return str(self._read(self._unpack(_U32)), "utf-8")
+
+    def _unpack(self, layout: struct.Struct):
+        return layout.unpack(self._read(layout.size))[0]
+
+    def _read(self, size: int) -> memoryview:
+        start = self._position
+        end = start + size
+        if end > len(self._data):
+            raise ValueError("Truncated message.")
+        self._position = end
+        return self._view[start:end]
+
+
+def send_message(sock, value):
+    """Send a value as one frame."""
+    send_encoded(sock, Encoder().encode(value))
+
+
+def send_encoded(sock, encoder: Encoder):
+    """Send the values of an encoder as one frame."""
+    chunks = encoder.finish()
+    size = sum(len(chunk) for chunk in chunks)
+    if size < SMALL_FRAME:
+        sock.sendall(_U64.pack(size) + b"".join(chunks))
+        return
+    sock.sendall(_U64.pack(size))
+    for chunk in chunks:
+        sock.sendall(chunk)
+
+
+def receive_message(sock, enums: dict | None = None, max_size: int | None = None):
+    """
+    Receive a frame and decode its value.
+
+    :param max_size: Largest accepted payload in bytes, no limit by default.
+
+    :return: The value, arrays are views of the received frame.
+    :raises EOFError: If the connection was closed.
+    :raises ValueError: If the frame is larger than max_size.
+    """
+    size = _U64.unpack(_receive(sock, _U64.size))[0]
+    if max_size is not None and size > max_size:
+        raise ValueError(f"Frame of {size} bytes exceeds {max_size} bytes.")
+    return Decoder(_receive(sock, size), enums).decode()
+
+
+def _receive(sock, size: int) -> bytearray:
+    data = bytearray(size)
+    view = memoryview(data)
+    position = 0
+    while position < size:
+        received = sock.recv_into(view[position:], min(size - position, RECEIVE_CHUNK))
+        if received == 0:
+            raise EOFError("Connection closed.")
+        position += received
+    return data
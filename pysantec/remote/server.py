@@ -0,0 +1,218 @@
+"""
+Remote instrument server.
+
+Serves the instruments, InstrumentManager and SME of an instrument PC to
+clients on other machines over TCP, using the binary protocol of
+``protocol``. A request is a batch of operations, run in order, and its
+response carries the result of every operation, so a client can send a
+whole command sequence in one round trip.
+
+Messages
+    Request: [request ID, [(operation, arguments), ...]]
+    Response: [request ID, [(True, result) or (False, (error type, message)),
+              ...]]
+"""
+
+import hmac
+import socket
+import socketserver
+import threading
+from enum import Enum
+
+from ..broker.service import InstrumentService, encode_error
+from ..logger import get_logger
+from .protocol import (
+    PROTOCOL_VERSION,
+    Encoder,
+    enum_name,
+    receive_message,
+    send_encoded,
+)
+
+DEFAULT_PORT = 50500
+
+# Operation opening a client session
+HELLO = "hello"
+
+# Largest request in bytes before and after the hello of a client.
+# The limit is small until the client is authenticated, so a peer
+# cannot make the server allocate large receive buffers.
+HELLO_SIZE_LIMIT = 64 * 1024
+REQUEST_SIZE_LIMIT = 256 * 1024 * 1024
+
+
+def _enum_classes() -> dict:
+    """Return the enums of the instrument classes by protocol name."""
+    from ..instruments.wrapper.enumerations import (
+        connection_enums,
+        mpm_enums,
+        tsl_enums,
+    )
+
+    return {
+        enum_name(value): value
+        for module in (connection_enums, mpm_enums, tsl_enums)
+        for value in vars(module).values()
+        if isinstance(value, type)
+        and issubclass(value, Enum)
+        and value.__module__ == module.__name__
+    }
+
+
+class RemoteServer:
+    """TCP server sharing the instruments of the PC with remote clients."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        service: InstrumentService | None = None,
+        token: bytes | None = None,
+        max_request_size: int = REQUEST_SIZE_LIMIT,
+    ):
+        """
+        :param host: Address to listen on, "0.0.0.0" for all interfaces.
+        :param port: TCP port, 0 for any free port.
+        :param service: The instrument service, with a new InstrumentManager
+                        by default.
+        :param token: Token the clients must send, no check by default.
+        :param max_request_size: Largest request in bytes of a client.
+        """
+        self.service = service or InstrumentService()
+        self.token = token
+        self.max_request_size = max_request_size
+        self._server = _TCPServer((host, port), self)
+        self._connections = set()
+        self._enums = None
+        self._thread = None
+        self.logger = get_logger(self.__class__.__name__)
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._server.server_address[:2]
+
+    @property
+    def enums(self) -> dict:
+        """Enums of the instrument classes, by protocol name."""
+        if self._enums is None:
+            self._enums = _enum_classes()
+        return self._enums
+
+    def serve_forever(self):
+        """Accept and serve clients until closed."""
+        self.logger.info("Remote server listening on %s:%s.", *self.address)
+        self._server.serve_forever()
+
+    def start(self):
+        """Serve clients in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        """Stop serving, close the client connections and the instruments."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        for connection in list(self._connections):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # Client disconnected
+        self.service.close()
+        self.logger.info("Remote server closed.")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def serve_client(self, connection: socket.socket):
+        """Serve the requests of a client until it disconnects."""
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._connections.add(connection)
+        session = None
+        try:
+            while True:
+                max_size = (
+                    HELLO_SIZE_LIMIT if session is None else self.max_request_size
+                )
+                try:
+                    request_id, calls = receive_message(
+                        connection, self.enums, max_size
+                    )
+                except (EOFError, OSError):
+                    break
+                except (ValueError, MemoryError) as e:
+                    self.logger.warning("Invalid request, disconnecting: %s", e)
+                    break
+                if session is None:
+                    results = [self._hello(calls)]
+                    if not results[0][0]:
+                        send_encoded(connection, self._encode(request_id, results))
+                        break
+                    session = self.service.open_session()
+                    self.logger.info("Client session %s opened.", session.session_id)
+                else:
+                    results = [self._run(session, op, args) for op, args in calls]
+                send_encoded(connection, self._encode(request_id, results))
+        except OSError:
+            pass  # Client disconnected
+        finally:
+            self._connections.discard(connection)
+            if session is not None:
+                session.close()
+                self.logger.info("Client session %s closed.", session.session_id)
+
+    def _hello(self, calls: list) -> tuple:
+        """Check the protocol version and token of a new client."""
+        if len(calls) != 1 or calls[0][0] != HELLO:
+            return False, encode_error(ValueError(f"Expected a {HELLO} request."))
+        version, token = calls[0][1]
+        if version != PROTOCOL_VERSION:
+            error = ValueError(
+                f"Protocol version {version} not supported, "
+                f"the server uses version {PROTOCOL_VERSION}."
+            )
+            return False, encode_error(error)
+        if self.token is not None and not hmac.compare_digest(token or b"", self.token):
+            return False, encode_error(PermissionError("Invalid token."))
+        enums = {name: [m.name for m in enum] for name, enum in self.enums.items()}
+        return True, {"version": PROTOCOL_VERSION, "enums": enums}
+
+    def _run(self, session, op: str, args: tuple) -> tuple:
+        """Run an operation, return (True, result) or (False, error)."""
+        try:
+            return True, session.handle(op, args)
+        except Exception as e:
+            self.logger.debug("Operation %s failed: %s", op, e)
+            return False, encode_error(e)
+
+    @staticmethod
+    def _encode(request_id: int, results: list) -> Encoder:
+        """Encode a response, results which cannot be encoded become errors."""
+        encoder = Encoder().begin_list(2).encode(request_id).begin_list(len(results))
+        for result in results:
+            try:
+                encoded = Encoder().encode(result)
+            except TypeError as e:
+                encoded = Encoder().encode((False, encode_error(e)))
+            encoder.extend(encoded)
+        return encoder
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple, remote: RemoteServer):
+        self.remote = remote
+        super().__init__(address, _Handler)
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        self.server.remote.serve_client(self.request)
@@ -0,0 +1,540 @@
+"""
+Record and replay backend.
+
+Records the DLL calls and responses of a session on the instrument PC,
+and replays them later without the Santec DLLs or instruments, e.g. to
+benchmark and profile the Python side of pysantec on Linux.
+
+The backend is selected with environment variables before pysantec
+is imported.
+    PYSANTEC_BACKEND: "dll" (default), "record", "replay" or "remote" for
+                      clients of a remote server, without the Santec DLLs.
+    PYSANTEC_SESSION: The session directory to record to or replay from.
+    PYSANTEC_REPLAY_TIMING: "fast" (default) replays the calls as fast as
+                            possible, "original" with their recorded duration.
+
+Session layout
+    calls.jsonl: One JSON event per DLL call, property access and enum value.
+    arrays.bin: The returned arrays as byte-shuffled, zlib compressed blobs.
+"""
+
+import atexit
+import builtins
+import collections
+import itertools
+import json
+import os
+import threading
+import time
+import zlib
+
+import numpy as np
+
+# Environment variables selecting the backend
+BACKEND_ENV = "PYSANTEC_BACKEND"
+SESSION_ENV = "PYSANTEC_SESSION"
+REPLAY_TIMING_ENV = "PYSANTEC_REPLAY_TIMING"
+
+# Backends
+DLL_BACKEND = "dll"
+RECORD_BACKEND = "record"
+REPLAY_BACKEND = "replay"
+REMOTE_BACKEND = "remote"
+
+# Replay timing modes
+FAST_TIMING = "fast"
+ORIGINAL_TIMING = "original"
+
+# Session file names
+CALLS_FILE = "calls.jsonl"
+ARRAYS_FILE = "arrays.bin"
+
+# Santec classes instantiated or subclassed by the DLL wrappers
+INSTRUMENT_CLASSES = (
+    "Santec.TSL",
+    "Santec.MPM",
+    "Santec.SPU",
+    "Santec.Communication.MainCommunication",
+)
+
+# Event operations
+CALL = "call"
+GET = "get"
+SET = "set"
+CHILD = "child"
+ENUM = "enum"
+
+# Properties set depending on the live command latency, not recorded
+UNRECORDED_PROPERTIES = frozenset({"TimeOut"})
+
+
+class ReplayError(Exception):
+    """Raised when a replayed call does not match the recorded session."""
+
+    pass
+
+
+class RecordedCallError(Exception):
+    """
+    Base class of the replayed exceptions of recorded DLL calls.
+
+    Exceptions which are not Python built-in exceptions, e.g. .NET
+    exceptions, are replayed as subclasses named like the recorded
+    exception class and its base classes.
+    """
+
+    pass
+
+
+def _exception_names(exception: BaseException) -> list[str]:
+    """Return the class names of an exception, up to the Python Exception."""
+    names = []
+    for cls in type(exception).__mro__:
+        if cls in (Exception, BaseException, object):
+            break
+        names.append(cls.__name__)
+    return names
+
+
+def get_backend() -> str:
+    """Return the backend selected by the PYSANTEC_BACKEND variable."""
+    backend = os.environ.get(BACKEND_ENV, DLL_BACKEND).lower()
+    if backend not in (DLL_BACKEND, RECORD_BACKEND, REPLAY_BACKEND, REMOTE_BACKEND):
+        raise ValueError(f"Invalid {BACKEND_ENV} value: {backend}")
+    return backend
+
+
+def _session_path() -> str:
+    """Return the session directory selected by the PYSANTEC_SESSION variable."""
+    path = os.environ.get(SESSION_ENV)
+    if not path:
+        raise ValueError(f"{SESSION_ENV} must be set for the {get_backend()} backend.")
+    return path
+
+
+# region Array encoding
+class ReplayArray(np.ndarray):
+    """NumPy array with the .NET array members used by the instrument classes."""
+
+    @property
+    def Rank(self) -> int:
+        return self.ndim
+
+    def GetLength(self, dimension: int) -> int:
+        return self.shape[dimension]
+
+
+def _shuffle(array: np.ndarray) -> bytes:
+    """Group the bytes of the array elements by significance."""
+    raw = np.frombuffer(array.tobytes(), dtype=np.uint8)
+    return raw.reshape(-1, array.itemsize).T.tobytes()
+
+
+def _unshuffle(data: bytes, dtype: np.dtype) -> np.ndarray:
+    """Invert ``_shuffle``."""
+    raw = np.frombuffer(data, dtype=np.uint8).reshape(dtype.itemsize, -1)
+    return np.ascontiguousarray(raw.T).view(dtype).ravel()
+
+
+def _is_net_array(value) -> bool:
+    """Return True if the value is a .NET array."""
+    try:
+        return bool(value.GetType().IsArray)
+    except AttributeError:
+        return False
+
+
+# endregion
+
+
+class SessionWriter:
+    """Writes the events of a recorded session."""
+
+    def __init__(self, path: str):
+        """
+        :param path: The session directory, created if it does not exist.
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._calls = open(os.path.join(path, CALLS_FILE), "w")
+        self._arrays = open(os.path.join(path, ARRAYS_FILE), "wb")
+        self._lock = threading.Lock()
+        self._enums = set()
+        self._start = time.perf_counter()
+        atexit.register(self.close)
+
+    def write(self, event: dict):
+        """Write one event."""
+        with self._lock:
+            event["t"] = round(time.perf_counter() - self._start, 6)
+            self._calls.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+    def write_enum(self, path: str, value: int):
+        """Write an enum value, once per enum member."""
+        if path not in self._enums:
+            self._enums.add(path)
+            self.write({"op": ENUM, "name": path, "result": value})
+
+    def _write_array(self, array: np.ndarray) -> dict:
+        """Write an array blob and return its reference."""
+        dtype = array.dtype.newbyteorder("<")
+        array = np.ascontiguousarray(array, dtype=dtype)
+        blob = zlib.compress(_shuffle(array), 1)
+        with self._lock:
+            offset = self._arrays.tell()
+            self._arrays.write(blob)
+        return {
+            "array": {
+                "offset": offset,
+                "size": len(blob),
+                "dtype": dtype.str,
+                "shape": list(array.shape),
+            }
+        }
+
+    def encode(self, value):
+        """Encode a DLL call result as JSON."""
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, tuple):
+            return {"tuple": [self.encode(v) for v in value]}
+        if isinstance(value, np.ndarray):
+            return self._write_array(value)
+        if _is_net_array(value):
+            from .instruments.wrapper.net_arrays import to_numpy
+
+            try:
+                return self._write_array(to_numpy(value))
+            except TypeError:
+                return [self.encode(v) for v in value]  # e.g. string arrays
+        if isinstance(value, list):
+            return [self.encode(v) for v in value]
+        try:
+            return int(value)  # .NET enum values
+        except (TypeError, ValueError):
+            return {"repr": str(value)}
+
+    @staticmethod
+    def summarize(value):
+        """Summarize a call argument."""
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        return {"type": value.__class__.__name__}
+
+    def close(self):
+        """Close the session files."""
+        with self._lock:
+            if not self._calls.closed:
+                self._calls.close()
+                self._arrays.close()
+
+
+class ReplaySession:
+    """Serves the events of a recorded session."""
+
+    def __init__(self, path: str, timing: str = FAST_TIMING):
+        """
+        :param path: The session directory.
+        :param timing: "fast" or "original".
+        """
+        if timing not in (FAST_TIMING, ORIGINAL_TIMING):
+            raise ValueError(f"Invalid replay timing: {timing}")
+        self.path = path
+        self.timing = timing
+        self.enums = {}
+        self._events = collections.defaultdict(collections.deque)
+        self._classes = {}
+        self._exception_classes = {}
+        self._lock = threading.Lock()
+
+        with open(os.path.join(path, CALLS_FILE)) as f:
+            for line in f:
+                event = json.loads(line)
+                if event["op"] == ENUM:
+                    self.enums[event["name"]] = event["result"]
+                elif event["op"] == SET and event["name"] in UNRECORDED_PROPERTIES:
+                    continue  # Recorded by earlier versions
+                else:
+                    self._events[event["obj"]].append(event)
+        self._arrays = open(os.path.join(path, ARRAYS_FILE), "rb")
+
+    def instrument_class(self, path: str) -> type:
+        """Return the replay class of a Santec class."""
+        if path not in self._classes:
+            counter = itertools.count(1)
+            session = self
+
+            def __init__(self):
+                _ReplayObject.__init__(self, f"{path}#{next(counter)}", session)
+
+            self._classes[path] = _NamespaceMeta(
+                path.rsplit(".", 1)[-1],
+                (_ReplayObject,),
+                {"__init__": __init__, "_namespace": ReplayNamespace(path, self)},
+            )
+        return self._classes[path]
+
+    def peek(self, object_id: str) -> dict:
+        """Return the next event of an object without consuming it."""
+        events = self._events.get(object_id)
+        if not events:
+            raise ReplayError(f"No more recorded events for {object_id}.")
+        return events[0]
+
+    def next_event(self, object_id: str, op: str, name: str) -> dict:
+        """Consume the next event of an object and check that it matches."""
+        with self._lock:
+            event = self.peek(object_id)
+            if event["op"] != op or event["name"] != name:
+                raise ReplayError(
+                    f"{object_id}: expected {event['op']} {event['name']}, "
+                    f"got {op} {name}."
+                )
+            self._events[object_id].popleft()
+        if self.timing == ORIGINAL_TIMING and event.get("d"):
+            time.sleep(event["d"])
+        return event
+
+    def exception(self, error: dict) -> BaseException:
+        """Return the exception of a recorded call error."""
+        names, message = error["types"], error["message"]
+        builtin = getattr(builtins, names[0], None) if names else Exception
+        if isinstance(builtin, type) and issubclass(builtin, BaseException):
+            return builtin(message)
+
+        key = tuple(names)
+        if key not in self._exception_classes:
+            base = RecordedCallError
+            for name in reversed(names):
+                base = type(name, (base,), {"__module__": __name__})
+            self._exception_classes[key] = base
+        return self._exception_classes[key](message)
+
+    def decode(self, value):
+        """Decode a recorded call result."""
+        if isinstance(value, list):
+            return [self.decode(v) for v in value]
+        if not isinstance(value, dict):
+            return value
+        if "tuple" in value:
+            return tuple(self.decode(v) for v in value["tuple"])
+        if "array" in value:
+            reference = value["array"]
+            with self._lock:
+                self._arrays.seek(reference["offset"])
+                blob = self._arrays.read(reference["size"])
+            dtype = np.dtype(reference["dtype"])
+            array = _unshuffle(zlib.decompress(blob), dtype)
+            return array.reshape(reference["shape"]).view(ReplayArray)
+        return value.get("repr")
+
+
+# region Namespaces and objects
+class _NamespaceMeta(type):
+    """Resolves class attributes, e.g. enums, through the class namespace."""
+
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(cls._namespace, name)
+
+
+class RecordingNamespace:
+    """Santec .NET namespace recording the enum values used."""
+
+    def __init__(self, path: str, target, writer: SessionWriter):
+        self._path = path
+        self._target = target
+        self._writer = writer
+        self._classes = {}
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = getattr(self._target, name)
+        path = f"{self._path}.{name}"
+        if path in INSTRUMENT_CLASSES:
+            if path not in self._classes:
+                self._classes[path] = _recording_class(path, value, self._writer)
+            return self._classes[path]
+        try:
+            self._writer.write_enum(path, int(value))
+            return value
+        except (TypeError, ValueError):
+            return RecordingNamespace(path, value, self._writer)
+
+
+class ReplayNamespace:
+    """Santec .NET namespace served from a recorded session."""
+
+    def __init__(self, path: str, session: ReplaySession):
+        self._path = path
+        self._session = session
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        path = f"{self._path}.{name}"
+        if path in INSTRUMENT_CLASSES:
+            return self._session.instrument_class(path)
+        if path in self._session.enums:
+            return self._session.enums[path]
+        return ReplayNamespace(path, self._session)
+
+
+class _RecordingObject:
+    """Proxy of a .NET object recording every call and property access."""
+
+    def __init__(self, target, object_id: str, writer: SessionWriter):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_object_id", object_id)
+        object.__setattr__(self, "_writer", writer)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        value = getattr(self._target, name)
+        event = {"obj": self._object_id, "name": name}
+
+        if callable(value):
+
+            def call(*args):
+                start = time.perf_counter()
+                event.update(
+                    op=CALL, args=[self._writer.summarize(arg) for arg in args]
+                )
+                try:
+                    result = value(*args)
+                except Exception as e:
+                    # Recorded, so the replay raises it at the same point
+                    event.update(
+                        d=round(time.perf_counter() - start, 6),
+                        error={"types": _exception_names(e), "message": str(e)},
+                    )
+                    self._writer.write(event)
+                    raise
+                event.update(
+                    d=round(time.perf_counter() - start, 6),
+                    result=self._writer.encode(result),
+                )
+                self._writer.write(event)
+                return result
+
+            return call
+
+        if value is None or isinstance(value, (bool, int, float, str)):
+            self._writer.write(dict(event, op=GET, result=value))
+            return value
+        try:
+            self._writer.write(dict(event, op=GET, result=int(value)))
+            return value
+        except (TypeError, ValueError):
+            self._writer.write(dict(event, op=CHILD))
+            return _RecordingObject(value, f"{self._object_id}.{name}", self._writer)
+
+    def __setattr__(self, name, value):
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+            return
+        setattr(self._target, name, value)
+        if name in UNRECORDED_PROPERTIES:
+            return
+        self._writer.write(
+            {
+                "obj": self._object_id,
+                "op": SET,
+                "name": name,
+                "args": [self._writer.summarize(value)],
+            }
+        )
+
+
+def _recording_class(path: str, target_class, writer: SessionWriter) -> type:
+    """Return a recording class of a Santec class."""
+    counter = itertools.count(1)
+
+    def __init__(self):
+        _RecordingObject.__init__(
+            self, target_class(), f"{path}#{next(counter)}", writer
+        )
+
+    return _NamespaceMeta(
+        path.rsplit(".", 1)[-1],
+        (_RecordingObject,),
+        {
+            "__init__": __init__,
+            "_namespace": RecordingNamespace(path, target_class, writer),
+        },
+    )
+
+
+class _ReplayObject:
+    """Stand-in of a .NET object served from a recorded session."""
+
+    def __init__(self, object_id: str, session: ReplaySession):
+        object.__setattr__(self, "_object_id", object_id)
+        object.__setattr__(self, "_session", session)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        session = self._session
+        op = session.peek(self._object_id)["op"]
+
+        if op == CALL:
+
+            def call(*args):
+                event = session.next_event(self._object_id, CALL, name)
+                if "error" in event:
+                    raise session.exception(event["error"])
+                return session.decode(event["result"])
+
+            return call
+
+        if op == CHILD:
+            session.next_event(self._object_id, CHILD, name)
+            return _ReplayObject(f"{self._object_id}.{name}", session)
+
+        event = session.next_event(self._object_id, GET, name)
+        return session.decode(event["result"])
+
+    def __setattr__(self, name, value):
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+            return
+        if name not in UNRECORDED_PROPERTIES:
+            self._session.next_event(self._object_id, SET, name)
+
+
+# endregion
+
+
+_writer = None
+_session = None
+
+
+def santec_namespace(name: str = "Santec"):
+    """
+    Return a Santec .NET namespace of the selected backend.
+
+    :param name: The namespace, "Santec" or "Santec.Communication".
+    """
+    global _writer, _session
+
+    backend = get_backend()
+    if backend == REMOTE_BACKEND:
+        raise ImportError("The Santec DLLs are not loaded by remote clients.")
+    if backend == REPLAY_BACKEND:
+        if _session is None:
+            timing = os.environ.get(REPLAY_TIMING_ENV, FAST_TIMING).lower()
+            _session = ReplaySession(_session_path(), timing)
+        return ReplayNamespace(name, _session)
+
+    import importlib
+
+    namespace = importlib.import_module(name)
+    if backend == RECORD_BACKEND:
+        if _writer is None:
+            _writer = SessionWriter(_session_path())
+        return RecordingNamespace(name, namespace, _writer)
+    return namespace
@@ -0,0 +1,27 @@
+# pysantec/simulation/__init__.py
+
+"""
+PySantec station throughput simulation.
+"""
+
+from .latency import LatencyModel
+from .station import (
+    Recipe,
+    StationConfig,
+    Scenario,
+    SimulationResult,
+    simulate,
+    compare,
+    format_comparison,
+)
+
+__all__ = [
+    "LatencyModel",
+    "Recipe",
+    "StationConfig",
+    "Scenario",
+    "SimulationResult",
+    "simulate",
+    "compare",
+    "format_comparison",
+]
@@ -0,0 +1,121 @@
+"""
+Minimal discrete-event simulation engine.
+
+Processes are generators yielding events: a ``Timeout`` to let
+simulated time pass, or a ``Resource.request()`` to wait for a
+shared resource such as the GPIB bus.
+"""
+
+import heapq
+import itertools
+from collections import deque
+from typing import Callable, Generator
+
+
+class Timeout:
+    """Event resuming the process after a delay."""
+
+    def __init__(self, delay: float):
+        if delay < 0:
+            raise ValueError("Timeout delay must be a non-negative value.")
+        self.delay = delay
+
+    def _subscribe(self, simulation: "Simulation", resume: Callable):
+        simulation.schedule(self.delay, resume)
+
+
+class _Request:
+    """Event resuming the process once the resource is acquired."""
+
+    def __init__(self, resource: "Resource"):
+        self.resource = resource
+
+    def _subscribe(self, simulation: "Simulation", resume: Callable):
+        self.resource._acquire(resume)
+
+
+class Resource:
+    """A resource with a capacity, acquired first come, first served."""
+
+    def __init__(self, simulation: "Simulation", name: str, capacity: int = 1):
+        """
+        :param simulation: The simulation of the resource.
+        :param name: The resource name used in the results.
+        :param capacity: The number of simultaneous users.
+        """
+        self.simulation = simulation
+        self.name = name
+        self.capacity = capacity
+        self.users = 0
+        self.busy_time = 0.0
+        self._waiting = deque()
+        self._last_change = simulation.now
+
+    def request(self) -> _Request:
+        """Return an event acquiring the resource."""
+        return _Request(self)
+
+    def release(self):
+        """Release the resource, handing it over to the next waiting process."""
+        if self._waiting:
+            self.simulation.schedule(0.0, self._waiting.popleft())
+            return
+        self._update_busy_time()
+        self.users -= 1
+
+    def hold(self, duration: float) -> Generator:
+        """Process step acquiring the resource for a duration."""
+        yield self.request()
+        yield Timeout(duration)
+        self.release()
+
+    def utilization(self) -> float:
+        """Return the busy fraction of the capacity since the start."""
+        self._update_busy_time()
+        if self.simulation.now <= 0:
+            return 0.0
+        return self.busy_time / (self.capacity * self.simulation.now)
+
+    def _acquire(self, resume: Callable):
+        if self.users < self.capacity:
+            self._update_busy_time()
+            self.users += 1
+            self.simulation.schedule(0.0, resume)
+        else:
+            self._waiting.append(resume)
+
+    def _update_busy_time(self):
+        now = self.simulation.now
+        self.busy_time += self.users * (now - self._last_change)
+        self._last_change = now
+
+
+class Simulation:
+    """Event queue and simulated clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self._queue = []
+        self._order = itertools.count()
+
+    def schedule(self, delay: float, callback: Callable):
+        """Call a callback after a delay of simulated time."""
+        heapq.heappush(self._queue, (self.now + delay, next(self._order), callback))
+
+    def process(self, generator: Generator):
+        """Start a process."""
+        self.schedule(0.0, lambda: self._resume(generator))
+
+    def run(self, until: float):
+        """Run the simulation until the given simulated time."""
+        while self._queue and self._queue[0][0] <= until:
+            self.now, _, callback = heapq.heappop(self._queue)
+            callback()
+        self.now = until
+
+    def _resume(self, generator: Generator):
+        try:
+            event = next(generator)
+        except StopIteration:
+            return
+        event._subscribe(self, lambda: self._resume(generator))
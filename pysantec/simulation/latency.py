@@ -0,0 +1,82 @@
+"""
+Instrument command latency distributions.
+
+Latencies are drawn from measured samples per DLL function, e.g. the
+records of the flight recorder, or from a default latency for commands
+without samples.
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+from .. import flight_recorder
+
+# Latency of commands without samples in seconds
+DEFAULT_COMMAND_LATENCY = 0.005
+
+
+class LatencyModel:
+    """Empirical per-command latency distributions."""
+
+    def __init__(
+        self,
+        samples: dict[str, Sequence[float]] | None = None,
+        default: float = DEFAULT_COMMAND_LATENCY,
+    ):
+        """
+        :param samples: Latency samples in seconds by DLL function name.
+        :param default: Latency of commands without samples in seconds.
+        """
+        self.default = default
+        self._samples = {}
+        for function_name, values in (samples or {}).items():
+            self.set(function_name, values)
+
+    @classmethod
+    def from_records(cls, records: list[dict], **kwargs) -> "LatencyModel":
+        """
+        Create a model from flight recorder records.
+
+        :param records: The records, as returned by ``read_records``.
+        """
+        samples = {}
+        for record in records:
+            samples.setdefault(record["function"], []).append(
+                record["latency_us"] / 1e6
+            )
+        return cls(samples, **kwargs)
+
+    @classmethod
+    def from_flight_recorder(cls, path: str, **kwargs) -> "LatencyModel":
+        """
+        Create a model from a flight recorder file.
+
+        :param path: The recorder file.
+        """
+        return cls.from_records(flight_recorder.read_records(path), **kwargs)
+
+    def set(self, function_name: str, latency: float | Sequence[float]):
+        """Set the latency samples (or a fixed latency) of a command."""
+        values = np.atleast_1d(np.asarray(latency, dtype=float))
+        if values.size == 0 or np.any(values < 0):
+            raise ValueError(
+                f"Latency samples of {function_name} must be non-negative values."
+            )
+        self._samples[function_name] = values
+
+    def functions(self) -> list[str]:
+        """Return the commands with latency samples."""
+        return list(self._samples)
+
+    def mean(self, function_name: str) -> float:
+        """Return the mean latency of a command in seconds."""
+        values = self._samples.get(function_name)
+        return self.default if values is None else float(values.mean())
+
+    def sample(self, function_name: str, rng: np.random.Generator) -> float:
+        """Draw one latency of a command in seconds."""
+        values = self._samples.get(function_name)
+        if values is None:
+            return self.default
+        return float(values[rng.integers(values.size)])
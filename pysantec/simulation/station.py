@@ -0,0 +1,402 @@
+"""
+Station throughput simulation.
+
+Models the SME configure, scan and fetch phases of one or more rigs as
+a discrete-event simulation: every DLL command holds the GPIB bus for a
+latency drawn from a ``LatencyModel``, sweeps occupy the instruments,
+and the sweep data is processed on the host CPU. Predicts the DUTs per
+hour and the utilization of each resource, and compares what-if
+scenarios, e.g. pipelined processing or a shorter averaging time.
+"""
+
+import dataclasses
+from dataclasses import dataclass, field
+from typing import Generator
+
+import numpy as np
+
+from ..logger import get_logger
+from ..measurements.single_measurement_operation import data_point_count
+from .engine import Resource, Simulation, Timeout
+from .latency import LatencyModel
+
+# region DLL command sequences of the SME phases
+TSL_CONFIGURE_COMMANDS = (
+    "Write",  # *CLS
+    "Write",  # *RST
+    "Write",  # Command mode
+    "Write",  # GPIB delimiter
+    "Get_LD_Status",
+    "Set_Power_Unit",
+    "Set_Wavelength_Unit",
+    "Set_Power_Mode",
+    "Set_Shutter_Status",
+    "Set_APC_Power_dBm",
+    "Set_Sweep_Parameter_for_STS",
+    "Set_Wavelength",
+)
+MPM_CONFIGURE_COMMANDS = (
+    "Logging_Stop",
+    "Set_Unit",
+    "Set_READ_Range_Mode",
+    "Set_Range",
+    "Set_Trigger_Input_Mode",
+    "Set_Logging_Paremeter_for_STS",
+    "Get_Mode",
+    "Set_Wavelength",
+    "Set_Logging_Data_Point",
+)
+ARM_COMMANDS = (
+    "Set_Sweep_Start_Mode",
+    "Logging_Start",
+    "Sweep_Start",
+    "Get_Sweep_Status",
+)
+TRIGGER_COMMAND = "Set_Software_Trigger"
+POLL_COMMAND = "Get_Logging_Status"
+FETCH_POINTS_COMMAND = "Get_Logging_Data_Point"
+FETCH_CHANNEL_COMMAND = "Get_Each_Channel_Logdata"
+WAVELENGTH_FETCH_COMMANDS = (
+    "TSL_Busy_Check",
+    "Echo",  # :READ:POIN?
+    "TSL_Busy_Check",
+    "Set_Sweep_Start_Mode",
+    "Sweep_Start",
+)
+WAVELENGTH_DATA_COMMAND = "Get_Logging_Data"
+WAVELENGTH_STOP_COMMAND = "Sweep_Stop"
+# endregion
+
+
+@dataclass(frozen=True)
+class Recipe:
+    """
+    Measurement recipe of one DUT.
+
+    Parameters
+        start_wavelength, stop_wavelength, step_wavelength: Sweep range in nm.
+        scan_speed: Sweep speed in nm/s.
+        sweeps: Sweeps per DUT, e.g. polarization states.
+        channels: Power meter channels fetched per sweep.
+        references: Reference sweeps per lot of DUTs.
+        lot_size: DUTs measured between the reference sweeps.
+        averaging_time: MPM averaging time per point in seconds. Slows
+                        the sweep down when longer than the point interval.
+    """
+
+    start_wavelength: float = 1500.0
+    stop_wavelength: float = 1600.0
+    step_wavelength: float = 0.01
+    scan_speed: float = 50.0
+    sweeps: int = 1
+    channels: int = 4
+    references: int = 0
+    lot_size: int = 100
+    averaging_time: float | None = None
+
+    def __post_init__(self):
+        if self.stop_wavelength <= self.start_wavelength:
+            raise ValueError("Stop wavelength must be greater than start wavelength.")
+        if self.step_wavelength <= 0 or self.scan_speed <= 0:
+            raise ValueError("Step wavelength and scan speed must be positive.")
+        if self.sweeps < 1 or self.channels < 1 or self.lot_size < 1:
+            raise ValueError("Sweeps, channels and lot size must be at least 1.")
+
+    @property
+    def data_points(self) -> int:
+        """Return the number of logging data points per sweep."""
+        return data_point_count(
+            self.start_wavelength, self.stop_wavelength, self.step_wavelength
+        )
+
+    @property
+    def sweep_time(self) -> float:
+        """Return the duration of one sweep in seconds."""
+        sweep_time = (self.stop_wavelength - self.start_wavelength) / self.scan_speed
+        if self.averaging_time is not None:
+            sweep_time = max(sweep_time, self.data_points * self.averaging_time)
+        return sweep_time
+
+
+@dataclass(frozen=True)
+class StationConfig:
+    """
+    Station hardware and software model.
+
+    Parameters
+        rigs: Number of TSL and MPM rigs.
+        shared_bus: True if all rigs share one GPIB bus.
+        host_cores: Host CPU cores processing sweep data.
+        pipelined: True to process the sweep data while the next sweep
+                   runs, False to process it before the next sweep.
+        configure_every_dut: True to configure the TSL and MPM per DUT,
+                             False to configure them once per rig.
+        handling_time: DUT load and unload time in seconds.
+        sweep_return_time: TSL return to the start wavelength in seconds.
+        poll_interval: MPM logging status poll interval in seconds.
+        bus_bytes_per_second: Data transfer rate of the bus. None if the
+                              measured fetch latencies include the transfer.
+        bytes_per_point: Bytes per transferred power value.
+        host_seconds_per_sample: Host processing time per point and channel.
+        host_seconds_per_sweep: Fixed host processing time per sweep.
+    """
+
+    rigs: int = 1
+    shared_bus: bool = True
+    host_cores: int = 1
+    pipelined: bool = False
+    configure_every_dut: bool = True
+    handling_time: float = 10.0
+    sweep_return_time: float = 0.5
+    poll_interval: float = 0.2
+    bus_bytes_per_second: float | None = 1e6
+    bytes_per_point: int = 4
+    host_seconds_per_sample: float = 2e-7
+    host_seconds_per_sweep: float = 0.05
+
+    def __post_init__(self):
+        if self.rigs < 1 or self.host_cores < 1:
+            raise ValueError("Rigs and host cores must be at least 1.")
+        if self.poll_interval <= 0:
+            raise ValueError("Poll interval must be a positive value.")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A recipe on a station with command latencies."""
+
+    recipe: Recipe = field(default_factory=Recipe)
+    config: StationConfig = field(default_factory=StationConfig)
+    latency: LatencyModel = field(default_factory=LatencyModel)
+
+    def what_if(self, **changes) -> "Scenario":
+        """
+        Return a copy with changed recipe or station fields.
+
+        Example: ``scenario.what_if(pipelined=True, averaging_time=1e-5)``
+        """
+        recipe_fields = {f.name for f in dataclasses.fields(Recipe)}
+        config_fields = {f.name for f in dataclasses.fields(StationConfig)}
+        unknown = set(changes) - recipe_fields - config_fields - {"latency"}
+        if unknown:
+            raise ValueError(f"Unknown scenario fields: {', '.join(sorted(unknown))}")
+
+        return Scenario(
+            recipe=dataclasses.replace(
+                self.recipe,
+                **{k: v for k, v in changes.items() if k in recipe_fields},
+            ),
+            config=dataclasses.replace(
+                self.config,
+                **{k: v for k, v in changes.items() if k in config_fields},
+            ),
+            latency=changes.get("latency", self.latency),
+        )
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    """Predicted throughput of a scenario."""
+
+    duration: float
+    duts: int
+    duts_per_hour: float
+    utilization: dict[str, float]
+
+    @property
+    def bottleneck(self) -> str:
+        """Return the resource with the highest utilization."""
+        return max(self.utilization, key=self.utilization.get)
+
+
+class _StationModel:
+    """Processes and resources of a simulated station."""
+
+    def __init__(self, scenario: Scenario, seed: int | None):
+        self.recipe = scenario.recipe
+        self.config = scenario.config
+        self.latency = scenario.latency
+        self.rng = np.random.default_rng(seed)
+        self.simulation = Simulation()
+        self.duts = 0
+        self.counting = False
+
+        simulation = self.simulation
+        self.host = Resource(simulation, "host CPU", self.config.host_cores)
+        shared_bus = (
+            Resource(simulation, "GPIB bus") if self.config.shared_bus else None
+        )
+        self.rigs = [
+            (
+                Resource(simulation, f"rig {index} DUT handling"),
+                Resource(simulation, f"rig {index} instruments"),
+                shared_bus or Resource(simulation, f"rig {index} GPIB bus"),
+            )
+            for index in range(1, self.config.rigs + 1)
+        ]
+
+    def resources(self) -> list[Resource]:
+        resources = {self.host.name: self.host}
+        for rig_resources in self.rigs:
+            for resource in rig_resources:
+                resources[resource.name] = resource
+        return list(resources.values())
+
+    def _command(self, bus: Resource, function_name: str, data_bytes: int = 0):
+        duration = self.latency.sample(function_name, self.rng)
+        if data_bytes and self.config.bus_bytes_per_second:
+            duration += data_bytes / self.config.bus_bytes_per_second
+        yield from bus.hold(duration)
+
+    def _commands(self, bus: Resource, function_names: tuple[str, ...]):
+        for function_name in function_names:
+            yield from self._command(bus, function_name)
+
+    def _configure(self, bus: Resource, fetch_wavelength: bool) -> Generator:
+        yield from self._commands(bus, TSL_CONFIGURE_COMMANDS)
+        yield from self._commands(bus, MPM_CONFIGURE_COMMANDS)
+        if fetch_wavelength:
+            # The wavelength data only changes with the recipe
+            yield from self._commands(bus, WAVELENGTH_FETCH_COMMANDS)
+            yield from self._command(
+                bus, WAVELENGTH_DATA_COMMAND, self.recipe.data_points * 8
+            )
+            yield from self._command(bus, WAVELENGTH_STOP_COMMAND)
+
+    def _scan(self, bus: Resource) -> Generator:
+        yield from self._commands(bus, ARM_COMMANDS)
+        yield from self._command(bus, TRIGGER_COMMAND)
+        end_time = self.simulation.now + self.recipe.sweep_time
+        yield from self._command(bus, POLL_COMMAND)
+        while self.simulation.now < end_time:
+            yield Timeout(self.config.poll_interval)
+            yield from self._command(bus, POLL_COMMAND)
+
+    def _fetch(self, bus: Resource) -> Generator:
+        yield from self._command(bus, FETCH_POINTS_COMMAND)
+        for _ in range(self.recipe.channels):
+            yield from self._command(
+                bus,
+                FETCH_CHANNEL_COMMAND,
+                self.recipe.data_points * self.config.bytes_per_point,
+            )
+
+    def _process(self, completes_dut: bool) -> Generator:
+        yield from self.host.hold(
+            self.config.host_seconds_per_sweep
+            + self.config.host_seconds_per_sample
+            * self.recipe.data_points
+            * self.recipe.channels
+        )
+        if completes_dut and self.counting:
+            self.duts += 1
+
+    def _sweeps(
+        self, instruments: Resource, bus: Resource, state: dict, sweeps: list[bool]
+    ) -> Generator:
+        for index, completes_dut in enumerate(sweeps):
+            yield instruments.request()
+            if index == 0 and (
+                self.config.configure_every_dut or not state["configured"]
+            ):
+                yield from self._configure(
+                    bus, fetch_wavelength=not state["configured"]
+                )
+                state["configured"] = True
+            if self.simulation.now < state["ready_time"]:
+                yield Timeout(state["ready_time"] - self.simulation.now)
+            yield from self._scan(bus)
+            state["ready_time"] = self.simulation.now + self.config.sweep_return_time
+            yield from self._fetch(bus)
+            instruments.release()
+
+            if self.config.pipelined:
+                self.simulation.process(self._process(completes_dut))
+            else:
+                yield from self._process(completes_dut)
+
+    def rig(
+        self, handling: Resource, instruments: Resource, bus: Resource
+    ) -> Generator:
+        """Process measuring DUTs on one rig."""
+        state = {"configured": False, "ready_time": 0.0}
+        dut_sweeps = [False] * (self.recipe.sweeps - 1) + [True]
+        dut = 0
+        while True:
+            if self.recipe.references and dut % self.recipe.lot_size == 0:
+                yield from self._sweeps(
+                    instruments, bus, state, [False] * self.recipe.references
+                )
+            yield from handling.hold(self.config.handling_time)
+            yield from self._sweeps(instruments, bus, state, dut_sweeps)
+            dut += 1
+
+
+def simulate(
+    scenario: Scenario,
+    duration: float = 8 * 3600.0,
+    warmup: float = 600.0,
+    seed: int | None = 0,
+) -> SimulationResult:
+    """
+    Simulate a station.
+
+    :param scenario: The recipe, station and command latencies.
+    :param duration: Simulated time in seconds after the warmup.
+    :param warmup: Simulated time in seconds before DUTs are counted.
+    :param seed: Random seed of the latency sampling.
+
+    :return: The predicted DUTs per hour and resource utilization.
+    """
+    model = _StationModel(scenario, seed)
+    for rig_resources in model.rigs:
+        model.simulation.process(model.rig(*rig_resources))
+
+    model.simulation.run(warmup)
+    model.counting = True
+    model.simulation.run(warmup + duration)
+
+    result = SimulationResult(
+        duration=duration,
+        duts=model.duts,
+        duts_per_hour=model.duts * 3600.0 / duration,
+        utilization={
+            resource.name: resource.utilization() for resource in model.resources()
+        },
+    )
+    get_logger("StationSimulation").debug(
+        "Simulated %s DUTs/hour. Bottleneck: %s.",
+        result.duts_per_hour,
+        result.bottleneck,
+    )
+    return result
+
+
+def compare(scenarios: dict[str, Scenario], **kwargs) -> dict[str, SimulationResult]:
+    """
+    Simulate several scenarios with the same settings.
+
+    :param scenarios: The scenarios by name. The first one is the baseline.
+    :param kwargs: The ``simulate`` settings.
+
+    :return: The results by scenario name.
+    """
+    return {name: simulate(scenario, **kwargs) for name, scenario in scenarios.items()}
+
+
+def format_comparison(results: dict[str, SimulationResult]) -> str:
+    """Return the results as a table relative to the first (baseline) result."""
+    baseline = next(iter(results.values()))
+    lines = [f"{'scenario':<28}{'DUTs/h':>10}{'change':>10}  bottleneck"]
+    for name, result in results.items():
+        change = (
+            result.duts_per_hour / baseline.duts_per_hour - 1
+            if baseline.duts_per_hour
+            else 0.0
+        )
+        bottleneck = result.bottleneck
+        lines.append(
+            f"{name:<28}{result.duts_per_hour:>10.1f}{change:>+10.1%}  "
+            f"{bottleneck} ({result.utilization[bottleneck]:.0%})"
+        )
+    return "\n".join(lines)
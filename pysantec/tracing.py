@@ -0,0 +1,175 @@
+"""
+PySantec tracing module.
+
+Opt-in timeline tracing of measurement phases and instrument DLL calls.
+Spans are recorded into an in-memory ring buffer and exported as Chrome
+Trace Event JSON, which can be opened in Perfetto (https://ui.perfetto.dev)
+or chrome://tracing.
+
+Tracing is disabled by default and costs a single global lookup per span
+until ``enable_tracing()`` is called.
+"""
+
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+# Default ring buffer capacity in spans
+TRACE_CAPACITY = 100_000
+
+# Active tracer, None while tracing is disabled
+_tracer = None
+
+
+class _Span:
+    """Context manager recording one span into a tracer."""
+
+    __slots__ = ("_tracer", "_name", "_category", "_args", "_start")
+
+    def __init__(self, tracer, name: str, category: str, args: dict):
+        self._tracer = tracer
+        self._name = name
+        self._category = category
+        self._args = args
+        self._start = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self._args["error"] = exc_type.__name__
+        self._tracer.record(self._name, self._category, self._start, end, self._args)
+
+
+class _NullSpan:
+    """Context manager doing nothing, used while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Records nested spans with thread IDs and monotonic timestamps."""
+
+    def __init__(self, capacity: int = TRACE_CAPACITY):
+        """
+        :param capacity: The maximum number of spans kept. The oldest
+                         spans are dropped once the buffer is full.
+        """
+        self.capacity = capacity
+        self._events = collections.deque(maxlen=capacity)
+        self._thread_names = {}
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def span(self, name: str, category: str = "pysantec", **args) -> _Span:
+        """Return a context manager recording a span."""
+        return _Span(self, name, category, args)
+
+    def record(self, name: str, category: str, start_ns: int, end_ns: int, args: dict):
+        """Record a completed span. Timestamps are perf_counter_ns values."""
+        thread_id = threading.get_ident()
+        if thread_id not in self._thread_names:
+            self._thread_names[thread_id] = threading.current_thread().name
+        self._events.append((name, category, start_ns, end_ns, thread_id, args))
+
+    def clear(self):
+        """Remove all recorded spans."""
+        self._events.clear()
+
+    def to_chrome_trace(self) -> dict:
+        """Return the recorded spans in Chrome Trace Event format."""
+        trace_events = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self._pid,
+                "tid": thread_id,
+                "args": {"name": thread_name},
+            }
+            for thread_id, thread_name in list(self._thread_names.items())
+        ]
+        for name, category, start_ns, end_ns, thread_id, args in list(self._events):
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start_ns - self._origin) / 1000,
+                "dur": (end_ns - start_ns) / 1000,
+                "pid": self._pid,
+                "tid": thread_id,
+            }
+            if args:
+                event["args"] = {key: str(value) for key, value in args.items()}
+            trace_events.append(event)
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str | os.PathLike):
+        """Write the recorded spans to a Chrome Trace Event JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+def enable_tracing(capacity: int = TRACE_CAPACITY) -> Tracer:
+    """Start recording spans into a new tracer and return it."""
+    global _tracer
+
+    _tracer = Tracer(capacity)
+    return _tracer
+
+
+def disable_tracing() -> Tracer | None:
+    """Stop recording spans and return the tracer, if any."""
+    global _tracer
+
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def get_tracer() -> Tracer | None:
+    """Return the active tracer, or None if tracing is disabled."""
+    return _tracer
+
+
+def span(name: str, category: str = "pysantec", **args):
+    """Return a context manager recording a span if tracing is enabled."""
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, name, category, args)
+
+
+def traced(name: str | None = None, category: str = "pysantec"):
+    """Decorator recording each call of a function as a span."""
+
+    def decorator(function):
+        span_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return function(*args, **kwargs)
+            with _Span(tracer, span_name, category, {}):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,67 @@
+# pysantec/tests/archive/test_parquet_export.py
+
+"""
+Arrow / Parquet export tests.
+"""
+
+import numpy as np
+import pytest
+from pysantec.archive import SweepParquetWriter, sweep_record_batch
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+DATA_POINTS = 1001
+CHANNELS = [(1, 1), (1, 2), (1, 3), (1, 4)]
+METADATA = {"dut_id": "DUT-0001", "recipe": "IL-C-band", "mpm_serial": "MPM001"}
+
+
+def make_sweep():
+    """Create a sweep of (points x channels) power data."""
+    wavelength = np.linspace(1500.0, 1600.0, DATA_POINTS)
+    power = -20.0 - np.arange(len(CHANNELS)) + 0.01 * wavelength[:, None]
+    return wavelength, power
+
+
+def test_sweep_record_batch():
+    """A sweep is converted to one row per channel data point."""
+    wavelength, power = make_sweep()
+    batch = sweep_record_batch(wavelength, power, CHANNELS, METADATA, float32=True)
+
+    assert batch.num_rows == DATA_POINTS * len(CHANNELS)
+    assert batch.schema.field("power").type == "float"
+    assert batch.column("dut_id").dictionary.to_pylist() == ["DUT-0001"]
+    channel = batch.column("channel").to_numpy()
+    np.testing.assert_allclose(
+        batch.column("power").to_numpy()[channel == 3], power[:, 2], rtol=1e-6
+    )
+
+
+def test_module_data_list_of_lists():
+    """MPM module data lists are accepted in either orientation."""
+    wavelength, power = make_sweep()
+    module_data = power.T.tolist()
+    batch = sweep_record_batch(wavelength, module_data, CHANNELS)
+    np.testing.assert_array_equal(
+        batch.column("wavelength").to_numpy()[:DATA_POINTS], wavelength
+    )
+
+
+def test_parquet_row_groups(tmp_path):
+    """Sweeps are streamed to the Parquet file in row groups."""
+    path = tmp_path / "sweeps.parquet"
+    wavelength, power = make_sweep()
+    rows_per_sweep = DATA_POINTS * len(CHANNELS)
+
+    with SweepParquetWriter(path, row_group_size=2 * rows_per_sweep) as writer:
+        for _ in range(5):
+            writer.write_sweep(wavelength, power, CHANNELS, METADATA)
+
+    parquet_file = pq.ParquetFile(path)
+    assert parquet_file.metadata.num_rows == 5 * rows_per_sweep
+    assert parquet_file.metadata.num_row_groups == 3
+
+    table = parquet_file.read(columns=["dut_id", "power"])
+    assert table.column("dut_id").type.value_type == "string"
+    np.testing.assert_array_equal(
+        table.column("power").to_numpy()[:DATA_POINTS], power[:, 0]
+    )
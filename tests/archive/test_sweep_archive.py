@@ -0,0 +1,107 @@
+# pysantec/tests/archive/test_sweep_archive.py
+
+"""
+Sweep archive tests.
+"""
+
+import threading
+
+import numpy as np
+import pytest
+from pysantec.archive import SweepArchive, recipe_hash
+
+DATA_POINTS = 1001
+CHANNELS = 8
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """Fixture to create an empty sweep archive."""
+    return SweepArchive(tmp_path / "archive")
+
+
+def make_sweep(seed: int):
+    """Create a sweep of random power data."""
+    rng = np.random.default_rng(seed)
+    wavelength = np.linspace(1500.0, 1600.0, DATA_POINTS)
+    power = rng.normal(-20.0, 1.0, size=(DATA_POINTS, CHANNELS))
+    monitor = rng.normal(1.0, 0.01, size=DATA_POINTS)
+    return wavelength, power, monitor
+
+
+def test_append_and_read(archive):
+    """Archived sweeps are read back unchanged."""
+    wavelength, power, monitor = make_sweep(0)
+    recipe = {"start": 1500.0, "stop": 1600.0, "step": 0.1}
+    index = archive.append(
+        wavelength,
+        power,
+        "DUT-0001",
+        monitor=monitor,
+        recipe=recipe,
+        tsl_serial="TSL001",
+        mpm_serial="MPM001",
+    )
+
+    sweep = archive.read(index)
+    assert len(archive) == 1
+    assert sweep.dut_id == "DUT-0001"
+    assert sweep.recipe_hash == recipe_hash(recipe)
+    assert sweep.tsl_serial == "TSL001"
+    assert isinstance(sweep.power, np.memmap)
+    np.testing.assert_array_equal(sweep.wavelength, wavelength)
+    np.testing.assert_array_equal(sweep.power, power.T)
+    np.testing.assert_array_equal(sweep.monitor, monitor)
+
+
+def test_read_channel_slice(archive):
+    """A slice of channels is memory mapped without the other channels."""
+    for seed in range(3):
+        wavelength, power, _ = make_sweep(seed)
+        archive.append(wavelength, power, f"DUT-{seed}")
+
+    _, power, _ = make_sweep(1)
+    sweep = archive.read(1, channels=slice(2, 5))
+    assert sweep.monitor is None
+    assert sweep.power.shape == (3, DATA_POINTS)
+    np.testing.assert_array_equal(sweep.power, power.T[2:5])
+    np.testing.assert_array_equal(archive.find("DUT-2"), [2])
+
+
+def test_reopen_archive(archive):
+    """Sweeps persist when the archive is reopened."""
+    wavelength, power, _ = make_sweep(0)
+    archive.append(wavelength, power, "DUT-0001")
+
+    reopened = SweepArchive(archive.path)
+    assert len(reopened) == 1
+    np.testing.assert_array_equal(reopened.read(0).power, power.T)
+
+
+def test_concurrent_appends(archive):
+    """Concurrent appends do not interleave sweep data."""
+
+    def append_sweeps(worker: int):
+        writer = SweepArchive(archive.path)
+        for seed in range(5):
+            wavelength, power, _ = make_sweep(worker * 10 + seed)
+            writer.append(wavelength, power, f"DUT-{worker * 10 + seed}")
+
+    threads = [threading.Thread(target=append_sweeps, args=(w,)) for w in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(archive) == 20
+    for index in range(len(archive)):
+        sweep = archive.read(index)
+        _, power, _ = make_sweep(int(sweep.dut_id.split("-")[1]))
+        np.testing.assert_array_equal(sweep.power, power.T)
+
+
+def test_invalid_dut_id(archive):
+    """DUT identifiers longer than the index field are rejected."""
+    wavelength, power, _ = make_sweep(0)
+    with pytest.raises(ValueError):
+        archive.append(wavelength, power, "D" * 33)
@@ -0,0 +1,247 @@
+# pysantec/tests/broker/test_broker.py
+
+"""
+Instrument broker tests with an in-process broker and fake instruments.
+"""
+
+import os
+import socket
+import threading
+import time
+from multiprocessing import AuthenticationError
+
+import numpy as np
+import pytest
+from pysantec.broker import (
+    DEFAULT_ADDRESS,
+    BrokerClient,
+    InstrumentBroker,
+    InstrumentService,
+    RemoteError,
+)
+from pysantec.broker.server import key_path
+from pysantec.broker.shared_arrays import SharedArray, export_arrays, free_blocks
+
+RESOURCE = "GPIB0::10::INSTR"
+
+
+class FakeTSL:
+    """Instrument stand-in with a status, properties and array results."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.log = []
+        self._local = threading.local()
+
+    @property
+    def status(self):
+        return getattr(self._local, "status", "Unknown")
+
+    @property
+    def idn(self):
+        return "SANTEC,TSL-570"
+
+    def set_wavelength(self, value):
+        self.log.append(value)
+        self._local.status = "Succeed" if value > 0 else "ParameterError"
+
+    def get_logging_data(self, points):
+        return np.arange(points, dtype=np.float64)
+
+    def get_logging_data_list(self, points):
+        return [float(i) for i in range(points)]
+
+    def wait(self):
+        return self.release.wait(5.0)
+
+    def fail(self):
+        raise ValueError("Invalid wavelength.")
+
+    def _private(self):
+        return "secret"
+
+
+class FakeManager:
+    def __init__(self):
+        self.connected_instruments = {}
+        self.connects = 0
+
+    def list_resources(self):
+        return [RESOURCE]
+
+    def connect_tsl(self, resource_name):
+        self.connects += 1
+        self.connected_instruments[resource_name] = FakeTSL()
+        return self.connected_instruments[resource_name]
+
+    def disconnect(self, resource_name):
+        del self.connected_instruments[resource_name]
+
+    def disconnect_all(self):
+        self.connected_instruments.clear()
+
+
+@pytest.fixture
+def broker():
+    address = f"{DEFAULT_ADDRESS}-test-{os.getpid()}"
+    service = InstrumentService(FakeManager())
+    with InstrumentBroker(address, service=service) as broker:
+        yield broker
+
+
+def client_of(broker):
+    return BrokerClient(broker.address)
+
+
+def wait_until(condition):
+    deadline = time.monotonic() + 5.0
+    while not condition() and time.monotonic() < deadline:
+        threading.Event().wait(0.005)
+    return condition()
+
+
+def test_clients_share_one_connection(broker):
+    """Two clients use the broker's single instrument connection."""
+    with client_of(broker) as first, client_of(broker) as second:
+        assert first.list_resources() == [RESOURCE]
+        tsl_1 = first.connect_tsl(RESOURCE)
+        tsl_2 = second.connect_tsl(RESOURCE)
+
+        tsl_1.set_wavelength(1550.0)
+        tsl_2.set_wavelength(-1.0)
+        assert tsl_1.status == "Succeed"
+        assert tsl_2.status == "ParameterError"
+        assert tsl_1.idn == "SANTEC,TSL-570"
+        assert broker.service.manager.connects == 1
+        assert broker.service.manager.connected_instruments[RESOURCE].log == [
+            1550.0,
+            -1.0,
+        ]
+
+    # Disconnected when the last client closed
+    assert wait_until(lambda: not broker.service.manager.connected_instruments)
+
+
+@pytest.mark.parametrize("points", [10, 100_000])
+def test_arrays_are_returned(broker, points):
+    """Small arrays are sent inline, large ones through shared memory."""
+    with client_of(broker) as client:
+        tsl = client.connect_tsl(RESOURCE)
+        data = tsl.get_logging_data(points)
+        np.testing.assert_array_equal(data, np.arange(points))
+        assert tsl.get_logging_data_list(points) == list(range(points))
+
+
+def test_float_lists_are_shared():
+    """Large float lists, e.g. logging data lists, go through shared memory."""
+    blocks = []
+    data = [float(i) for i in range(100_000)]
+    exported = export_arrays((data, [1.0, 2.0], ["a"] * 100_000), blocks)
+    try:
+        assert isinstance(exported[0], SharedArray) and exported[0].is_list
+        assert exported[1:] == ([1.0, 2.0], ["a"] * 100_000)
+        assert len(blocks) == 1
+    finally:
+        free_blocks(blocks)
+
+
+def test_broker_key(broker):
+    """Clients need the generated key, which is removed with the broker."""
+    path = key_path(broker.address)
+    if os.name == "posix":
+        assert os.stat(path).st_mode & 0o777 == 0o600
+    with pytest.raises(AuthenticationError):
+        BrokerClient(broker.address, authkey=b"pysantec")
+    broker.close()
+    assert not os.path.exists(path)
+
+
+def test_broker_refused_on_live_address(broker):
+    """A second broker leaves the socket and key of a running broker alone."""
+    path = key_path(broker.address)
+    with open(path, "rb") as f:
+        key = f.read()
+    with pytest.raises(RuntimeError, match="already running"):
+        InstrumentBroker(broker.address, service=InstrumentService(FakeManager()))
+    with open(path, "rb") as f:
+        assert f.read() == key
+    with client_of(broker) as client:
+        assert client.list_resources() == [RESOURCE]
+    broker.close()
+    assert not os.path.exists(path)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Unix domain sockets")
+def test_broker_replaces_stale_socket():
+    """A socket file left by a broker which did not exit cleanly is reused."""
+    address = f"{DEFAULT_ADDRESS}-stale-{os.getpid()}"
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(address)
+    stale.close()
+    service = InstrumentService(FakeManager())
+    with InstrumentBroker(address, service=service) as broker:
+        with client_of(broker) as client:
+            assert client.list_resources() == [RESOURCE]
+
+
+def test_requests_are_multiplexed(broker):
+    """A long call does not block the other requests of the client."""
+    with client_of(broker) as client:
+        tsl = client.connect_tsl(RESOURCE)
+        waiting = client.submit("call", tsl.handle, "wait", (), {})
+        assert tsl.idn == "SANTEC,TSL-570"
+        assert not waiting.done()
+        broker.service.manager.connected_instruments[RESOURCE].release.set()
+        assert waiting.result(5.0)[0] is True
+
+
+def test_errors(broker):
+    with client_of(broker) as client:
+        tsl = client.connect_tsl(RESOURCE)
+        with pytest.raises(ValueError, match="Invalid wavelength"):
+            tsl.fail()
+        with pytest.raises(AttributeError):
+            tsl._private()
+        with pytest.raises(PermissionError):
+            client.request("call", tsl.handle, "_private", (), {})
+        with pytest.raises(ValueError):
+            client.request("connect", "osa", RESOURCE)
+        with pytest.raises(RemoteError, match="AttributeError"):
+            client.request("get", tsl.handle, "power")
+
+
+def test_reservation_blocks_other_clients(broker):
+    """Calls of other clients wait while a client reserves an instrument."""
+    with client_of(broker) as first, client_of(broker) as second:
+        tsl_1 = first.connect_tsl(RESOURCE)
+        tsl_2 = second.connect_tsl(RESOURCE)
+        log = broker.service.manager.connected_instruments[RESOURCE].log
+
+        with tsl_1.reserved():
+            tsl_1.set_wavelength(1.0)
+            other = second.submit("call", tsl_2.handle, "set_wavelength", (2.0,), {})
+            threading.Event().wait(0.05)
+            tsl_1.set_wavelength(3.0)
+            assert not other.done()
+        other.result(5.0)
+
+        assert log == [1.0, 3.0, 2.0]
+
+
+def test_reservation_waits_for_running_calls(broker):
+    """A client cannot reserve an instrument during a call of another client."""
+    with client_of(broker) as first, client_of(broker) as second:
+        tsl_1 = first.connect_tsl(RESOURCE)
+        tsl_2 = second.connect_tsl(RESOURCE)
+        fake = broker.service.manager.connected_instruments[RESOURCE]
+
+        waiting = second.submit("call", tsl_2.handle, "wait", (), {})
+        assert wait_until(lambda: broker.service._active)
+        reserve = first.submit("reserve", tsl_1.handle, 5.0)
+        threading.Event().wait(0.05)
+        assert not reserve.done()
+
+        fake.release.set()
+        waiting.result(5.0)
+        reserve.result(5.0)
+        first.request("unreserve", tsl_1.handle)
@@ -0,0 +1,99 @@
+# pysantec/tests/instruments/test_adaptive_timeout.py
+
+"""
+Adaptive I/O time out tests.
+"""
+
+import pytest
+from pysantec.instruments.adaptive_timeout import AdaptiveTimeouts
+from pysantec.instruments.base_instrument import BaseInstrument
+from pysantec.instruments.command_scheduler import CommandPriority
+
+QUERY = CommandPriority.QUERY
+
+
+def observe(timeouts, latency, count=32, function_name="Get_Value"):
+    for _ in range(count):
+        timeouts.observe(function_name, QUERY, latency)
+
+
+def test_default_until_learned():
+    timeouts = AdaptiveTimeouts(default=5.0, ceiling=60.0)
+    assert timeouts.timeout("Get_Value", QUERY) == 5.0
+    assert timeouts.timeout("Get_Logging_Data", CommandPriority.BULK) == 60.0
+    assert timeouts.timeout("Zeroing", CommandPriority.CONTROL) == 60.0
+
+    observe(timeouts, 0.2, count=31)
+    assert timeouts.timeout("Get_Value", QUERY) == 5.0
+
+
+@pytest.mark.parametrize(
+    "latency, expected",
+    [(0.001, 0.5), (0.2, 0.6), (100.0, 60.0)],
+)
+def test_learned_timeout_is_clamped(latency, expected):
+    """The time out is the p99 latency times the margin, within the limits."""
+    timeouts = AdaptiveTimeouts(margin=3.0, floor=0.5, ceiling=60.0)
+    observe(timeouts, latency)
+    assert timeouts.timeout("Get_Value", QUERY) == pytest.approx(expected)
+    assert timeouts.stats()["QUERY"]["count"] == 32
+
+
+def test_bulk_transfers_keep_the_ceiling():
+    """Small logging data transfers do not shorten the time out of large ones."""
+    timeouts = AdaptiveTimeouts(ceiling=60.0)
+    for _ in range(64):
+        timeouts.observe("Get_Each_Chan_Loggdata", CommandPriority.BULK, 0.01)
+
+    assert timeouts.timeout("Get_Each_Chan_Loggdata", CommandPriority.BULK) == 60.0
+    assert timeouts.stats()["BULK"]["count"] == 0
+
+
+def test_override():
+    timeouts = AdaptiveTimeouts()
+    timeouts.set_override("Get_Each_Channel_Logdata", 30.0)
+    observe(timeouts, 100.0, function_name="Get_Each_Channel_Logdata")
+    assert timeouts.timeout("Get_Each_Channel_Logdata", QUERY) == 30.0
+    assert timeouts.stats()["QUERY"]["count"] == 0
+
+    timeouts.clear_override("Get_Each_Channel_Logdata")
+    assert timeouts.timeout("Get_Each_Channel_Logdata", QUERY) == 5.0
+    with pytest.raises(ValueError):
+        timeouts.set_override("Get_Value", 0.0)
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        AdaptiveTimeouts(floor=10.0, default=5.0)
+    with pytest.raises(ValueError):
+        AdaptiveTimeouts(margin=0.5)
+
+
+class DeviceStub:
+    """DLL object stub recording the I/O time outs set."""
+
+    def __init__(self):
+        self.timeouts = []
+
+    def __setattr__(self, name, value):
+        if name == "TimeOut":
+            self.timeouts.append(value)
+        object.__setattr__(self, name, value)
+
+    def Get_Value(self, value):
+        return 0, 1.0
+
+    def Zeroing(self):
+        return 0
+
+
+def test_instrument_applies_timeouts():
+    """The DLL time out is set when it changes only."""
+    instrument = BaseInstrument()
+    instrument._instrument = DeviceStub()
+    instrument.timeouts = AdaptiveTimeouts(min_samples=4, window=4)
+    for _ in range(5):
+        instrument._get_function("Get_Value", float)
+    instrument._set_function("Zeroing")
+
+    assert instrument._instrument.timeouts == [5000, 500, 60000]
@@ -0,0 +1,255 @@
+# pysantec/tests/instruments/test_base_instrument.py
+
+"""
+Base instrument thread safety tests.
+"""
+
+import threading
+import time
+
+from pysantec.instruments.base_instrument import BaseInstrument
+from pysantec.instruments.wrapper import InstrumentExceptionCode
+
+THREADS = 4
+CALLS = 50
+
+
+class DeviceStub:
+    """DLL object stub detecting overlapping calls."""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+        self.release = threading.Event()
+        self.log = []
+        self._counter_lock = threading.Lock()
+
+    def Get_Value(self, value):
+        with self._counter_lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.0005)
+        with self._counter_lock:
+            self.active -= 1
+        return 0, threading.get_ident()
+
+    def Get_Slow_Value(self, value):
+        with self._counter_lock:
+            self.calls += 1
+        self.release.wait(5.0)
+        return 0, 42
+
+    def Get_Slow_Invalid_Value(self, value):
+        with self._counter_lock:
+            self.calls += 1
+        self.release.wait(5.0)
+        raise TypeError("No method matches the given arguments.")
+
+    def Sweep_Stop(self):
+        self.log.append("abort")
+        return 0
+
+    def Set_Value(self, value):
+        self.log.append("control")
+        return 0
+
+    def Get_Status(self, value):
+        self.log.append("query")
+        return 0, 0
+
+    def Get_Each_Module_Loggdata(self, module, data):
+        self.log.append("bulk")
+        return 0, None
+
+    def Set_Error(self, error_code):
+        time.sleep(0.0005)
+        return error_code
+
+
+def make_instrument():
+    instrument = BaseInstrument()
+    instrument._instrument = DeviceStub()
+    return instrument
+
+
+def run_threads(target):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_calls_are_serialized_per_device():
+    """DLL calls of several threads never overlap on one device."""
+    instrument = make_instrument()
+    results = []
+
+    def worker(_):
+        for _ in range(CALLS):
+            results.append(instrument._get_function("Get_Value", int))
+
+    run_threads(worker)
+    assert instrument._instrument.max_active == 1
+    assert len(results) == THREADS * CALLS
+
+
+def test_status_is_tracked_per_thread():
+    """Each thread sees the status of its own last call."""
+    instrument = make_instrument()
+    error_codes = [0, -1, -2, -5]
+    errors = []
+
+    def worker(index):
+        for _ in range(CALLS // 5):
+            instrument._set_function("Set_Error", error_codes[index])
+            expected = InstrumentExceptionCode(error_codes[index]).name
+            if instrument.status != expected:
+                errors.append((instrument.status, expected))
+
+    run_threads(worker)
+    assert not errors
+
+
+def test_lock_makes_command_sequences_atomic():
+    """Calls of other threads wait while a thread holds the device lock."""
+    instrument = make_instrument()
+    sequence = []
+
+    def other_thread():
+        instrument._get_function("Get_Value", int)
+        sequence.append("other")
+
+    with instrument.lock:
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        instrument._get_function("Get_Value", int)
+        time.sleep(0.01)
+        instrument._get_function("Get_Value", int)
+        sequence.append("locked")
+    thread.join()
+
+    assert sequence == ["locked", "other"]
+
+
+def test_concurrent_identical_getters_share_one_call():
+    """Identical getters in flight at the same time make one DLL call."""
+    instrument = make_instrument()
+    results = []
+
+    def worker(_):
+        results.append(instrument._get_function("Get_Slow_Value", int))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    # Complete the DLL call once all other threads joined it
+    deadline = time.monotonic() + 5.0
+    while instrument.coalesced_calls < THREADS - 1 and time.monotonic() < deadline:
+        threading.Event().wait(0.001)
+    instrument._instrument.release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [42] * THREADS
+    assert instrument._instrument.calls == 1
+    assert instrument.coalesced_calls == THREADS - 1
+
+
+def test_single_flight_errors_are_shared():
+    """A getter raising TypeError calls the device once, its followers get the error."""
+    instrument = make_instrument()
+    errors = []
+
+    def worker(_):
+        try:
+            instrument._get_function("Get_Slow_Invalid_Value", int)
+        except TypeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5.0
+    while instrument.coalesced_calls < THREADS - 1 and time.monotonic() < deadline:
+        threading.Event().wait(0.001)
+    instrument._instrument.release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == THREADS
+    assert instrument._instrument.calls == 1
+
+
+def test_single_flight_freshness_window():
+    """Completed results are reused within the freshness window only."""
+    instrument = make_instrument()
+    instrument._get_function("Get_Value", int)
+    instrument._get_function("Get_Value", int)
+    assert instrument._instrument.calls == 2
+
+    instrument.configure_single_flight(freshness=60.0)
+    instrument._get_function("Get_Value", int)
+    instrument._get_function("Get_Value", int)
+    assert instrument._instrument.calls == 3
+
+
+def test_single_flight_disabled():
+    instrument = make_instrument()
+    instrument.configure_single_flight(enabled=False)
+    instrument._instrument.release.set()
+
+    def worker(_):
+        instrument._get_function("Get_Slow_Value", int)
+
+    run_threads(worker)
+    assert instrument._instrument.calls == THREADS
+    assert instrument.coalesced_calls == 0
+
+
+def wait_for_queued(instrument, count):
+    """Wait until the given number of threads wait for the device."""
+    deadline = time.monotonic() + 5.0
+    while len(instrument.lock._waiting) < count and time.monotonic() < deadline:
+        threading.Event().wait(0.001)
+
+
+def test_waiting_commands_run_in_priority_order():
+    """Abort commands run first, bulk transfers last."""
+    instrument = make_instrument()
+    calls = [
+        lambda: instrument._get_response("Get_Each_Module_Loggdata", 0, None),
+        lambda: instrument._get_function("Get_Status", int),
+        lambda: instrument._set_function("Set_Value", 1),
+        lambda: instrument._set_function("Sweep_Stop"),
+    ]
+    threads = []
+    with instrument.lock:
+        for index, call in enumerate(calls, start=1):
+            threads.append(threading.Thread(target=call))
+            threads[-1].start()
+            wait_for_queued(instrument, index)
+    for thread in threads:
+        thread.join()
+
+    assert instrument._instrument.log == ["abort", "control", "query", "bulk"]
+
+
+def test_abort_preempts_command_sequence():
+    """A thread running a command sequence lets a waiting abort run first."""
+    instrument = make_instrument()
+    with instrument.lock:
+        instrument._set_function("Set_Value", 1)
+        thread = threading.Thread(target=lambda: instrument._set_function("Sweep_Stop"))
+        thread.start()
+        wait_for_queued(instrument, 1)
+        instrument._set_function("Set_Value", 2)
+        assert instrument.lock._is_owned()
+    thread.join()
+
+    assert instrument._instrument.log == ["control", "abort", "control"]
+    stats = instrument.command_latency_stats()
+    assert stats["ABORT"]["count"] == 1
+    assert stats["ABORT"]["max"] > 0
@@ -0,0 +1,195 @@
+# pysantec/tests/instruments/test_health_monitor.py
+
+"""
+Connection health monitor and reconnect tests.
+"""
+
+import threading
+import time
+
+import pytest
+from pysantec.instruments.base_instrument import BaseInstrument
+from pysantec.instruments.health_monitor import HealthMonitor
+from pysantec.instruments.instrument_manager import InstrumentManager
+from pysantec.instruments.retry import RetryPolicy
+from pysantec.instruments.wrapper import InstrumentExceptionCode
+from pysantec.instruments.wrapper.enumerations.connection_enums import Terminator
+
+RESOURCE = "TCPIP0::192.168.1.10::5000::SOCKET"
+NOT_CONNECTED = InstrumentExceptionCode.NotConnected.value
+
+
+class DeviceStub:
+    """DLL object stub losing its connection and settings on demand."""
+
+    def __init__(self):
+        self.connected = False
+        self.connects = 0
+        self.heartbeats = 0
+        self.settings = []
+
+    def drop(self):
+        self.connected = False
+        self.settings.clear()
+
+    def _status(self):
+        return 0 if self.connected else NOT_CONNECTED
+
+    def Connect(self, connection_type):
+        self.connected = True
+        self.connects += 1
+        return 0
+
+    def DisConnect(self):
+        self.connected = False
+        return 0
+
+    def Echo(self, command, response):
+        self.heartbeats += 1
+        return self._status(), "SANTEC"
+
+    def Set_Wavelength(self, value):
+        if self.connected:
+            self.settings.append(("Set_Wavelength", value))
+        return self._status()
+
+    def Set_Range_Each_Channel(self, module, channel, value):
+        if self.connected:
+            self.settings.append(("Set_Range_Each_Channel", module, channel, value))
+        return self._status()
+
+
+@pytest.fixture
+def manager():
+    manager = InstrumentManager()
+    manager._connect(make_instrument(), RESOURCE, Terminator.CR)
+    return manager
+
+
+def make_instrument(device=None):
+    instrument = BaseInstrument()
+    instrument._instrument = device or DeviceStub()
+    instrument.retry_policy = RetryPolicy(base_delay=0.0)
+    return instrument
+
+
+def get_device(manager):
+    return manager.connected_instruments[RESOURCE]._instrument
+
+
+def test_lost_connection_is_reconnected_with_settings(manager):
+    """A failed heartbeat reconnects and reapplies the last settings."""
+    instrument = manager.connected_instruments[RESOURCE]
+    instrument._set_function("Set_Wavelength", 1550.0)
+    instrument._set_function("Set_Range_Each_Channel", 1, 1, 3)
+    instrument._set_function("Set_Range_Each_Channel", 1, 2, 4)
+    instrument._set_function("Set_Wavelength", 1560.0)
+    device = get_device(manager)
+    device.drop()
+
+    monitor = HealthMonitor(manager, idle_time=0.0)
+    assert monitor.check() == [RESOURCE]
+
+    assert device.connects == 2
+    assert device.settings == [
+        ("Set_Range_Each_Channel", 1, 1, 3),
+        ("Set_Range_Each_Channel", 1, 2, 4),
+        ("Set_Wavelength", 1560.0),
+    ]
+    assert monitor.check() == []
+    assert monitor.reconnections[RESOURCE] == 1
+
+
+def test_failed_command_triggers_reconnect(manager):
+    """A command failing with a lost connection reconnects without heartbeat."""
+    instrument = manager.connected_instruments[RESOURCE]
+    device = get_device(manager)
+    device.drop()
+    instrument._set_function("Set_Wavelength", 1550.0)
+    assert instrument.status == "NotConnected"
+
+    monitor = HealthMonitor(manager, idle_time=3600.0)
+    assert monitor.check() == [RESOURCE]
+    assert device.heartbeats == 0
+
+
+def test_busy_and_paused_instruments_get_no_heartbeat(manager):
+    device = get_device(manager)
+    manager.connected_instruments[RESOURCE]._set_function("Set_Wavelength", 1550.0)
+
+    HealthMonitor(manager, idle_time=3600.0).check()
+    monitor = HealthMonitor(manager, idle_time=0.0)
+    with monitor.paused():
+        monitor.check()
+    assert device.heartbeats == 0
+
+    monitor.check()
+    assert device.heartbeats == 1
+
+
+def test_monitor_thread_reconnects(manager):
+    get_device(manager).drop()
+    with HealthMonitor(manager, interval=0.01, idle_time=0.0) as monitor:
+        deadline = time.monotonic() + 5.0
+        while not monitor.reconnections and time.monotonic() < deadline:
+            threading.Event().wait(0.01)
+    assert monitor.reconnections[RESOURCE] >= 1
+
+
+def test_manager_disconnect_and_reconnect(manager):
+    instrument = manager.connected_instruments[RESOURCE]
+    manager.disconnect(RESOURCE)
+    assert RESOURCE not in manager.connected_instruments
+    assert not instrument._instrument.connected
+    with pytest.raises(ValueError):
+        manager.disconnect(RESOURCE)
+
+    assert manager.reconnect(RESOURCE) is instrument
+    assert instrument._instrument.connected
+    manager.disconnect_all()
+    assert manager.connected_instruments == {}
+
+
+class BlockingDeviceStub(DeviceStub):
+    """DLL object stub blocking its reconnection until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.connecting = threading.Event()
+        self.release = threading.Event()
+
+    def Connect(self, connection_type):
+        if self.connects:
+            self.connecting.set()
+            self.release.wait(5.0)
+        return super().Connect(connection_type)
+
+
+def test_connect_during_reconnect():
+    """A connect overlapping a reconnect registers its own instrument."""
+    manager = InstrumentManager()
+    device = BlockingDeviceStub()
+    reconnected = make_instrument(device)
+    manager._connect(reconnected, RESOURCE, Terminator.CR)
+    reconnect = threading.Thread(target=manager.reconnect, args=(RESOURCE,))
+    reconnect.start()
+    assert device.connecting.wait(5.0)
+
+    other_resource = "TCPIP0::192.168.1.11::5000::SOCKET"
+    instrument = make_instrument()
+    connected = []
+    connect = threading.Thread(
+        target=lambda: connected.append(
+            manager._connect(instrument, other_resource, Terminator.CR)
+        )
+    )
+    connect.start()
+    device.release.set()
+    reconnect.join()
+    connect.join()
+
+    assert connected == [instrument]
+    assert manager.connected_instruments == {
+        RESOURCE: reconnected,
+        other_resource: instrument,
+    }
@@ -0,0 +1,83 @@
+# pysantec/tests/instruments/test_optical_switch.py
+
+"""
+Optical switch driver tests with a loopback SCPI server.
+"""
+
+import socket
+import threading
+
+import pytest
+from pysantec.instruments.optical_switch import (
+    OpticalSwitch,
+    ScpiOpticalSwitch,
+    SimulatedOpticalSwitch,
+)
+
+
+@pytest.fixture
+def scpi_server():
+    """Loopback SCPI switch logging the received commands."""
+    listener = socket.create_server(("127.0.0.1", 0))
+    commands = []
+
+    def serve():
+        connection, _ = listener.accept()
+        port = "0"
+        with connection, connection.makefile("rwb") as stream:
+            for line in stream:
+                command = line.decode().strip()
+                commands.append(command)
+                if command.startswith("ROUT1:CLOS "):
+                    port = command.split()[1]
+                elif command == "ROUT1:CLOS?":
+                    stream.write(port.encode() + b"\n")
+                elif command == "*OPC?":
+                    stream.write(b"1\n")
+                elif command == "*IDN?":
+                    stream.write(b"SANTEC,OSX-100\n")
+                stream.flush()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield listener.getsockname()[1], commands
+    listener.close()
+
+
+def test_scpi_switch(scpi_server):
+    tcp_port, commands = scpi_server
+    with ScpiOpticalSwitch("127.0.0.1", 8, tcp_port, settling_time=0.0) as switch:
+        assert switch.idn == "SANTEC,OSX-100"
+        switch.switch_to(3)
+        switch.switch_to(3)  # Already selected
+        assert switch.get_port() == 3
+        assert switch.port == 3
+
+    assert commands == ["*IDN?", "ROUT1:CLOS 3", "*OPC?", "*OPC?", "ROUT1:CLOS?"]
+
+
+def test_settling_overlaps_other_work():
+    """Time spent after select counts towards the settling time."""
+    switch = SimulatedOpticalSwitch(4, settling_time=0.02)
+    switch.select(2)
+    threading.Event().wait(0.03)
+    assert switch.wait_settled() == 0.0
+    switch.select(3)
+    assert 0.0 < switch.wait_settled() <= 0.02
+    assert switch.selections == [2, 3]
+
+
+@pytest.mark.parametrize("port", [0, 5])
+def test_invalid_port(port):
+    with pytest.raises(ValueError):
+        SimulatedOpticalSwitch(4).select(port)
+
+
+def test_driver_must_implement_select():
+    """A driver without _select fails when constructed."""
+
+    class IncompleteSwitch(OpticalSwitch):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteSwitch(4, 0.0)
@@ -0,0 +1,103 @@
+# pysantec/tests/instruments/test_retry.py
+
+"""
+Instrument command retry tests.
+"""
+
+import pytest
+from pysantec.instruments.base_instrument import BaseInstrument
+from pysantec.instruments.retry import RetryPolicy
+from pysantec.instruments.wrapper import InstrumentExceptionCode
+
+COMMUNICATION_FAILURE = InstrumentExceptionCode.CommunicationFailure.value
+
+
+class IOException(Exception):
+    """Stands in for System.IO.IOException raised by the DLL."""
+
+
+class FlakyDeviceStub:
+    """DLL object stub failing a number of times before succeeding."""
+
+    def __init__(self, failures, exception=None):
+        self.failures = failures
+        self.exception = exception
+        self.calls = 0
+
+    def _attempt(self, result):
+        self.calls += 1
+        if self.calls > self.failures:
+            return result
+        if self.exception is not None:
+            raise self.exception
+        return COMMUNICATION_FAILURE, None
+
+    def Get_Value(self, value):
+        return self._attempt((0, 1550.0))
+
+    def Set_Value(self, value):
+        return self._attempt((0,))[0]
+
+    def Sweep_Start(self):
+        return self._attempt((0,))[0]
+
+
+def make_instrument(failures, exception=None, max_attempts=3):
+    instrument = BaseInstrument()
+    instrument._instrument = FlakyDeviceStub(failures, exception)
+    instrument.retry_policy = RetryPolicy(max_attempts=max_attempts, base_delay=0.0)
+    return instrument
+
+
+def test_transient_error_is_retried():
+    """A getter failing twice succeeds on the third attempt."""
+    instrument = make_instrument(failures=2)
+    assert instrument._get_function("Get_Value", float) == 1550.0
+    assert instrument.status == "Succeed"
+    assert instrument._instrument.calls == 3
+    stats = instrument.retry_stats.as_dict()
+    assert stats["retries"] == {"Get_Value": 2}
+    assert stats["recovered"] == {"Get_Value": 1}
+
+
+def test_exhausted_retries_return_last_error():
+    instrument = make_instrument(failures=5)
+    instrument._set_function("Set_Value", 1)
+    assert instrument.status == "CommunicationFailure"
+    assert instrument._instrument.calls == 3
+    assert instrument.retry_stats.as_dict()["failed"] == {"Set_Value": 1}
+
+
+def test_non_idempotent_command_is_not_retried():
+    """Starting a sweep twice could run two sweeps, so it is never retried."""
+    instrument = make_instrument(failures=1)
+    instrument._set_function("Sweep_Start")
+    assert instrument.status == "CommunicationFailure"
+    assert instrument._instrument.calls == 1
+
+
+def test_transient_exception_is_retried():
+    instrument = make_instrument(failures=1, exception=IOException("Port closed"))
+    assert instrument._get_function("Get_Value", float) == 1550.0
+    assert instrument._instrument.calls == 2
+
+
+def test_other_exception_is_not_retried():
+    instrument = make_instrument(failures=1, exception=KeyError("Value"))
+    with pytest.raises(KeyError):
+        instrument._get_function("Get_Value", float)
+    assert instrument._instrument.calls == 1
+
+
+def test_echo_queries_only_are_retried():
+    policy = RetryPolicy()
+    assert policy.is_retryable("Echo", ("POW?",))
+    assert not policy.is_retryable("Echo", ("POW 1",))
+    assert not RetryPolicy(max_attempts=1).is_retryable("Get_Value", ())
+
+
+def test_backoff_is_exponential_and_bounded():
+    policy = RetryPolicy(base_delay=0.1, max_delay=0.3)
+    assert 0.05 <= policy.backoff(1) <= 0.1
+    assert 0.1 <= policy.backoff(2) <= 0.2
+    assert 0.15 <= policy.backoff(5) <= 0.3
@@ -7,6 +7,9 @@ TSL instrument tests.
 import time
 import pytest
 import pysantec
+from pysantec.instruments import tsl_instrument
+from pysantec.instruments.base_instrument import BaseInstrument
+from pysantec.instruments.wrapper import InstrumentExceptionCode
 from pysantec.instruments.wrapper.enumerations.tsl_enums import (
     LDStatus,
     PowerUnit,
@@ -185,3 +188,45 @@ def test_power_monitor_data(tsl):
 
     data_points = tsl.get_logging_data_points()
     assert len(data) == data_points
+
+
+class WaitStub:
+    """TSL DLL object stub returning a status for each wait chunk."""
+
+    def __init__(self, clock, statuses, elapsed):
+        self.clock = clock
+        self.statuses = list(statuses)
+        self.elapsed = elapsed
+        self.chunks = []
+
+    def TSL_Busy_Check(self, wait_time):
+        self.chunks.append(wait_time)
+        self.clock[0] += wait_time / 1000 if self.elapsed else 0.0
+        return self.statuses.pop(0)
+
+
+@pytest.mark.parametrize(
+    "status, elapsed, chunks",
+    [
+        # The condition is reached
+        (InstrumentExceptionCode.Succeed, False, [1000]),
+        # An expired chunk continues the wait, whatever its status
+        (InstrumentExceptionCode.TimeOut, True, [1000, 1000, 500]),
+        (InstrumentExceptionCode.TimeOut, False, [1000, 1000, 500]),
+        (InstrumentExceptionCode.DeviceError, True, [1000, 1000, 500]),
+        # An error before the chunk time ends the wait
+        (InstrumentExceptionCode.DeviceError, False, [1000]),
+    ],
+)
+def test_chunked_wait(monkeypatch, status, elapsed, chunks):
+    """Long waits are split into chunks of WAIT_CHUNK milliseconds."""
+    clock = [0.0]
+    monkeypatch.setattr(tsl_instrument.time, "monotonic", lambda: clock[0])
+    stub = WaitStub(clock, [status] * 3, elapsed)
+    tsl = tsl_instrument.TSLInstrument.__new__(tsl_instrument.TSLInstrument)
+    BaseInstrument.__init__(tsl)
+    tsl._instrument = stub
+
+    tsl.tsl_busy_check(2500)
+    assert stub.chunks == chunks
+    assert tsl.status == status.name
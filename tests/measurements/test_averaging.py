@@ -0,0 +1,78 @@
+# pysantec/tests/measurements/test_averaging.py
+
+"""
+Multi-sweep averaging tests.
+"""
+
+import numpy as np
+import pytest
+from pysantec.measurements.averaging import SweepAverager
+
+DATA_POINTS = 101
+CHANNELS = 4
+
+
+@pytest.fixture
+def sweeps():
+    """Random sweeps in dBm."""
+    rng = np.random.default_rng(0)
+    return -20.0 + rng.normal(0.0, 0.1, size=(16, DATA_POINTS, CHANNELS))
+
+
+def test_running_mean_and_variance(sweeps):
+    """The running statistics match the batch statistics in linear power."""
+    averager = SweepAverager(DATA_POINTS, CHANNELS)
+    for sweep in sweeps:
+        averager.add(sweep)
+
+    linear = 10 ** (sweeps / 10)
+    assert averager.sweep_count == len(sweeps)
+    np.testing.assert_allclose(averager.mean, linear.mean(axis=0))
+    np.testing.assert_allclose(averager.variance, linear.var(axis=0, ddof=1))
+    np.testing.assert_allclose(averager.mean_dbm, 10 * np.log10(linear.mean(axis=0)))
+
+
+def test_results_available_after_each_sweep(sweeps):
+    """Results are available incrementally."""
+    averager = SweepAverager(DATA_POINTS, CHANNELS)
+    averager.add(sweeps[0])
+    np.testing.assert_allclose(averager.mean_dbm, sweeps[0])
+    assert np.isnan(averager.variance).all()
+
+
+def test_sigma_clipping_rejects_outliers(sweeps):
+    """Outlier readings are rejected with sigma clipping."""
+    averager = SweepAverager(DATA_POINTS, CHANNELS, sigma_clip=5.0)
+    for sweep in sweeps:
+        averager.add(sweep)
+
+    outlier = sweeps[0].copy()
+    outlier[10, 2] = 0.0
+    averager.add(outlier)
+
+    assert averager.count[10, 2] == len(sweeps)
+    assert averager.count[11, 2] == len(sweeps) + 1
+    assert averager.mean_dbm[10, 2] == pytest.approx(-20.0, abs=0.1)
+
+
+def test_sigma_clipping_after_constant_readings():
+    """Small deviations are accepted after identical readings, outliers are not."""
+    averager = SweepAverager(DATA_POINTS, CHANNELS, sigma_clip=5.0)
+    constant = np.full((DATA_POINTS, CHANNELS), -20.0)
+    for _ in range(4):
+        averager.add(constant)
+
+    deviation = constant + 0.001
+    deviation[10, 2] = 0.0
+    averager.add(deviation)
+
+    assert averager.count[11, 2] == 5
+    assert averager.count[10, 2] == 4
+    assert averager.std[11, 2] > 0
+
+
+def test_sweep_shape_mismatch():
+    """Sweeps of a different shape are rejected."""
+    averager = SweepAverager(DATA_POINTS, CHANNELS)
+    with pytest.raises(ValueError):
+        averager.add(np.zeros((DATA_POINTS, CHANNELS + 1)))
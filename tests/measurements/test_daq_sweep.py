@@ -0,0 +1,88 @@
+# pysantec/tests/measurements/test_daq_sweep.py
+
+"""
+DAQ sweep tests with instrument stand-ins.
+"""
+
+import threading
+
+import numpy as np
+import pytest
+from pysantec.instruments import tsl_enums
+from pysantec.measurements import daq_sweep as daq_sweep_module
+from pysantec.measurements.daq_sweep import DAQSweep, normalize_by_monitor
+
+DATA_POINTS = 11
+
+
+class StubTSL:
+    def __init__(self, armed):
+        self.armed = armed
+        self.triggered = False
+
+    def set_scan_start_mode(self, mode):
+        pass
+
+    def start_scan(self):
+        # Waits for the SPU to be armed at the same time
+        self.armed.wait()
+
+    def get_scan_status(self):
+        return tsl_enums.ScanStatus.STANDING_BY_TRIGGER
+
+    def soft_trigger(self):
+        self.triggered = True
+
+
+class StubDAQ:
+    def __init__(self, armed):
+        self.armed = armed
+        self.sampling_parameters = None
+
+    def stop_sampling(self):
+        pass
+
+    def set_sampling_parameters(self, *args):
+        self.sampling_parameters = args
+
+    def start_sampling(self):
+        self.armed.wait()
+
+    def wait_for_sampling(self):
+        pass
+
+    def get_sampling_data_array(self):
+        monitor = np.full(DATA_POINTS, 2.0)
+        return monitor * np.logspace(0, -1, DATA_POINTS), monitor
+
+
+@pytest.fixture
+def daq_sweep(monkeypatch):
+    monkeypatch.setattr(
+        daq_sweep_module, "configure_tsl_sweep", lambda laser, *args: 0.1
+    )
+    armed = threading.Barrier(2, timeout=5.0)
+    return DAQSweep(StubTSL(armed), StubDAQ(armed))
+
+
+def test_normalize_by_monitor():
+    signal = np.array([1.0, 0.5, 0.0, 2.0])
+    monitor = np.array([1.0, 5.0, 1.0, -1.0])
+    normalized = normalize_by_monitor(signal, monitor)
+    np.testing.assert_allclose(normalized[:2], [0.0, -10.0])
+    assert np.isnan(normalized[2:]).all()
+    with pytest.raises(ValueError):
+        normalize_by_monitor(signal, monitor[:3])
+
+
+def test_sweep_arms_spu_with_tsl(daq_sweep):
+    """The SPU is armed in parallel with the TSL and the data normalized."""
+    daq_sweep.configure(1500.0, 1501.0, 0.1, 0.0, 10.0)
+    out = np.empty(DATA_POINTS)
+    normalized = daq_sweep.measure(out)
+
+    assert daq_sweep.laser.triggered
+    assert daq_sweep.daq.sampling_parameters == (1500.0, 1501.0, 10.0, 0.1)
+    np.testing.assert_allclose(daq_sweep.wavelengths, np.linspace(1500.0, 1501.0, 11))
+    assert normalized is out
+    np.testing.assert_allclose(normalized, np.linspace(0.0, -10.0, DATA_POINTS))
@@ -0,0 +1,100 @@
+# pysantec/tests/measurements/test_multi_mpm.py
+
+"""
+SME tests with several MPM mainframes, using instrument stand-ins.
+"""
+
+import threading
+
+import numpy as np
+import pytest
+from pysantec.instruments import tsl_enums
+from pysantec.instruments.wrapper.enumerations.mpm_enums import LoggingStatus
+from pysantec.measurements.single_measurement_operation import SME
+
+MPM_COUNT = 3
+DATA_POINTS = 101
+
+
+class StubMPM:
+    """MPM stand-in which waits for the other mainframes in parallel calls."""
+
+    def __init__(self, index, barrier, logging_polls):
+        self.index = index
+        self.barrier = barrier
+        self.logging_polls = logging_polls
+        self.lock = threading.RLock()
+        self.status_polls = 0
+
+    def start_logging(self):
+        self.barrier.wait()
+        self.status_polls = 0
+
+    def get_logging_status(self):
+        self.status_polls += 1
+        if self.status_polls <= self.logging_polls:
+            return LoggingStatus.LOGGING, self.status_polls
+        return LoggingStatus.COMPLETED, DATA_POINTS
+
+    def get_logging_data_point(self):
+        return DATA_POINTS
+
+    def get_channel_logging_data_array(self, module_number, channel_number, out):
+        self.barrier.wait()
+        out[:] = 100 * self.index + 10 * module_number + channel_number
+        return out
+
+
+class StubTSL:
+    def set_scan_start_mode(self, mode):
+        pass
+
+    def start_scan(self):
+        pass
+
+    def get_scan_status(self):
+        return tsl_enums.ScanStatus.STANDING_BY_TRIGGER
+
+    def soft_trigger(self):
+        pass
+
+
+@pytest.fixture
+def sme():
+    barrier = threading.Barrier(MPM_COUNT, timeout=5.0)
+    mpms = [StubMPM(index, barrier, logging_polls=index) for index in range(MPM_COUNT)]
+    return SME(StubTSL(), mpms)
+
+
+def test_logging_started_in_parallel_and_awaited(sme):
+    """Logging starts on all MPMs at once and every MPM is waited for."""
+    sme.perform_scan()
+    assert [mpm.status_polls for mpm in sme.power_meters] == [1, 2, 3]
+
+
+def test_channels_fetched_in_parallel(sme):
+    """Channels of all MPMs are fetched concurrently into their columns."""
+    channels = [
+        (mpm, module, channel)
+        for mpm in (2, 0, 1)
+        for module, channel in [(0, 1), (1, 2)]
+    ]
+    data = sme.fetch_channel_data(channels)
+
+    assert data.shape == (DATA_POINTS, len(channels))
+    np.testing.assert_array_equal(data[0], [201, 212, 1, 12, 101, 112])
+
+
+def test_invalid_channels(sme):
+    with pytest.raises(ValueError, match="Invalid MPM index"):
+        sme.fetch_channel_data([(MPM_COUNT, 0, 1)])
+    with pytest.raises(ValueError, match="At least one channel"):
+        sme.fetch_channel_data([])
+
+
+def test_single_mpm_channel_pairs():
+    """(module, channel) pairs refer to the first MPM."""
+    mpm = StubMPM(0, threading.Barrier(1), logging_polls=0)
+    sme = SME(StubTSL(), mpm)
+    assert sme.power_meter is mpm
+    np.testing.assert_array_equal(sme.fetch_channel_data([(1, 3)])[:, 0], 13)
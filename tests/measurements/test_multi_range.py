@@ -0,0 +1,129 @@
+# pysantec/tests/measurements/test_multi_range.py
+
+"""
+Multi-range sweep tests.
+"""
+
+import numpy as np
+import pytest
+import pysantec
+from pysantec.measurements.multi_range import MultiRangeSweep, merge_ranges
+
+# Define GPIB/TCPIP resource strings for the instruments
+TSL_RESOURCE = "GPIB2::3::INSTR"
+MPM_RESOURCE = "GPIB2::15::INSTR"
+
+
+@pytest.fixture(scope="module")
+def instruments():
+    """Fixture to connect to instruments."""
+    tsl = None
+    mpm = None
+
+    im = pysantec.InstrumentManager()
+
+    try:
+        tsl = im.connect_tsl(TSL_RESOURCE)
+        mpm = im.connect_mpm(MPM_RESOURCE)
+
+    except Exception as e:
+        pytest.skip(f"Skipping test: instruments not available ({e})")
+
+    yield tsl, mpm
+
+    # Cleanup after tests
+    if tsl:
+        tsl.disconnect()
+
+    if mpm:
+        mpm.disconnect()
+
+
+def test_merge_ranges():
+    """Each point is taken from the most sensitive valid range."""
+    # Ranges: (+10 ~ -30 dBm), (0 ~ -40 dBm), (-10 ~ -50 dBm)
+    upper_limits = [10.0, 0.0, -10.0]
+    lower_limits = [-30.0, -40.0, -50.0]
+    data = np.array(
+        [
+            [[5.0], [-20.0], [-35.0], [-60.0]],
+            [[0.0], [-20.1], [-35.1], [-60.0]],
+            [[-10.0], [-20.2], [-35.2], [-60.0]],
+        ]
+    )
+
+    merged, source = merge_ranges(data, upper_limits, lower_limits)
+
+    assert merged.shape == (4, 1)
+    np.testing.assert_array_equal(source[:, 0], [0, 2, 2, -1])
+    np.testing.assert_allclose(merged[:3, 0], [5.0, -20.2, -35.2])
+    assert np.isnan(merged[3, 0])
+
+
+def test_merge_ranges_limit_mismatch():
+    """Range limits must match the number of ranges."""
+    with pytest.raises(ValueError):
+        merge_ranges(np.zeros((2, 3, 1)), [10.0], [-30.0])
+
+
+class StubMPM:
+    def __init__(self):
+        self.range_value = None
+
+    def set_range_value(self, range_value):
+        self.range_value = range_value
+
+
+class StubSME:
+    """SME stand-in with several MPMs, reading the data at their range."""
+
+    def __init__(self, mpm_count):
+        self.power_meters = [StubMPM() for _ in range(mpm_count)]
+        self.power_meter = self.power_meters[0]
+
+    def configure_tsl(self, start, stop, step, power, speed):
+        return step
+
+    def configure_mpm(self, start, stop, step, speed, actual_step, range_value):
+        for power_meter in self.power_meters:
+            power_meter.range_value = range_value
+
+    def perform_scan(self):
+        pass
+
+    def fetch_channel_data(self, channels, out):
+        for column, (mpm_index, _, _) in enumerate(channels):
+            out[:, column] = self.power_meters[mpm_index].range_value
+
+
+def test_range_set_on_every_mpm():
+    """Every MPM mainframe sweeps at the same range."""
+    sme = StubSME(mpm_count=2)
+    sweep = MultiRangeSweep(sme)
+    channels = [(0, 1, 1), (1, 1, 1)]
+    sweep.run(1500.0, 1501.0, 0.1, 0.0, 20.0, channels, ranges=(1, 3))
+
+    assert [mpm.range_value for mpm in sme.power_meters] == [3, 3]
+
+
+def test_empty_ranges():
+    """An empty range list is rejected before the instruments are configured."""
+    sme = StubSME(mpm_count=1)
+    sweep = MultiRangeSweep(sme)
+    with pytest.raises(ValueError, match="At least one range"):
+        sweep.run(1500.0, 1501.0, 0.1, 0.0, 20.0, [(0, 1, 1)], ranges=())
+    assert sme.power_meter.range_value is None
+
+
+def test_multi_range_sweep(instruments):
+    """Run a multi-range sweep and verify the merged data."""
+    tsl, mpm = instruments
+    sme = pysantec.SME(tsl, mpm)
+    multi_range_sweep = pysantec.MultiRangeSweep(sme)
+
+    wavelengths, merged, source_ranges = multi_range_sweep.run(
+        1500.0, 1510.0, 0.1, 0.0, 20.0, channels=[(1, 1)], ranges=(1, 3)
+    )
+
+    assert merged.shape == (len(wavelengths), 1)
+    assert set(np.unique(source_ranges)) <= {-1, 1, 3}
@@ -0,0 +1,136 @@
+# pysantec/tests/measurements/test_segmented_sweep.py
+
+"""
+Segmented sweep tests.
+"""
+
+import numpy as np
+import pytest
+import pysantec
+from pysantec.instruments.mpm_instrument import MAX_LOGGING_DATA_POINTS
+from pysantec.measurements.segmented_sweep import plan_segments
+
+# Define GPIB/TCPIP resource strings for the instruments
+TSL_RESOURCE = "GPIB2::3::INSTR"
+MPM_RESOURCE = "GPIB2::15::INSTR"
+
+
+@pytest.fixture(scope="module")
+def instruments():
+    """Fixture to connect to instruments."""
+    tsl = None
+    mpm = None
+
+    im = pysantec.InstrumentManager()
+
+    try:
+        tsl = im.connect_tsl(TSL_RESOURCE)
+        mpm = im.connect_mpm(MPM_RESOURCE)
+
+    except Exception as e:
+        pytest.skip(f"Skipping test: instruments not available ({e})")
+
+    yield tsl, mpm
+
+    # Cleanup after tests
+    if tsl:
+        tsl.disconnect()
+
+    if mpm:
+        mpm.disconnect()
+
+
+def test_single_segment_within_limit():
+    """A sweep within the MPM limit is not split."""
+    segments = plan_segments(1500.0, 1600.0, 0.1)
+    assert len(segments) == 1
+    assert segments[0].data_points == 1001
+    assert segments[0].offset == 0
+
+
+@pytest.mark.parametrize("max_data_points", [2, 4, 101, 1000])
+def test_segments_are_back_to_back(max_data_points):
+    """Segments share their boundary points and cover the whole sweep."""
+    segments = plan_segments(1500.0, 1501.0, 0.001, max_data_points)
+    assert all(s.data_points <= max_data_points for s in segments)
+    for previous, current in zip(segments, segments[1:]):
+        assert current.offset == previous.offset + previous.data_points - 1
+        assert current.start_wavelength == pytest.approx(previous.stop_wavelength)
+    last = segments[-1]
+    assert last.offset + last.data_points == 1001
+    assert last.stop_wavelength == pytest.approx(1501.0)
+
+
+def test_fine_step_wide_range_exceeds_limit():
+    """A 0.1 pm sweep over 1260 - 1640 nm needs several segments."""
+    segments = plan_segments(1260.0, 1640.0, 0.0001)
+    assert len(segments) == 4
+    assert all(s.data_points <= MAX_LOGGING_DATA_POINTS for s in segments)
+
+
+@pytest.mark.parametrize("start, stop, step", [(1500, 1500, 0.1), (1500, 1600, 0)])
+def test_invalid_sweep(start, stop, step):
+    """Invalid sweep parameters are rejected."""
+    with pytest.raises(ValueError):
+        plan_segments(start, stop, step)
+
+
+class RecordingSME:
+    """SME stand-in recording the calls of a segmented sweep."""
+
+    def __init__(self):
+        self.calls = []
+
+    def configure_tsl(self, start, stop, step, power, speed):
+        self.calls.append(("configure_tsl", start, stop))
+        return step
+
+    def configure_mpm(self, start, stop, step, speed, actual_step, is_mpm_215):
+        self.calls.append(("configure_mpm", start, stop))
+
+    def update_scan_parameters(self, start, stop, step, speed, is_mpm_215):
+        self.calls.append(("update_scan_parameters", start, stop))
+        return step
+
+    def perform_scan(self):
+        self.calls.append(("perform_scan",))
+
+    def fetch_channel_data(self, channels, out):
+        out[:] = len(self.calls)
+        return out
+
+
+def test_instruments_configured_once():
+    """Only the first segment runs the full setup, later ones the scan range."""
+    sme = RecordingSME()
+    segmented_sweep = pysantec.SegmentedSweep(sme, max_data_points=51)
+    wavelengths, data = segmented_sweep.run(
+        1500.0, 1510.0, 0.1, 0.0, 20.0, channels=[(1, 1)]
+    )
+
+    names = [call[0] for call in sme.calls]
+    assert names == [
+        "configure_tsl",
+        "configure_mpm",
+        "perform_scan",
+        "update_scan_parameters",
+        "perform_scan",
+    ]
+    assert sme.calls[3][1] == pytest.approx(1505.0)
+    # The shared boundary point holds the data of the later segment
+    np.testing.assert_array_equal(data[:50, 0], 3)
+    np.testing.assert_array_equal(data[50:, 0], 5)
+
+
+def test_segmented_sweep(instruments):
+    """Run a segmented sweep and verify the stitched data."""
+    tsl, mpm = instruments
+    sme = pysantec.SME(tsl, mpm)
+    segmented_sweep = pysantec.SegmentedSweep(sme, max_data_points=51)
+
+    wavelengths, data = segmented_sweep.run(
+        1500.0, 1510.0, 0.1, 0.0, 20.0, channels=[(1, 1)]
+    )
+
+    assert len(wavelengths) == 101
+    assert data.shape == (101, 1)
@@ -0,0 +1,95 @@
+# pysantec/tests/measurements/test_switched_sweep.py
+
+"""
+Optical switch multiplexed sweep tests with a simulated switch.
+"""
+
+import threading
+
+import numpy as np
+import pytest
+from pysantec.instruments.optical_switch import SimulatedOpticalSwitch
+from pysantec.measurements.switched_sweep import SwitchedSweep
+
+SETTLING_TIME = 0.05
+FETCH_TIME = 0.08
+
+
+class RecordingSwitch(SimulatedOpticalSwitch):
+    def __init__(self, events):
+        super().__init__(4, SETTLING_TIME)
+        self.events = events
+
+    def _select(self, port):
+        super()._select(port)
+        self.events.append(("select", port))
+
+
+class StubSME:
+    """SME stand-in returning the port number as channel data."""
+
+    def __init__(self, switch, events):
+        self.switch = switch
+        self.events = events
+
+    def configure_tsl(self, *args):
+        self.events.append(("configure_tsl",))
+        return 0.1
+
+    def configure_mpm(self, *args):
+        self.events.append(("configure_mpm",))
+
+    def perform_scan(self):
+        self.events.append(("scan", self.switch.port))
+        self.scanned_port = self.switch.port
+
+    def fetch_channel_data(self, channels, out):
+        threading.Event().wait(FETCH_TIME)
+        self.events.append(("fetch", self.scanned_port))
+        out[:] = self.scanned_port
+
+
+@pytest.fixture
+def sweep():
+    events = []
+    switch = RecordingSwitch(events)
+    return SwitchedSweep(StubSME(switch, events), switch), events
+
+
+def test_ports_share_one_setup(sweep):
+    switched_sweep, events = sweep
+    wavelengths, data = switched_sweep.run(
+        1500.0, 1501.0, 0.1, 0.0, 10.0, channels=[(0, 1), (0, 2)], ports=[2, 4, 1]
+    )
+
+    assert data.shape == (3, 11, 2)
+    np.testing.assert_allclose(wavelengths, np.linspace(1500.0, 1501.0, 11))
+    np.testing.assert_array_equal(data[:, 0, 0], [2, 4, 1])
+    assert events == [
+        ("select", 2),
+        ("configure_tsl",),
+        ("configure_mpm",),
+        ("scan", 2),
+        ("select", 4),
+        ("fetch", 2),
+        ("scan", 4),
+        ("select", 1),
+        ("fetch", 4),
+        ("scan", 1),
+        ("fetch", 1),
+    ]
+
+
+def test_settling_overlaps_readout(sweep):
+    """Only the first port waits for the switch, the others settle during fetch."""
+    switched_sweep, _ = sweep
+    switched_sweep.run(1500.0, 1501.0, 0.1, 0.0, 10.0, channels=[(0, 1)])
+    assert switched_sweep.settle_wait <= SETTLING_TIME
+
+
+def test_output_buffer_shape(sweep):
+    switched_sweep, _ = sweep
+    with pytest.raises(ValueError):
+        switched_sweep.run(
+            1500.0, 1501.0, 0.1, 0.0, 10.0, channels=[(0, 1)], out=np.empty((4, 10, 1))
+        )
@@ -0,0 +1,206 @@
+# pysantec/tests/remote/test_remote.py
+
+"""
+Remote server tests with a loopback server and fake DLL objects.
+"""
+
+import socket
+import struct
+
+import numpy as np
+import pytest
+from pysantec.broker import InstrumentService
+from pysantec.instruments.base_instrument import BaseInstrument
+from pysantec.instruments.mpm_instrument import MPMInstrument
+from pysantec.instruments.tsl_instrument import TSLInstrument
+from pysantec.logger import get_logger
+from pysantec.remote import RemoteClient, RemoteServer
+from pysantec.remote.protocol import Decoder, Encoder
+
+TSL_RESOURCE = "GPIB0::1::INSTR"
+MPM_RESOURCE = "GPIB0::16::INSTR"
+POINTS = 200_001
+
+
+class TSLStub:
+    """TSL DLL object stub."""
+
+    def __init__(self):
+        self.wavelength = 1550.0
+        self.power_unit = None
+
+    def Get_Wavelength(self, response):
+        return 0, self.wavelength
+
+    def Set_Wavelength(self, value):
+        self.wavelength = value
+        return 0
+
+    def Set_Power_Unit(self, value):
+        self.power_unit = value
+        return 0
+
+    def Get_Power_Unit(self, response):
+        return 0, self.power_unit
+
+
+class MPMStub:
+    """MPM DLL object stub with logging data."""
+
+    def __init__(self):
+        self.data = np.linspace(-60.0, 0.0, POINTS)
+
+    def Get_Each_Channel_Logdata(self, module, channel, response):
+        return 0, self.data + channel
+
+    def Set_Range(self, value):
+        return 0
+
+
+def stub_instrument(instrument_class, stub):
+    """Create an instrument calling a DLL object stub."""
+    instrument = instrument_class.__new__(instrument_class)
+    BaseInstrument.__init__(instrument)
+    instrument._instrument = stub
+    # Enum methods are restricted to the TSL and MPM DLL classes
+    instrument._check_restricted_method = lambda: None
+    instrument.logger = get_logger(instrument_class.__name__)
+    return instrument
+
+
+class FakeManager:
+    def __init__(self):
+        self.connected_instruments = {}
+
+    def list_resources(self):
+        return [TSL_RESOURCE, MPM_RESOURCE]
+
+    def connect_tsl(self, resource_name):
+        tsl = stub_instrument(TSLInstrument, TSLStub())
+        self.connected_instruments[resource_name] = tsl
+        return tsl
+
+    def connect_mpm(self, resource_name):
+        mpm = stub_instrument(MPMInstrument, MPMStub())
+        self.connected_instruments[resource_name] = mpm
+        return mpm
+
+    def disconnect(self, resource_name):
+        del self.connected_instruments[resource_name]
+
+    def disconnect_all(self):
+        self.connected_instruments.clear()
+
+
+@pytest.fixture
+def server():
+    service = InstrumentService(FakeManager())
+    with RemoteServer(port=0, service=service, token=b"secret") as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    with RemoteClient(*server.address, token=b"secret") as client:
+        yield client
+
+
+def test_protocol_round_trip():
+    """Values are decoded as encoded, arrays as little-endian views."""
+    value = (
+        None,
+        True,
+        -(2**70),
+        1.5,
+        "text",
+        b"\x00\x01",
+        [1, "a", [2.0, 3.0]],
+        {"key": (1, 2)},
+        np.arange(12, dtype=">i4").reshape(3, 4),
+        np.float32(2.5),
+    )
+    data = bytearray(b"".join(Encoder().encode(value).finish()))
+    decoded = Decoder(data).decode()
+
+    assert decoded[:8] == value[:8]
+    assert decoded[8].dtype == np.dtype("<i4")
+    np.testing.assert_array_equal(decoded[8], value[8])
+    assert decoded[9] == 2.5
+    with pytest.raises(TypeError):
+        Encoder().encode(object())
+
+
+def test_instruments_mirror_their_classes(server, client):
+    assert client.list_resources() == [TSL_RESOURCE, MPM_RESOURCE]
+    tsl = client.connect_tsl(TSL_RESOURCE)
+    mpm = client.connect_mpm(MPM_RESOURCE)
+    sme = client.create_sme(tsl, mpm)
+
+    tsl.set_wavelength(1310.0)
+    assert tsl.get_wavelength() == 1310.0
+    assert tsl.status == "Succeed"
+    assert "get_channel_logging_data_array" in dir(mpm)
+    assert "configure_tsl" in dir(sme)
+
+
+def test_enums_are_mirrored(client):
+    tsl = client.connect_tsl(TSL_RESOURCE)
+    power_unit = client.enums.tsl_enums.PowerUnit
+
+    tsl.set_power_unit(power_unit.mW)
+    assert tsl.get_power_unit() is power_unit.mW
+
+
+def test_logging_data_is_streamed(client):
+    """Logging data arrives as float64 arrays, lists stay lists."""
+    mpm = client.connect_mpm(MPM_RESOURCE)
+    expected = np.linspace(-60.0, 0.0, POINTS) + 1
+
+    data = mpm.get_channel_logging_data_array(0, 1)
+    assert data.dtype == np.float64
+    np.testing.assert_array_equal(data, expected)
+    assert mpm.get_channel_logging_data(0, 1) == expected.tolist()
+
+
+def test_batch_is_one_round_trip(client, monkeypatch):
+    tsl = client.connect_tsl(TSL_RESOURCE)
+    mpm = client.connect_mpm(MPM_RESOURCE)
+    exchanges = []
+    exchange = client.exchange
+    monkeypatch.setattr(
+        client, "exchange", lambda calls: exchanges.append(calls) or exchange(calls)
+    )
+
+    with client.batch() as batch:
+        batch.call(tsl, "set_wavelength", 1560.0)
+        wavelength = batch.call(tsl, "get_wavelength")
+        invalid = batch.call(mpm, "set_range_value", 9)
+        data = [
+            batch.call(mpm, "get_channel_logging_data_array", 0, ch) for ch in (1, 2)
+        ]
+
+    assert len(exchanges) == 1
+    assert wavelength.result() == 1560.0
+    with pytest.raises(ValueError, match="less than or equal to 5"):
+        invalid.result()
+    assert [d.result()[0] for d in data] == [-59.0, -58.0]
+    assert tsl.status == "Succeed"
+
+
+def test_errors(server, client):
+    tsl = client.connect_tsl(TSL_RESOURCE)
+    with pytest.raises(AttributeError):
+        tsl.get_spectrum
+    with pytest.raises(PermissionError):
+        client.request("call", tsl.handle, "_call", ("Get_Wavelength",), {})
+    with pytest.raises(PermissionError, match="Invalid token"):
+        RemoteClient(*server.address)
+    # The client still works after failed requests
+    assert tsl.get_wavelength() == 1550.0
+
+
+def test_oversized_frame_before_hello(server):
+    """An unauthenticated client cannot announce a large request."""
+    with socket.create_connection(server.address, timeout=5.0) as sock:
+        sock.sendall(struct.pack("<Q", 1 << 40))
+        assert sock.recv(1) == b""
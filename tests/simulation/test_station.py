@@ -0,0 +1,105 @@
+# pysantec/tests/simulation/test_station.py
+
+"""
+Station throughput simulation tests.
+"""
+
+import pytest
+from pysantec.simulation import LatencyModel, Recipe, Scenario, StationConfig, simulate
+from pysantec.simulation.engine import Resource, Simulation, Timeout
+
+# Simulated time of the throughput tests in seconds
+DURATION = 1800.0
+
+
+def test_resource_queueing_and_utilization():
+    """Processes wait for a busy resource and its busy time is accounted."""
+    simulation = Simulation()
+    resource = Resource(simulation, "bus")
+    finish_times = []
+
+    def process():
+        yield from resource.hold(1.0)
+        finish_times.append(simulation.now)
+
+    for _ in range(3):
+        simulation.process(process())
+    simulation.run(6.0)
+
+    assert finish_times == [1.0, 2.0, 3.0]
+    assert resource.utilization() == pytest.approx(0.5)
+
+
+def test_timeout_rejects_negative_delay():
+    with pytest.raises(ValueError):
+        Timeout(-1.0)
+
+
+def test_latency_model_from_records():
+    """Latency samples are grouped by DLL function."""
+    records = [
+        {"function": "Get_Logging_Status", "latency_us": 1000.0},
+        {"function": "Get_Logging_Status", "latency_us": 3000.0},
+    ]
+    model = LatencyModel.from_records(records, default=0.01)
+
+    assert model.functions() == ["Get_Logging_Status"]
+    assert model.mean("Get_Logging_Status") == pytest.approx(0.002)
+    assert model.mean("Sweep_Start") == 0.01
+
+
+def test_single_rig_throughput_matches_cycle_time():
+    """Without contention, the throughput is set by the DUT cycle time."""
+    scenario = Scenario(
+        recipe=Recipe(step_wavelength=0.1, scan_speed=100.0, channels=1),
+        config=StationConfig(handling_time=5.0, sweep_return_time=0.0),
+        latency=LatencyModel(default=0.0),
+    )
+    result = simulate(scenario, duration=DURATION, warmup=0.0)
+
+    # 5 s handling + 1 s sweep + 0.2 s last poll, data transfer and processing
+    assert 500 < result.duts_per_hour < 3600 / 6.0
+    assert result.bottleneck == "rig 1 DUT handling"
+
+
+def test_simulation_is_reproducible():
+    scenario = Scenario(latency=LatencyModel({"Sweep_Start": [0.01, 0.05, 0.2]}))
+    assert simulate(scenario, duration=DURATION, seed=1) == simulate(
+        scenario, duration=DURATION, seed=1
+    )
+
+
+def test_pipelined_processing_is_faster_with_slow_host():
+    """Overlapping the host processing with the next sweep improves throughput."""
+    serial = Scenario(config=StationConfig(host_seconds_per_sweep=2.0))
+    pipelined = serial.what_if(pipelined=True)
+
+    serial_result = simulate(serial, duration=DURATION)
+    pipelined_result = simulate(pipelined, duration=DURATION)
+
+    assert pipelined_result.duts_per_hour > serial_result.duts_per_hour
+
+
+def test_shared_bus_limits_rig_scaling():
+    """Rigs sharing one slow bus scale worse than rigs with their own bus."""
+    base = Scenario(
+        recipe=Recipe(step_wavelength=0.001, channels=8),
+        config=StationConfig(rigs=4, handling_time=1.0, bus_bytes_per_second=2e5),
+    )
+    shared = simulate(base, duration=DURATION)
+    separate = simulate(base.what_if(shared_bus=False), duration=DURATION)
+
+    assert shared.duts_per_hour < separate.duts_per_hour
+    assert shared.utilization["GPIB bus"] > 0.9
+
+
+def test_longer_averaging_time_slows_sweeps():
+    recipe = Recipe(step_wavelength=0.01, scan_speed=50.0)
+    assert recipe.sweep_time == pytest.approx(2.0)
+    slow = Recipe(step_wavelength=0.01, scan_speed=50.0, averaging_time=1e-3)
+    assert slow.sweep_time == pytest.approx(slow.data_points * 1e-3)
+
+
+def test_what_if_rejects_unknown_fields():
+    with pytest.raises(ValueError):
+        Scenario().what_if(number_of_lasers=2)
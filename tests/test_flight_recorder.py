@@ -0,0 +1,79 @@
+# pysantec/tests/test_flight_recorder.py
+
+"""
+Test flight recorder functionality.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+
+from pysantec import flight_recorder
+from pysantec.flight_recorder import FlightRecorder, format_records, read_records
+
+
+def test_ring_buffer_wraps(tmp_path):
+    """Only the newest records are kept, oldest first."""
+    path = str(tmp_path / "recorder.bin")
+    recorder = FlightRecorder(path, capacity=4)
+    for index in range(10):
+        recorder.record("MPM", "Set_Wavelength", (1550.0 + index,), 0, 1000)
+    recorder.close()
+
+    records = read_records(path)
+    assert [r["sequence"] for r in records] == [7, 8, 9, 10]
+    assert records[-1]["function"] == "Set_Wavelength"
+    assert records[-1]["args"] == "1559.0"
+    assert records[-1]["latency_us"] == 1.0
+
+
+def test_large_arguments_are_not_formatted(tmp_path):
+    """Data arrays are recorded by type name only."""
+    path = str(tmp_path / "recorder.bin")
+    recorder = FlightRecorder(path, capacity=4)
+    recorder.record("TSL", "Get_Logging_Data", (0, [0.0] * 100000), 0, 1000)
+    recorder.record("TSL", "Echo", ("*IDN?", ""), -1, 1000)
+    recorder.close()
+
+    records = read_records(path)
+    assert records[0]["args"] == "0, list"
+    assert records[1]["status"] == -1
+    assert "Echo('*IDN?', '') -> -1" in format_records(records, last=1)
+
+
+def test_format_last_seconds(tmp_path):
+    """Records older than the requested time span are skipped."""
+    path = str(tmp_path / "recorder.bin")
+    recorder = FlightRecorder(path, capacity=8)
+    recorder.record("MPM", "Logging_Start", (), 0, 1000)
+    recorder.close()
+
+    records = read_records(path)
+    records.insert(0, dict(records[0], sequence=0, timestamp=0.0))
+    assert len(format_records(records, seconds=60).splitlines()) == 1
+
+
+def test_temp_file_removed_on_close(tmp_path, monkeypatch):
+    """The per-process temp file is removed on close, a given file is kept."""
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    recorder = FlightRecorder(capacity=4)
+    assert os.path.dirname(recorder.path) == str(tmp_path)
+    recorder.close()
+
+    path = str(tmp_path / "recorder.bin")
+    FlightRecorder(path, capacity=4).close()
+    assert os.listdir(tmp_path) == ["recorder.bin"]
+
+
+def test_excepthook_is_opt_in(tmp_path, monkeypatch):
+    """The process-wide recorder does not install exception hooks by itself."""
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    monkeypatch.setattr(flight_recorder, "_recorder", None)
+    monkeypatch.setattr(flight_recorder, "_recorder_enabled", True)
+    excepthook, thread_excepthook = sys.excepthook, threading.excepthook
+
+    recorder = flight_recorder.get_flight_recorder()
+    recorder.close()
+    assert sys.excepthook is excepthook
+    assert threading.excepthook is thread_excepthook
@@ -0,0 +1,109 @@
+# pysantec/tests/test_logger.py
+
+"""
+Test logger functionality.
+"""
+
+import gzip
+import importlib
+import logging
+import time
+
+from pysantec.logger import (
+    LogRateLimiter,
+    RotatingLogFileHandler,
+    configure_logging,
+    get_run_info,
+    log_run_info,
+    shutdown_logging,
+)
+
+
+def test_log_rate_limiter(caplog, monkeypatch):
+    """Repeated messages within the interval are suppressed and counted."""
+    now = [0.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    logger = logging.getLogger("test_log_rate_limiter")
+    limiter = LogRateLimiter(logger, interval=1.0)
+
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        for _ in range(5):
+            limiter.log(logging.DEBUG, "Polling: %s", "LOGGING")
+            now[0] += 0.3
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages == [
+        "Polling: LOGGING",
+        "Polling: LOGGING (3 similar messages suppressed)",
+    ]
+
+
+def test_log_rate_limiter_disabled_level(caplog):
+    """Messages below the logger level are not counted as suppressed."""
+    logger = logging.getLogger("test_log_rate_limiter_disabled")
+    logger.setLevel(logging.INFO)
+    limiter = LogRateLimiter(logger)
+
+    limiter.log(logging.DEBUG, "Polling")
+    assert limiter.suppressed == 0
+    assert not caplog.records
+
+
+def test_configure_logging(tmp_path):
+    """Queued records are written to the log file in append mode."""
+    configure_logging(log_dir=str(tmp_path), level=logging.INFO)
+    logging.getLogger("test_configure_logging").info("First run")
+    shutdown_logging()
+
+    configure_logging(log_dir=str(tmp_path), level=logging.INFO)
+    logging.getLogger("test_configure_logging").info("Second run")
+    shutdown_logging()
+
+    content = (tmp_path / "output.log").read_text()
+    assert "First run" in content
+    assert "Second run" in content
+
+
+def test_size_rotation_and_retention(tmp_path):
+    """Rotated files are compressed and only the newest ones are kept."""
+    handler = RotatingLogFileHandler(
+        str(tmp_path / "output.log"), max_bytes=200, backup_count=2
+    )
+    logger = logging.getLogger("test_size_rotation")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for index in range(20):
+            logger.warning("Record %02d %s", index, "x" * 50)
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    rotated_files = sorted(tmp_path.glob("output_*.log.gz"))
+    assert len(rotated_files) == 2
+    assert (tmp_path / "output.log").stat().st_size <= 200
+    with gzip.open(rotated_files[-1], "rt") as f:
+        assert "Record" in f.read()
+
+
+def test_log_run_info_once(caplog, monkeypatch):
+    """The environment information is logged once per session."""
+    logger_module = importlib.import_module("pysantec.logger")
+    monkeypatch.setattr(logger_module, "_run_info_logged", False)
+    with caplog.at_level(logging.INFO):
+        log_run_info()
+        log_run_info()
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages == list(get_run_info())
+    assert get_run_info() is get_run_info()
+
+
+def test_log_run_info_keeps_root_handlers(monkeypatch):
+    """Logging the run information on connect does not configure the root logger."""
+    logger_module = importlib.import_module("pysantec.logger")
+    monkeypatch.setattr(logger_module, "_run_info_logged", False)
+    monkeypatch.setattr(logging.root, "handlers", [])
+
+    log_run_info()
+    assert logging.root.handlers == []
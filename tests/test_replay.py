@@ -0,0 +1,131 @@
+# pysantec/tests/test_replay.py
+
+"""
+Test the record and replay backend.
+"""
+
+import types
+
+import numpy as np
+import pytest
+
+from pysantec.instruments.retry import RetryPolicy
+from pysantec.replay import (
+    RecordedCallError,
+    RecordingNamespace,
+    ReplayError,
+    ReplayNamespace,
+    ReplaySession,
+    SessionWriter,
+)
+
+
+class _Information:
+    SerialNumber = "12345678"
+
+
+class _TSL:
+    """Plain Python stand-in of the .NET TSL class."""
+
+    class LD_Status:
+        LD_OFF = 0
+        LD_ON = 1
+
+    def __init__(self):
+        self.Information = _Information()
+        self.TimeOut = 0
+
+    def Get_Wavelength(self, value):
+        return 0, 1550.0
+
+    def Get_Logging_Data(self, count, data):
+        return 0, 3, np.array([1500.0, 1500.5, 1501.0])
+
+
+@pytest.fixture
+def session_path(tmp_path):
+    """Fixture recording a session."""
+    writer = SessionWriter(str(tmp_path))
+    santec = RecordingNamespace("Santec", types.SimpleNamespace(TSL=_TSL), writer)
+
+    assert santec.TSL.LD_Status.LD_ON == 1
+    tsl = santec.TSL()
+    tsl.TimeOut = 5000
+    assert tsl.Get_Wavelength(0.0) == (0, 1550.0)
+    assert tsl.Information.SerialNumber == "12345678"
+    tsl.Get_Logging_Data(0, [0.0] * 3)
+    writer.close()
+    return str(tmp_path)
+
+
+def test_replay(session_path):
+    """Replayed calls return the recorded results."""
+    session = ReplaySession(session_path)
+    santec = ReplayNamespace("Santec", session)
+
+    assert santec.TSL.LD_Status.LD_ON == 1
+    tsl = santec.TSL()
+    tsl.TimeOut = 5000
+    assert tsl.Get_Wavelength(0.0) == (0, 1550.0)
+    assert tsl.Information.SerialNumber == "12345678"
+
+    status, count, data = tsl.Get_Logging_Data(0, None)
+    np.testing.assert_array_equal(data, [1500.0, 1500.5, 1501.0])
+    assert data.GetLength(0) == 3
+
+
+def test_replay_mismatch(session_path):
+    """Calls that differ from the recording are rejected."""
+    tsl = ReplayNamespace("Santec", ReplaySession(session_path)).TSL()
+
+    with pytest.raises(ReplayError):
+        tsl.Get_Logging_Data(0, None)
+
+
+def test_replay_ignores_timeouts(session_path):
+    """I/O time outs depend on the live latency and may differ on replay."""
+    tsl = ReplayNamespace("Santec", ReplaySession(session_path)).TSL()
+    tsl.TimeOut = 500
+    tsl.TimeOut = 60000
+    assert tsl.Get_Wavelength(0.0) == (0, 1550.0)
+
+
+class TimeoutException(Exception):
+    """Stand-in of the .NET System.TimeoutException."""
+
+
+class _FailingTSL:
+    def Get_Power(self, value):
+        raise TimeoutException("Timed out.")
+
+    def Set_Power(self, value):
+        raise ValueError("Out of range.")
+
+    def Get_Wavelength(self, value):
+        return 0, 1550.0
+
+
+def test_replay_raises_recorded_errors(tmp_path):
+    """Calls which raised are replayed in order and raise again."""
+    writer = SessionWriter(str(tmp_path))
+    santec = RecordingNamespace(
+        "Santec", types.SimpleNamespace(TSL=_FailingTSL), writer
+    )
+    tsl = santec.TSL()
+    for function_name, exception in [
+        ("Get_Power", TimeoutException),
+        ("Set_Power", ValueError),
+    ]:
+        with pytest.raises(exception):
+            getattr(tsl, function_name)(0.0)
+    tsl.Get_Wavelength(0.0)
+    writer.close()
+
+    tsl = ReplayNamespace("Santec", ReplaySession(str(tmp_path))).TSL()
+    with pytest.raises(RecordedCallError, match="Timed out.") as error:
+        tsl.Get_Power(0.0)
+    assert type(error.value).__name__ == "TimeoutException"
+    assert RetryPolicy.is_transient_exception(error.value)
+    with pytest.raises(ValueError, match="Out of range."):
+        tsl.Set_Power(0.0)
+    assert tsl.Get_Wavelength(0.0) == (0, 1550.0)
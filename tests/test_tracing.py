@@ -0,0 +1,72 @@
+# pysantec/tests/test_tracing.py
+
+"""
+Test tracing functionality.
+"""
+
+import json
+import threading
+
+import pytest
+
+from pysantec import tracing
+
+
+@pytest.fixture
+def tracer():
+    """Fixture to enable tracing for a test."""
+    yield tracing.enable_tracing()
+    tracing.disable_tracing()
+
+
+def test_tracing_disabled():
+    """Spans are not recorded while tracing is disabled."""
+    assert tracing.get_tracer() is None
+    with tracing.span("disabled"):
+        pass
+
+
+def test_nested_spans(tracer):
+    """Nested spans are exported as complete events within their parent."""
+
+    @tracing.traced("inner", "test")
+    def inner():
+        return 1
+
+    with tracing.span("outer", "test", step=1):
+        assert inner() == 1
+
+    events = [e for e in tracer.to_chrome_trace()["traceEvents"] if e["ph"] == "X"]
+    inner_event, outer_event = events
+    assert (inner_event["name"], outer_event["name"]) == ("inner", "outer")
+    assert outer_event["args"] == {"step": "1"}
+    assert inner_event["tid"] == outer_event["tid"] == threading.get_ident()
+    assert outer_event["ts"] <= inner_event["ts"]
+    assert (
+        inner_event["ts"] + inner_event["dur"] <= outer_event["ts"] + outer_event["dur"]
+    )
+
+
+def test_ring_buffer_capacity():
+    """The oldest spans are dropped once the buffer is full."""
+    tracer = tracing.Tracer(capacity=3)
+    for index in range(5):
+        with tracer.span(f"span {index}"):
+            pass
+
+    names = [e["name"] for e in tracer.to_chrome_trace()["traceEvents"]]
+    assert len(tracer) == 3
+    assert names[-3:] == ["span 2", "span 3", "span 4"]
+
+
+def test_export(tracer, tmp_path):
+    """The trace is exported as Chrome Trace Event JSON."""
+    with pytest.raises(ValueError):
+        with tracing.span("failing"):
+            raise ValueError()
+
+    path = tmp_path / "trace.json"
+    tracer.export(path)
+    trace = json.loads(path.read_text())
+    assert trace["traceEvents"][0]["ph"] == "M"
+    assert trace["traceEvents"][-1]["args"] == {"error": "ValueError"}